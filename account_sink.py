@@ -0,0 +1,131 @@
+"""
+Append-only account storage for long (infinite) runs
+Accounts are appended as NDJSON lines by a background writer thread, so saving a
+batch costs only the new lines and never blocks the event loop. The username index
+is rebuilt from the file on open, so duplicates stay out across runs. The legacy
+JSON array is produced on request by export_json().
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import Dict, Iterator, Optional, Set
+
+
+class AccountSink:
+    """NDJSON file of accounts keyed by username, written off the event loop"""
+
+    def __init__(self, path: str, sync_every: int = 10):
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.usernames: Set[str] = set()
+        self.loaded = 0
+        self.written = 0
+        for account in read_accounts(path):
+            self.usernames.add(account['username'])
+        self.loaded = len(self.usernames)
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._file = open(path, 'a', encoding='utf-8')
+        self._writer = threading.Thread(target=self._write_loop, name='account-sink', daemon=True)
+        self._writer.start()
+
+    def __contains__(self, username: str) -> bool:
+        return username in self.usernames
+
+    def __len__(self) -> int:
+        return len(self.usernames)
+
+    def add(self, account: Dict) -> bool:
+        """Queue an account for appending; returns False if the username is already stored"""
+        username = account.get('username')
+        if not username or username in self.usernames:
+            return False
+        self.usernames.add(username)
+        self._queue.put(json.dumps(account, ensure_ascii=False))
+        return True
+
+    def _write_loop(self):
+        unsynced = 0
+        while True:
+            line = self._queue.get()
+            try:
+                if line is None:
+                    break
+                self._file.write(line + '\n')
+                self.written += 1
+                unsynced += 1
+                # Flush once the queue is drained, fsync every sync_every lines
+                if self._queue.empty():
+                    self._file.flush()
+                    if unsynced >= self.sync_every:
+                        os.fsync(self._file.fileno())
+                        unsynced = 0
+            finally:
+                self._queue.task_done()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def flush(self):
+        """Block until every queued account is written and flushed to the OS"""
+        self._queue.join()
+        self._file.flush()
+
+    def close(self):
+        """Write everything still queued, sync and close the file (safe to call twice)"""
+        if self._file.closed:
+            return
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def export_json(self, json_path: str) -> int:
+        """Write all stored accounts as the legacy indented JSON array; returns the count"""
+        if not self._file.closed:
+            self.flush()
+        return export_json(self.path, json_path)
+
+
+def read_accounts(path: str) -> Iterator[Dict]:
+    """Yield accounts from an NDJSON file (missing file = none; a torn last line is skipped)"""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                account = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(account, dict) and account.get('username'):
+                yield account
+
+
+def export_json(ndjson_path: str, json_path: str) -> int:
+    """Compact an NDJSON account file into a JSON array (first occurrence of each username wins)"""
+    accounts = []
+    seen: Set[str] = set()
+    for account in read_accounts(ndjson_path):
+        if account['username'] not in seen:
+            seen.add(account['username'])
+            accounts.append(account)
+    tmp_path = json_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(accounts, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    return len(accounts)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python account_sink.py <accounts.ndjson> [output.json]")
+        sys.exit(1)
+
+    source = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.splitext(source)[0] + '.json'
+    count = export_json(source, target)
+    print(f"💾 Exported {count} accounts to {target}")
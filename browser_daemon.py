@@ -0,0 +1,150 @@
+"""
+Long-lived browser daemon
+Keeps one warmed-up, logged-in Chromium running on a persistent profile directory (cookies,
+local storage and disk cache survive restarts) with the DevTools port open. Scraper runs attach
+with `--attach` (or `--cdp URL` / INSTAGRAM_BROWSER_CDP) and skip launching, cookie replay and
+the login check. The session is re-checked every few minutes and logged in again if it expired.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import time
+from typing import Dict, Optional
+from playwright.async_api import async_playwright
+
+from instagram_scraper_business_indian import (
+    BusinessIndianScraper,
+    CONTEXT_OPTIONS,
+    LAUNCH_ARGS,
+    WEBDRIVER_INIT_SCRIPT,
+)
+
+
+DEFAULT_PROFILE_DIR = 'instagram_browser_profile'
+DEFAULT_PORT = 9222
+DEFAULT_STATE_FILE = 'browser_daemon.json'
+DEFAULT_KEEPALIVE_MINUTES = 15
+
+
+def read_state(path: str = DEFAULT_STATE_FILE) -> Optional[Dict]:
+    """The running daemon's state ({'cdp_url', 'pid', 'logged_in', ...}), or None if it isn't running"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            state = json.load(f)
+        os.kill(state['pid'], 0)  # Raises if the process is gone
+        return state
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def daemon_cdp_url(path: str = DEFAULT_STATE_FILE) -> Optional[str]:
+    """CDP URL of the running daemon (None if it isn't running)"""
+    state = read_state(path)
+    return state['cdp_url'] if state else None
+
+
+def _write_state(path: str, state: Dict):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+async def run_daemon(
+    profile_dir: str = DEFAULT_PROFILE_DIR,
+    port: int = DEFAULT_PORT,
+    headless: bool = False,
+    cookies_file: Optional[str] = None,
+    state_file: str = DEFAULT_STATE_FILE,
+    keepalive_minutes: float = DEFAULT_KEEPALIVE_MINUTES,
+    stop_event: Optional[asyncio.Event] = None,
+):
+    """
+    Launch the persistent browser, log in (profile cookies, then cookies_file, then
+    credentials from .env) and serve it until stop_event is set. Writes state_file for
+    clients while running and removes it on exit.
+    """
+    stop_event = stop_event or asyncio.Event()
+    playwright = await async_playwright().start()
+    context = await playwright.chromium.launch_persistent_context(
+        profile_dir,
+        headless=headless,
+        args=LAUNCH_ARGS + [f'--remote-debugging-port={port}'],
+        **CONTEXT_OPTIONS,
+    )
+    await context.add_init_script(WEBDRIVER_INIT_SCRIPT)
+
+    # Reuse the scraper's login flow (cookies, OTP handling, prompts) on the persistent context
+    session = BusinessIndianScraper(cookies_file=cookies_file, headless=headless, block_resources=False,
+                                    cache_ttl_hours=0, remember_rejections=False)
+    session.context = context
+    session.page = context.pages[0] if context.pages else await context.new_page()
+
+    async def ensure_logged_in() -> bool:
+        session.logged_in = False
+        # force: a keepalive check must actually reach Instagram, not the validation cache
+        if await session.check_if_logged_in(force=True):
+            return True
+        if await session.load_cookies() and await session.check_if_logged_in(force=True):
+            return True
+        if await session.login():
+            await session.save_cookies()
+            return True
+        return False
+
+    state = {
+        'cdp_url': f"http://127.0.0.1:{port}",
+        'pid': os.getpid(),
+        'profile_dir': os.path.abspath(profile_dir),
+        'started_at': time.time(),
+    }
+    try:
+        while not stop_event.is_set():
+            logged_in = await ensure_logged_in()
+            state.update(logged_in=logged_in, checked_at=time.time())
+            _write_state(state_file, state)
+            print(f"{'✅' if logged_in else '⚠️ '} Browser daemon ready at {state['cdp_url']} "
+                  f"({'logged in' if logged_in else 'NOT logged in'}) - next check in {keepalive_minutes:g} min")
+            try:
+                await asyncio.wait_for(stop_event.wait(), keepalive_minutes * 60)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if os.path.exists(state_file):
+            os.remove(state_file)
+        await context.close()
+        await playwright.stop()
+        print("👋 Browser daemon stopped")
+
+
+if __name__ == "__main__":
+    import sys
+    from instagram_scraper_business_indian import _pop_cli_option
+
+    profile_dir = _pop_cli_option(sys.argv, "--profile-dir", DEFAULT_PROFILE_DIR)
+    port = int(_pop_cli_option(sys.argv, "--port", str(DEFAULT_PORT)))
+    headless = _pop_cli_option(sys.argv, "--headless", "false").lower() == "true"
+    cookies_file = _pop_cli_option(sys.argv, "--cookies")
+    keepalive_minutes = float(_pop_cli_option(sys.argv, "--keepalive", str(DEFAULT_KEEPALIVE_MINUTES)))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "status":
+        state = read_state()
+        print(json.dumps(state, indent=2) if state else "Browser daemon is not running")
+        sys.exit(0 if state else 1)
+
+    if len(sys.argv) > 1:
+        print("Usage: python browser_daemon.py [status] [--profile-dir DIR] [--port N] [--headless true|false] [--cookies FILE] [--keepalive MINUTES]")
+        print("Then:  python instagram_scraper_business_indian.py skinkare 50 false --attach")
+        sys.exit(1)
+
+    async def main():
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+        await run_daemon(profile_dir, port, headless, cookies_file, keepalive_minutes=keepalive_minutes,
+                         stop_event=stop_event)
+
+    asyncio.run(main())
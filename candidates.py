@@ -0,0 +1,63 @@
+"""
+Discovery candidates
+Usernames found by search / hashtag / post discovery, together with whatever
+metadata the discovery payload already carried (follower count, verified flag, name)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+# Follower counts from search payloads are exact but can lag slightly;
+# only counts outside the range by more than this fraction are dropped
+PREFILTER_MARGIN = 0.1
+
+
+@dataclass
+class Candidate:
+    username: str
+    source: str = ''
+    follower_count: Optional[int] = None
+    is_verified: Optional[bool] = None
+    full_name: Optional[str] = None
+    is_private: Optional[bool] = None
+    # Every source that found this username (provenance), first one first
+    sources: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if self.source and self.source not in self.sources:
+            self.sources.insert(0, self.source)
+
+    @classmethod
+    def from_user(cls, user: Dict, source: str) -> Optional['Candidate']:
+        """Build a candidate from a search/feed user object (None without a username)"""
+        username = user.get('username')
+        if not username:
+            return None
+        followers = user.get('follower_count')
+        if followers is None and isinstance(user.get('edge_followed_by'), dict):
+            followers = user['edge_followed_by'].get('count')
+        return cls(
+            username=username,
+            source=source,
+            follower_count=int(followers) if followers is not None else None,
+            is_verified=user.get('is_verified'),
+            full_name=user.get('full_name') or None,
+            is_private=user.get('is_private'),
+        )
+
+    def merge(self, other: 'Candidate'):
+        """Fill in metadata this candidate is missing from another sighting of the same user"""
+        for name in ('follower_count', 'is_verified', 'full_name', 'is_private'):
+            if getattr(self, name) is None and getattr(other, name) is not None:
+                setattr(self, name, getattr(other, name))
+        for source in other.sources:
+            if source not in self.sources:
+                self.sources.append(source)
+
+    def clearly_out_of_range(self, min_followers: int = 10000, max_followers: int = 50000) -> bool:
+        """True only when the payload's follower count is well outside the range"""
+        if self.follower_count is None:
+            return False
+        return (self.follower_count < min_followers * (1 - PREFILTER_MARGIN)
+                or self.follower_count > max_followers * (1 + PREFILTER_MARGIN))
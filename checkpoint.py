@@ -0,0 +1,68 @@
+"""
+Checkpoints for infinite mode
+A JSON snapshot of the seen set, the candidates not checked yet and per-source progress,
+written atomically off the event loop so a restarted run can resume where it stopped
+"""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_INTERVAL = 30  # seconds between background saves
+
+
+class Checkpoint:
+    """Periodically saved run state (see BusinessIndianScraper.checkpoint_state for the shape)"""
+
+    def __init__(self, path: str, interval: float = DEFAULT_CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        # Writes run in executor threads and outlive a cancelled autosave: they are serialized,
+        # and a snapshot older than the one already on disk is dropped instead of replacing it
+        self._write_lock = threading.Lock()
+        self._taken = 0
+        self._written = 0
+
+    def load(self) -> Optional[Dict]:
+        """Last saved state, or None if there is none or it can't be read"""
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+            return None
+        return state
+
+    def _write(self, state: Dict, sequence: int):
+        with self._write_lock:
+            if sequence < self._written:
+                return
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._written = sequence
+
+    async def save(self, state: Dict):
+        """Write a state snapshot in a worker thread (the old file stays valid until replaced)"""
+        state = dict(state, version=CHECKPOINT_VERSION)
+        self._taken += 1
+        await asyncio.get_event_loop().run_in_executor(None, self._write, state, self._taken)
+        self.saves += 1
+
+    async def autosave(self, snapshot: Callable[[], Dict]):
+        """Save snapshot() every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.save(snapshot())
+            except Exception as e:
+                print(f"   ⚠️  Checkpoint save failed: {str(e)}")
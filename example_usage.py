@@ -68,7 +68,7 @@ async def example_advanced():
 
 
 async def example_multiple_keywords():
-    """Example: Search multiple keywords"""
+    """Example: Search multiple keywords (one browser per keyword, one after another)"""
     print("\n" + "=" * 60)
     print("Example 3: Multiple Keywords")
     print("=" * 60)
@@ -87,6 +87,23 @@ async def example_multiple_keywords():
         save_results(all_results, "multiple_keywords")
 
 
+async def example_keyword_scheduler():
+    """Example: Search multiple keywords concurrently on one browser and session"""
+    from keyword_scheduler import KeywordJob, scrape_keywords
+    
+    print("\n" + "=" * 60)
+    print("Example 4: Multiple Keywords on One Browser (Indian business accounts)")
+    print("=" * 60)
+    
+    jobs = [KeywordJob("skincare", 10), KeywordJob("beauty", 10), KeywordJob("apparel", 5)]
+    results = await scrape_keywords(jobs, headless=True, concurrency=4, max_active_jobs=3)
+    
+    for keyword, accounts in results.items():
+        print(f"\n🔍 {keyword}: {len(accounts)} accounts")
+        for acc in accounts:
+            print(f"  @{acc['username']}: {acc['followers']:,} followers")
+
+
 if __name__ == "__main__":
     import sys
     
@@ -95,5 +112,7 @@ if __name__ == "__main__":
         asyncio.run(example_advanced())
     elif len(sys.argv) > 1 and sys.argv[1] == "multiple":
         asyncio.run(example_multiple_keywords())
+    elif len(sys.argv) > 1 and sys.argv[1] == "scheduler":
+        asyncio.run(example_keyword_scheduler())
     else:
         asyncio.run(example_basic())
@@ -0,0 +1,114 @@
+"""
+Candidate frontier
+Deduped (hash lookup) priority queue of discovery candidates. Every source that found a
+candidate is kept on it, the priority function is pluggable, and memory is bounded by
+dropping the lowest-priority candidates once the frontier is full.
+"""
+
+import heapq
+import itertools
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from candidates import Candidate
+
+
+DEFAULT_MAX_CANDIDATES = 5000
+
+# Sources ordered by how often their candidates turned out relevant
+SOURCE_WEIGHTS = {
+    'topsearch': 0.5,
+    'search_dropdown': 0.3,
+    'hashtag': 0.0,
+}
+
+
+def default_priority(candidate: Candidate, min_followers: int = 10000, max_followers: int = 50000) -> float:
+    """
+    Higher is checked first: a follower count already in range beats an unknown one,
+    which beats one just outside the range. Each extra source that found the
+    candidate adds a little, and private accounts (never business) go last.
+    """
+    if candidate.follower_count is None:
+        score = 1.0
+    elif min_followers <= candidate.follower_count <= max_followers:
+        score = 2.0
+    else:
+        score = 0.5
+    score += SOURCE_WEIGHTS.get(candidate.source, 0.0)
+    score += 0.25 * (len(candidate.sources) - 1)
+    if candidate.is_private:
+        score -= 1.0
+    return score
+
+
+class CandidateFrontier:
+    """Best-first queue of unchecked candidates, one entry per username"""
+
+    def __init__(self, priority: Optional[Callable[[Candidate], float]] = None,
+                 max_size: int = DEFAULT_MAX_CANDIDATES):
+        self.priority = priority or default_priority
+        self.max_size = max_size
+        self.evicted = 0
+        self._entries: Dict[str, Candidate] = {}
+        self._scores: Dict[str, float] = {}
+        # (-score, insertion order, username); stale tuples are skipped on pop
+        self._heap: List[Tuple[float, int, str]] = []
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._entries
+
+    def __iter__(self) -> Iterator[Candidate]:
+        """Pending candidates (no particular order)"""
+        return iter(list(self._entries.values()))
+
+    def _push(self, candidate: Candidate):
+        score = self.priority(candidate)
+        self._scores[candidate.username] = score
+        heapq.heappush(self._heap, (-score, next(self._counter), candidate.username))
+
+    def add(self, candidate: Candidate) -> bool:
+        """Add or merge a candidate; returns True if the username was new"""
+        existing = self._entries.get(candidate.username)
+        if existing:
+            existing.merge(candidate)
+            # Merged metadata or another source can change the priority
+            if self.priority(existing) != self._scores[existing.username]:
+                self._push(existing)
+            return False
+        self._entries[candidate.username] = candidate
+        self._push(candidate)
+        # Trim in batches so eviction stays cheap per add
+        if len(self._entries) > self.max_size * 1.1:
+            self._evict()
+        return True
+
+    def extend(self, candidates: Iterable[Candidate]) -> int:
+        """Add several candidates; returns how many were new"""
+        return sum(1 for candidate in candidates if self.add(candidate))
+
+    def pop(self) -> Optional[Candidate]:
+        """Remove and return the highest-priority candidate, or None when empty"""
+        while self._heap:
+            neg_score, _, username = heapq.heappop(self._heap)
+            if username in self._entries and self._scores[username] == -neg_score:
+                del self._scores[username]
+                return self._entries.pop(username)
+        return None
+
+    def discard(self, username: str):
+        """Drop a pending candidate (its heap entry is skipped later)"""
+        if self._entries.pop(username, None):
+            del self._scores[username]
+
+    def _evict(self):
+        """Keep only the max_size highest-priority candidates"""
+        ranked = sorted(self._entries.values(), key=lambda c: self._scores[c.username], reverse=True)
+        for candidate in ranked[self.max_size:]:
+            self.discard(candidate.username)
+            self.evicted += 1
+        self._heap = [(-self._scores[c.username], next(self._counter), c.username) for c in ranked[:self.max_size]]
+        heapq.heapify(self._heap)
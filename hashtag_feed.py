@@ -0,0 +1,131 @@
+"""
+Hashtag feed pagination
+Follows the cursor Instagram returns with hashtag media JSON (next_max_id for the
+tags API, end_cursor for graphql) and streams each page's post owners, so repeated
+rounds can go deeper into a hashtag instead of re-reading the top of the grid
+"""
+
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from playwright.async_api import BrowserContext
+
+from instagram_profile import api_headers
+from metrics import NAVIGATION_SECONDS, PAGE_LOADS
+
+
+TAG_INFO_URL = "https://www.instagram.com/api/v1/tags/web_info/?tag_name={tag}"
+TAG_SECTIONS_URL = "https://www.instagram.com/api/v1/tags/{tag}/sections/"
+DEFAULT_MAX_PAGES = 5
+
+
+@dataclass
+class HashtagPage:
+    """One page of a hashtag feed"""
+    number: int                       # 1-based within this iteration
+    owners: List[Dict] = field(default_factory=list)  # post owner user objects, deduped
+    cursor: Optional[str] = None      # cursor for the next page (None = no more pages)
+    next_page: int = 0                # page index the sections API expects with the cursor
+
+
+# Keys whose value is one post: 'media' in tags-API sections, 'node' in graphql edges
+MEDIA_KEYS = ('media', 'node')
+
+
+def find_owners(data) -> List[Dict]:
+    """Owner user objects of the posts in a payload ('user' / 'owner' of each media, with a
+    username). Media objects are not searched further, so tagged users, commenters and
+    coauthors inside a post are not counted as owners."""
+    owners: Dict[str, Dict] = {}
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key in MEDIA_KEYS and isinstance(value, dict):
+                    owner = value.get('user') or value.get('owner')
+                    if isinstance(owner, dict) and owner.get('username'):
+                        owners.setdefault(owner['username'], owner)
+                else:
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return list(owners.values())
+
+
+def find_cursor(data) -> Tuple[Optional[str], int]:
+    """(next cursor, next page index) from a tags-API or graphql payload; cursor None at the end"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if 'next_max_id' in node:
+                more = node.get('more_available', True)
+                return (str(node['next_max_id']) if more and node['next_max_id'] else None,
+                        int(node.get('next_page') or 0))
+            page_info = node.get('page_info')
+            if isinstance(page_info, dict) and 'end_cursor' in page_info:
+                more = page_info.get('has_next_page', True)
+                return (page_info['end_cursor'] if more and page_info['end_cursor'] else None), 0
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None, 0
+
+
+async def _fetch_page(context: BrowserContext, tag: str, cursor: Optional[str], next_page: int,
+                      tab: str, rate_limiter=None) -> Optional[Dict]:
+    """First page from web_info, later pages from the sections endpoint; None on any failure"""
+    if rate_limiter:
+        await rate_limiter.acquire('hashtag')
+    headers = await api_headers(context, f"https://www.instagram.com/explore/tags/{tag}/")
+    with NAVIGATION_SECONDS.time(kind='hashtag_api'):
+        if cursor is None:
+            response = await context.request.get(
+                TAG_INFO_URL.format(tag=quote(tag)), headers=headers, fail_on_status_code=False,
+            )
+        else:
+            response = await context.request.post(
+                TAG_SECTIONS_URL.format(tag=quote(tag)),
+                headers=headers,
+                form={
+                    'max_id': cursor,
+                    'page': str(next_page),
+                    'surface': 'grid',
+                    'tab': tab,
+                    'include_persistent': 'false',
+                },
+                fail_on_status_code=False,
+            )
+    PAGE_LOADS.inc(kind='hashtag_api')
+    is_json = 'json' in (response.headers.get('content-type') or '')
+    if rate_limiter:
+        rate_limiter.record('hashtag', response.status, (await response.text()) if is_json and not response.ok else response.url)
+    if not response.ok or not is_json:
+        return None
+    data = await response.json()
+    # web_info nests each tab's sections under data.<tab>
+    if cursor is None and isinstance(data.get('data'), dict) and isinstance(data['data'].get(tab), dict):
+        return data['data'][tab]
+    return data
+
+
+async def iter_hashtag_pages(context: BrowserContext, tag: str, max_pages: int = DEFAULT_MAX_PAGES,
+                             cursor: Optional[str] = None, next_page: int = 0, tab: str = 'recent',
+                             rate_limiter=None) -> AsyncIterator[HashtagPage]:
+    """
+    Stream up to max_pages pages of a hashtag feed, starting at cursor (None = top).
+    Uses the context's logged-in session (APIRequestContext) - no page navigation.
+    Stops early when the feed ends or a request fails (login wall, throttling).
+    """
+    for number in range(1, max_pages + 1):
+        try:
+            data = await _fetch_page(context, tag, cursor, next_page, tab, rate_limiter)
+        except Exception:
+            return
+        if data is None:
+            return
+        cursor, next_page = find_cursor(data)
+        yield HashtagPage(number, find_owners(data), cursor, next_page)
+        if cursor is None:
+            return
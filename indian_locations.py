@@ -0,0 +1,91 @@
+"""
+Indian location / brand-origin matcher
+All indicator terms (built-in list + gazetteer file) are compiled into one trie-shaped
+regex with word boundaries, so a profile is scanned once no matter how many terms there are.
+Text is lowercased once and matched case-sensitively (much faster than re.IGNORECASE).
+"""
+
+import os
+import re
+from typing import Iterable, List, Optional, Set
+
+
+# Always included, even without a gazetteer file
+BUILTIN_TERMS = [
+    'india', 'indian', 'mumbai', 'delhi', 'bangalore', 'chennai', 'hyderabad',
+    'pune', 'kolkata', 'ahmedabad', 'jaipur', 'surat', 'lucknow', 'kanpur',
+    'nagpur', 'indore', 'thane', 'bhopal', 'visakhapatnam', 'patna', 'vadodara',
+    'ghaziabad', 'ludhiana', 'agra', 'nashik', 'faridabad', 'meerut', 'rajkot',
+    'varanasi', 'srinagar', 'amritsar', 'ranchi', 'jabalpur', 'gwalior', 'jodhpur',
+    'raipur', 'kota', 'guwahati', 'chandigarh', 'solapur', 'hubli', 'tiruchirappalli',
+    'made in india', 'swadeshi', 'desi', 'bharat', 'hindustan', '+91'
+]
+
+# Cities, states and union territories, one per line (# starts a comment)
+DEFAULT_GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'indian_gazetteer.txt')
+
+# Signals that don't fit a plain term list: +91 phone numbers and country fields in profile JSON
+# (lowercase - they run against lowercased text)
+PHONE_PATTERN = r'\+91[\s-]?\d'
+COUNTRY_PATTERN = r'"country_code":\s*"in"|"country":\s*"india"'
+
+
+def load_gazetteer(path: str) -> List[str]:
+    """Read terms from a gazetteer file (missing file = no terms)"""
+    if not os.path.exists(path):
+        return []
+    terms = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            term = line.split('#', 1)[0].strip().lower()
+            if term:
+                terms.append(term)
+    return terms
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """Regex alternation shaped as a prefix trie (shared prefixes are matched once)"""
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        optional = '' in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        pattern = '(?:' + '|'.join(branches) + ')'
+        # Longer terms are tried first; the boundary check backtracks to shorter ones
+        return pattern + '?' if optional else pattern
+
+    return build(trie)
+
+
+class IndianLocationMatcher:
+    """Finds Indian location indicators in one linear pass over the text"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Set[str] = {term.strip().lower() for term in terms if term.strip()}
+        self.regex = re.compile(
+            f'(?P<phone>{PHONE_PATTERN})'
+            f'|(?P<country>{COUNTRY_PATTERN})'
+            f'|(?<![a-z0-9])(?P<term>{_trie_pattern(self.terms) or "(?!)"})(?![a-z0-9])'
+        )
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'IndianLocationMatcher':
+        """Built-in terms plus the gazetteer (INSTAGRAM_GAZETTEER or indian_gazetteer.txt)"""
+        path = path or os.getenv('INSTAGRAM_GAZETTEER', DEFAULT_GAZETTEER_FILE)
+        return cls(BUILTIN_TERMS + load_gazetteer(path))
+
+    def search(self, text: str) -> Optional[str]:
+        """First indicator found in text (lowercased), or None"""
+        if not text:
+            return None
+        match = self.regex.search(text.lower())
+        return match.group(0) if match else None
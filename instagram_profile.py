@@ -0,0 +1,287 @@
+"""
+Instagram Profile JSON helpers
+Reads profile data from the JSON Instagram's web app fetches while a profile loads,
+so scrapers don't have to serialize and regex the whole rendered page
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs
+from playwright.async_api import BrowserContext, Page, Response
+
+from metrics import NAVIGATION_SECONDS, PAGE_LOADS
+
+
+# Profile-info endpoint the web app calls, and the app id it sends with it
+PROFILE_INFO_URL = "https://www.instagram.com/api/v1/users/web_profile_info/?username={username}"
+WEB_APP_ID = "936619743392459"
+
+# Endpoints the web app calls that carry the profile user object
+PROFILE_ENDPOINTS = [
+    '/api/v1/users/web_profile_info/',
+    '/graphql/query',
+    '/api/graphql',
+]
+
+
+def is_profile_response_url(url: str, username: str) -> bool:
+    """Check if a response URL can carry the profile JSON for username"""
+    parsed = urlparse(url)
+    if not any(parsed.path.startswith(endpoint) for endpoint in PROFILE_ENDPOINTS):
+        return False
+    # web_profile_info is per-username; graphql bodies are checked after decoding
+    if parsed.path.startswith('/api/v1/users/web_profile_info/'):
+        return parse_qs(parsed.query).get('username', [''])[0].lower() == username.lower()
+    return True
+
+
+def find_user(data, username: str) -> Optional[Dict]:
+    """Walk a decoded JSON payload and return the user object for username"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if str(node.get('username', '')).lower() == username.lower() and (
+                'edge_followed_by' in node or 'follower_count' in node or 'biography' in node
+            ):
+                return node
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return None
+
+
+def follower_count(user: Dict) -> Optional[int]:
+    """Follower count from a user object (web and mobile API shapes)"""
+    edge = user.get('edge_followed_by')
+    if isinstance(edge, dict) and edge.get('count') is not None:
+        return int(edge['count'])
+    if user.get('follower_count') is not None:
+        return int(user['follower_count'])
+    return None
+
+
+# JSON blobs the server embeds in profile HTML (<script type="application/json"> and legacy _sharedData)
+_EMBEDDED_JSON_RE = re.compile(
+    r'<script type="application/json"[^>]*>(.*?)</script>|window\._sharedData\s*=\s*(\{.*?\});</script>',
+    re.DOTALL,
+)
+
+
+def find_user_in_html(page_content: str, username: str) -> Optional[Dict]:
+    """Locate and decode the embedded profile user object in serialized page HTML (once)"""
+    marker = f'"{username}"'.lower()
+    for match in _EMBEDDED_JSON_RE.finditer(page_content):
+        blob = match.group(1) or match.group(2)
+        # Only decode blobs that mention the user at all
+        if marker not in blob.lower():
+            continue
+        try:
+            user = find_user(json.loads(blob), username)
+        except (json.JSONDecodeError, RecursionError):
+            continue
+        if user:
+            return user
+    return None
+
+
+def _as_bool(value) -> Optional[bool]:
+    return None if value is None else bool(value)
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class ProfileRecord:
+    """
+    The profile fields classification needs, decoded once from a user object.
+    None means the field wasn't present in this payload (not the same as False / empty).
+    """
+    username: str
+    full_name: str = ""
+    biography: str = ""
+    followers: Optional[int] = None
+    is_business_account: Optional[bool] = None
+    is_professional_account: Optional[bool] = None
+    account_type: Optional[int] = None  # 1 = personal, 2 = business, 3 = creator
+    category_name: Optional[str] = None
+    business_email: Optional[str] = None
+    business_phone_number: Optional[str] = None
+    phone_country_code: Optional[str] = None
+    city_name: Optional[str] = None
+    address: Optional[str] = None
+    external_url: Optional[str] = None
+
+    @classmethod
+    def from_user(cls, user: Dict, username: Optional[str] = None) -> 'ProfileRecord':
+        """Read a web (graphql / web_profile_info) or mobile API user object"""
+        # Web payloads keep the address as a JSON string
+        address = {}
+        raw_address = user.get('business_address_json')
+        if isinstance(raw_address, str) and raw_address:
+            try:
+                address = json.loads(raw_address) or {}
+            except json.JSONDecodeError:
+                address = {}
+        elif isinstance(raw_address, dict):
+            address = raw_address
+
+        return cls(
+            username=username or user.get('username') or "",
+            full_name=user.get('full_name') or "",
+            biography=user.get('biography') or "",
+            followers=follower_count(user),
+            is_business_account=_as_bool(user.get('is_business_account', user.get('is_business'))),
+            is_professional_account=_as_bool(user.get('is_professional_account')),
+            account_type=_as_int(user.get('account_type')),
+            category_name=(user.get('category_name') or user.get('business_category_name')
+                           or user.get('category') or None),
+            business_email=user.get('business_email') or user.get('public_email') or None,
+            business_phone_number=(user.get('business_phone_number') or user.get('contact_phone_number')
+                                   or user.get('public_phone_number') or None),
+            phone_country_code=str(user.get('public_phone_country_code') or '') or None,
+            city_name=user.get('city_name') or address.get('city_name') or None,
+            address=' '.join(str(address.get(key) or '') for key in ('street_address', 'zip_code')).strip() or None,
+            external_url=user.get('external_url') or None,
+        )
+
+    def has_account_flags(self) -> bool:
+        """True if the payload says what kind of account this is"""
+        return (self.is_business_account is not None or self.is_professional_account is not None
+                or self.account_type is not None)
+
+    def location_text(self) -> str:
+        """Profile fields that can point to a place (bio, name, city, address, phone, website)"""
+        return ' '.join(part for part in (
+            self.biography, self.full_name, self.city_name, self.address,
+            self.business_phone_number, self.external_url,
+        ) if part)
+
+
+async def api_headers(context: BrowserContext, referer: str) -> Dict[str, str]:
+    """Headers the web app sends with its private API calls (app id + the session's CSRF token)"""
+    cookies = await context.cookies("https://www.instagram.com")
+    csrf_token = next((c['value'] for c in cookies if c['name'] == 'csrftoken'), '')
+    return {
+        'X-IG-App-ID': WEB_APP_ID,
+        'X-CSRFToken': csrf_token,
+        'X-Requested-With': 'XMLHttpRequest',
+        'Referer': referer,
+    }
+
+
+@dataclass
+class ProfileFetch:
+    """Outcome of one profile-info request (status and final URL kept for session health checks)"""
+    status: int
+    url: str
+    body: str = ""               # response text when not a usable JSON payload (error message, HTML)
+    user: Optional[Dict] = None  # the profile user object, if the response carried it
+
+
+async def request_profile(context: BrowserContext, username: str, timeout: int = 10000,
+                          rate_limiter=None) -> ProfileFetch:
+    """
+    Request the profile-info JSON through the context's APIRequestContext.
+    Shares the context's cookies, so the logged-in session and CSRF token are reused.
+    """
+    if rate_limiter:
+        await rate_limiter.acquire('profile')
+    with NAVIGATION_SECONDS.time(kind='profile_api'):
+        response = await context.request.get(
+            PROFILE_INFO_URL.format(username=username),
+            headers=await api_headers(context, f"https://www.instagram.com/{username}/"),
+            timeout=timeout,
+            fail_on_status_code=False,
+        )
+    PAGE_LOADS.inc(kind='profile_api')
+    is_json = 'json' in (response.headers.get('content-type') or '')
+    body = (await response.text()) if not response.ok or not is_json else ""
+    if rate_limiter:
+        # Throttle messages come back as JSON ({"message": "Please wait a few minutes..."})
+        rate_limiter.record('profile', response.status, body if is_json and not response.ok else response.url)
+    if not response.ok or not is_json:
+        return ProfileFetch(response.status, response.url, body)
+    return ProfileFetch(response.status, response.url, user=find_user(await response.json(), username))
+
+
+async def fetch_profile_user(context: BrowserContext, username: str, timeout: int = 10000,
+                             rate_limiter=None) -> Optional[Dict]:
+    """
+    Fetch the profile user object in the context's logged-in session (see request_profile).
+    Returns None on any non-JSON / error response (login wall, 404, throttling).
+    """
+    return (await request_profile(context, username, timeout, rate_limiter)).user
+
+
+class ProfileResponseCapture:
+    """
+    Listens to a page's responses and keeps the first profile JSON for username.
+    Usage:
+        async with ProfileResponseCapture(page, username) as capture:
+            await page.goto(profile_url)
+            user = await capture.wait(timeout=3)
+    """
+
+    def __init__(self, page: Page, username: str):
+        self.page = page
+        self.username = username
+        self._found: asyncio.Future = asyncio.get_event_loop().create_future()
+        # Profile responses whose body is still being read
+        self._reading = 0
+
+    async def __aenter__(self):
+        self.page.on("response", self._on_response)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.page.remove_listener("response", self._on_response)
+        if not self._found.done():
+            self._found.cancel()
+
+    async def _on_response(self, response: Response):
+        if self._found.done() or not is_profile_response_url(response.url, self.username):
+            return
+        if 'json' not in (response.headers.get('content-type') or ''):
+            return
+        self._reading += 1
+        try:
+            user = find_user(await response.json(), self.username)
+        except Exception:
+            return  # Body unavailable (redirect, navigation away) or not JSON
+        finally:
+            self._reading -= 1
+        if user and not self._found.done():
+            self._found.set_result(user)
+
+    def result(self) -> Optional[Dict]:
+        """The captured user object so far, without waiting"""
+        if self._found.done() and not self._found.cancelled():
+            return self._found.result()
+        return None
+
+    async def settle(self, timeout: float = 2) -> Optional[Dict]:
+        """
+        The captured user object once the page is ready. The page can render the header from
+        the JSON before our listener has read the body, so if a profile response arrived and
+        its body is still being read, wait for it (up to timeout) instead of dropping it.
+        Doesn't wait when no profile response was seen (data inlined in the HTML).
+        """
+        if self.result() is None and self._reading:
+            return await self.wait(timeout)
+        return self.result()
+
+    async def wait(self, timeout: float = 3) -> Optional[Dict]:
+        """Return the captured user object, or None if none arrives within timeout seconds"""
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._found), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            return None
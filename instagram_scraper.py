@@ -9,12 +9,26 @@ import re
 from typing import List, Dict, Optional
 from playwright.async_api import async_playwright, Page, Browser
 import json
+import os
 from datetime import datetime
+from instagram_profile import ProfileResponseCapture, follower_count
+from resource_blocking import ResourceBlocker
+from rate_limiter import AdaptiveRateLimiter, print_run_report
+from candidates import Candidate
+from profile_cache import open_profile_cache, cached_fetch, close_caches, DEFAULT_TTL_HOURS
+from page_waits import goto_ready
+from metrics import MetricsExporter, CANDIDATES_DISCOVERED, PROFILES_VERIFIED, REJECTIONS, VERIFY_SECONDS
 
 
 class InstagramScraper:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, block_resources: bool = True,
+                 cache_ttl_hours: float = DEFAULT_TTL_HOURS):
         self.headless = headless
+        # Abort images/video/fonts - only HTML and JSON are read
+        self.block_resources = block_resources
+        self.resource_blocker = ResourceBlocker(enabled=block_resources)
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.profile_cache = open_profile_cache('followers', cache_ttl_hours)
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         
@@ -23,6 +37,8 @@ class InstagramScraper:
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(headless=self.headless)
         self.page = await self.browser.new_page()
+        if self.block_resources:
+            await self.resource_blocker.attach(self.page.context)
         
         # Set user agent to avoid detection
         await self.page.set_extra_http_headers({
@@ -31,6 +47,8 @@ class InstagramScraper:
         
     async def close(self):
         """Close browser"""
+        print_run_report(self.rate_limiter, self.resource_blocker)
+        close_caches(self.profile_cache)
         if self.browser:
             await self.browser.close()
             
@@ -61,10 +79,25 @@ class InstagramScraper:
             return False
         return 10000 <= followers <= 50000
     
-    async def search_accounts(self, keyword: str, max_results: int = 50) -> List[Dict]:
+    def _record_verification(self, account_data: Optional[Dict]) -> bool:
+        """Count a verified candidate in the run metrics; True if its follower count is in range"""
+        if not account_data:
+            PROFILES_VERIFIED.inc(result='error')
+            return False
+        followers = account_data.get('followers')
+        if self.is_valid_follower_count(followers):
+            PROFILES_VERIFIED.inc(result='accepted')
+            return True
+        REJECTIONS.inc(reason='unknown_followers' if followers is None else 'out_of_range')
+        PROFILES_VERIFIED.inc(result='rejected')
+        return False
+    
+    async def search_accounts(self, keyword: str, max_results: int = 50,
+                              seen_usernames: Optional[set] = None) -> List[Dict]:
         """
         Search Instagram for accounts matching the keyword
         Returns list of accounts with username, link, and followers
+        seen_usernames: usernames to skip (a set or seen_set.SeenSet shared across calls)
         """
         if not self.page:
             raise Exception("Browser not started. Call start() first.")
@@ -77,8 +110,8 @@ class InstagramScraper:
         # search_url = f"https://www.instagram.com/web/search/topsearch/?query={keyword}"
         
         try:
-            await self.page.goto(search_url, wait_until="networkidle", timeout=30000)
-            await asyncio.sleep(3)  # Wait for content to load
+            # networkidle never settles on Instagram; wait for the post grid instead
+            await goto_ready(self.page, search_url, 'hashtag', timeout=30000, rate_limiter=self.rate_limiter)
             
             # Try to find account links in search results
             # Instagram's structure varies, so we'll try multiple selectors
@@ -87,7 +120,8 @@ class InstagramScraper:
             # Method 1: Look for account links in the page
             account_links = await self.page.query_selector_all('a[href*="/"]')
             
-            seen_usernames = set()
+            if seen_usernames is None:
+                seen_usernames = set()
             
             for link in account_links[:max_results * 3]:  # Check more links to find valid accounts
                 try:
@@ -107,21 +141,20 @@ class InstagramScraper:
                         continue
                     
                     seen_usernames.add(username)
+                    CANDIDATES_DISCOVERED.inc(source='hashtag')
                     
                     # Navigate to profile to get follower count
                     profile_url = f"https://www.instagram.com/{username}/"
-                    account_data = await self.get_account_info(profile_url, username)
+                    with VERIFY_SECONDS.time():
+                        account_data = await self.get_account_info(profile_url, username)
                     
-                    if account_data and self.is_valid_follower_count(account_data.get('followers')):
+                    if self._record_verification(account_data):
                         accounts.append(account_data)
                         print(f"✅ Found: @{username} - {account_data.get('followers', 0):,} followers")
                         
                         if len(accounts) >= max_results:
                             break
                             
-                    # Be respectful with rate limiting
-                    await asyncio.sleep(2)
-                    
                 except Exception as e:
                     continue
                     
@@ -147,8 +180,7 @@ class InstagramScraper:
         search_url = f"https://www.instagram.com/web/search/topsearch/?query={keyword}"
         
         try:
-            await self.page.goto(search_url)
-            await asyncio.sleep(2)
+            await goto_ready(self.page, search_url, 'topsearch', rate_limiter=self.rate_limiter)
             
             # Get page content
             content = await self.page.content()
@@ -162,25 +194,30 @@ class InstagramScraper:
                     
                     for user_info in users[:max_results * 2]:
                         try:
-                            user = user_info.get('user', {})
-                            username = user.get('username')
+                            candidate = Candidate.from_user(user_info.get('user', {}), 'topsearch')
+                            if not candidate:
+                                continue
+                            username = candidate.username
+                            CANDIDATES_DISCOVERED.inc(source=candidate.source)
                             
-                            if not username:
+                            # Skip users whose search-payload follower count is far outside the range
+                            if candidate.clearly_out_of_range():
+                                REJECTIONS.inc(reason='out_of_range')
+                                PROFILES_VERIFIED.inc(result='rejected')
                                 continue
                             
                             # Get detailed account info
                             profile_url = f"https://www.instagram.com/{username}/"
-                            account_data = await self.get_account_info(profile_url, username)
+                            with VERIFY_SECONDS.time():
+                                account_data = await self.get_account_info(profile_url, username)
                             
-                            if account_data and self.is_valid_follower_count(account_data.get('followers')):
+                            if self._record_verification(account_data):
                                 accounts.append(account_data)
                                 print(f"✅ Found: @{username} - {account_data.get('followers', 0):,} followers")
                                 
                                 if len(accounts) >= max_results:
                                     break
                                     
-                            await asyncio.sleep(2)
-                            
                         except Exception as e:
                             continue
                             
@@ -193,13 +230,28 @@ class InstagramScraper:
         return accounts
     
     async def get_account_info(self, profile_url: str, username: str) -> Optional[Dict]:
+        """Get account information from profile page (dict with username, link, and followers).
+        Served from the profile cache while fresh; new results are written back"""
+        return await cached_fetch(self.profile_cache, username,
+                                  lambda: self._fetch_account_info(profile_url, username))
+    
+    async def _fetch_account_info(self, profile_url: str, username: str) -> Optional[Dict]:
         """
         Get account information from profile page
         Returns dict with username, link, and followers
         """
         try:
-            await self.page.goto(profile_url, wait_until="networkidle", timeout=20000)
-            await asyncio.sleep(2)  # Wait for content
+            async with ProfileResponseCapture(self.page, username) as capture:
+                await goto_ready(self.page, profile_url, 'profile', timeout=20000, extra=capture.wait(timeout=5), rate_limiter=self.rate_limiter)
+                user = await capture.settle()
+            
+            # Profile JSON fetched by the web app (no DOM scraping needed)
+            if user and follower_count(user) is not None:
+                return {
+                    'username': username,
+                    'link': profile_url,
+                    'followers': follower_count(user)
+                }
             
             # Try multiple selectors to find follower count
             followers = None
@@ -260,7 +312,8 @@ class InstagramScraper:
             return None
 
 
-async def scrape_instagram(keyword: str, max_results: int = 50, headless: bool = True) -> List[Dict]:
+async def scrape_instagram(keyword: str, max_results: int = 50, headless: bool = True,
+                           metrics_port: Optional[int] = None, metrics_file: Optional[str] = None) -> List[Dict]:
     """
     Main function to scrape Instagram accounts
     
@@ -268,13 +321,17 @@ async def scrape_instagram(keyword: str, max_results: int = 50, headless: bool =
         keyword: Domain/keyword to search for (e.g., "skinkare", "apparel")
         max_results: Maximum number of accounts to return
         headless: Run browser in headless mode
+        metrics_port: Serve Prometheus metrics on http://127.0.0.1:<port>/metrics during the run
+        metrics_file: Rewrite this Prometheus text file every few seconds during the run
     
     Returns:
         List of dicts with username, link, and followers
     """
     scraper = InstagramScraper(headless=headless)
+    exporter = MetricsExporter(metrics_port, metrics_file)
     
     try:
+        await exporter.start()
         await scraper.start()
         accounts = await scraper.search_accounts(keyword, max_results)
         
@@ -288,6 +345,7 @@ async def scrape_instagram(keyword: str, max_results: int = 50, headless: bool =
         
     finally:
         await scraper.close()
+        await exporter.stop()
 
 
 def save_results(accounts: List[Dict], keyword: str, filename: Optional[str] = None):
@@ -305,9 +363,13 @@ def save_results(accounts: List[Dict], keyword: str, filename: Optional[str] = N
 
 if __name__ == "__main__":
     import sys
+    from instagram_scraper_business_indian import _pop_cli_option
+    
+    metrics_port = _pop_cli_option(sys.argv, "--metrics-port", os.getenv('INSTAGRAM_METRICS_PORT'))
+    metrics_file = _pop_cli_option(sys.argv, "--metrics-file", os.getenv('INSTAGRAM_METRICS_FILE'))
     
     if len(sys.argv) < 2:
-        print("Usage: python instagram_scraper.py <keyword> [max_results]")
+        print("Usage: python instagram_scraper.py <keyword> [max_results] [--metrics-port N] [--metrics-file PATH]")
         print("Example: python instagram_scraper.py skinkare 50")
         sys.exit(1)
     
@@ -319,7 +381,10 @@ if __name__ == "__main__":
     print(f"🎯 Follower range: 10K - 50K")
     print(f"📊 Max results: {max_results}\n")
     
-    results = asyncio.run(scrape_instagram(keyword, max_results, headless=True))
+    results = asyncio.run(scrape_instagram(
+        keyword, max_results, headless=True,
+        metrics_port=int(metrics_port) if metrics_port else None, metrics_file=metrics_file,
+    ))
     
     if results:
         print(f"\n✨ Found {len(results)} accounts matching criteria:")
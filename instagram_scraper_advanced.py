@@ -11,14 +11,26 @@ from playwright.async_api import async_playwright, Page, Browser
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from instagram_profile import ProfileResponseCapture, follower_count
+from resource_blocking import ResourceBlocker
+from rate_limiter import AdaptiveRateLimiter, print_run_report
+from profile_cache import open_profile_cache, cached_fetch, close_caches, DEFAULT_TTL_HOURS
+from page_waits import goto_ready
+from metrics import MetricsExporter, CANDIDATES_DISCOVERED, PROFILES_VERIFIED, REJECTIONS, VERIFY_SECONDS
 
 # Load environment variables from .env file
 load_dotenv()
 
 
 class AdvancedInstagramScraper:
-    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, headless: bool = True):
+    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, headless: bool = True,
+                 block_resources: bool = True, cache_ttl_hours: float = DEFAULT_TTL_HOURS):
         self.headless = headless
+        # Abort images/video/fonts while scraping (paused during login)
+        self.block_resources = block_resources
+        self.resource_blocker = ResourceBlocker(enabled=block_resources)
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.profile_cache = open_profile_cache('followers', cache_ttl_hours)
         # Load from .env file, fallback to environment variables or provided values
         self.username = username or os.getenv('INSTAGRAM_USERNAME') or os.getenv('INSTAGRAM_USER')
         self.password = password or os.getenv('INSTAGRAM_PASSWORD') or os.getenv('INSTAGRAM_PASS')
@@ -42,6 +54,9 @@ class AdvancedInstagramScraper:
             timezone_id='America/New_York'
         )
         
+        if self.block_resources:
+            await self.resource_blocker.attach(context)
+        
         self.page = await context.new_page()
         
         # Remove webdriver property
@@ -53,6 +68,12 @@ class AdvancedInstagramScraper:
         
     async def login(self) -> bool:
         """Login to Instagram"""
+        # Login pages get fully rendered (blocking resumes afterwards)
+        with self.resource_blocker.paused():
+            return await self._login()
+    
+    async def _login(self) -> bool:
+        """Credential login flow, see login()"""
         if not self.username or not self.password:
             print("⚠️  No credentials provided. Some features may be limited.")
             return False
@@ -109,6 +130,8 @@ class AdvancedInstagramScraper:
     
     async def close(self):
         """Close browser"""
+        print_run_report(self.rate_limiter, self.resource_blocker)
+        close_caches(self.profile_cache)
         if self.browser:
             await self.browser.close()
     
@@ -135,9 +158,24 @@ class AdvancedInstagramScraper:
             return False
         return 10000 <= followers <= 50000
     
-    async def search_by_keyword(self, keyword: str, max_results: int = 50) -> List[Dict]:
+    def _record_verification(self, account_data: Optional[Dict]) -> bool:
+        """Count a verified candidate in the run metrics; True if its follower count is in range"""
+        if not account_data:
+            PROFILES_VERIFIED.inc(result='error')
+            return False
+        followers = account_data.get('followers')
+        if self.is_valid_follower_count(followers):
+            PROFILES_VERIFIED.inc(result='accepted')
+            return True
+        REJECTIONS.inc(reason='unknown_followers' if followers is None else 'out_of_range')
+        PROFILES_VERIFIED.inc(result='rejected')
+        return False
+    
+    async def search_by_keyword(self, keyword: str, max_results: int = 50,
+                                seen_usernames: Optional[set] = None) -> List[Dict]:
         """
         Search for accounts using keyword with multiple methods
+        seen_usernames: usernames to skip (a set or seen_set.SeenSet shared across calls)
         """
         if not self.page:
             raise Exception("Browser not started. Call start() first.")
@@ -145,14 +183,14 @@ class AdvancedInstagramScraper:
         print(f"🔍 Searching for accounts matching: {keyword}")
         
         accounts = []
-        seen_usernames = set()
+        if seen_usernames is None:
+            seen_usernames = set()
         
         # Method 1: Search hashtag page and extract from posts
         try:
             print("📱 Searching hashtag page...")
             search_url = f"https://www.instagram.com/explore/tags/{keyword}/"
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await goto_ready(self.page, search_url, 'hashtag', timeout=30000, rate_limiter=self.rate_limiter)
             
             # Find post links
             post_selectors = [
@@ -181,28 +219,26 @@ class AdvancedInstagramScraper:
                     
                     # Navigate to post
                     post_url = f"https://www.instagram.com{href}"
-                    await self.page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
-                    await asyncio.sleep(3)
+                    await goto_ready(self.page, post_url, 'post', timeout=20000, rate_limiter=self.rate_limiter)
                     
                     # Extract username from post page
                     username = await self.extract_username_from_post()
                     
                     if username and username not in seen_usernames:
                         seen_usernames.add(username)
+                        CANDIDATES_DISCOVERED.inc(source='hashtag')
                         
                         # Get account info
-                        account_data = await self.get_account_info(username)
+                        with VERIFY_SECONDS.time():
+                            account_data = await self.get_account_info(username)
                         
-                        if account_data:
-                            followers = account_data.get('followers')
-                            if followers and self.is_valid_follower_count(followers):
-                                accounts.append(account_data)
-                                print(f"✅ [{len(accounts)}/{max_results}] @{username}: {followers:,} followers")
-                                
-                                if len(accounts) >= max_results:
-                                    return accounts
-                    
-                    await asyncio.sleep(2)  # Rate limiting
+                        if self._record_verification(account_data):
+                            followers = account_data['followers']
+                            accounts.append(account_data)
+                            print(f"✅ [{len(accounts)}/{max_results}] @{username}: {followers:,} followers")
+                            
+                            if len(accounts) >= max_results:
+                                return accounts
                     
                 except Exception as e:
                     if not self.headless:
@@ -259,15 +295,29 @@ class AdvancedInstagramScraper:
         return None
     
     async def get_account_info(self, username: str) -> Optional[Dict]:
-        """Get account information from profile"""
+        """Get account information from profile.
+        Served from the profile cache while fresh; new results are written back"""
+        return await cached_fetch(self.profile_cache, username, lambda: self._fetch_account_info(username))
+    
+    async def _fetch_account_info(self, username: str) -> Optional[Dict]:
+        """Load a profile and parse its follower count (uncached)"""
         try:
             profile_url = f"https://www.instagram.com/{username}/"
-            await self.page.goto(profile_url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(3)
+            async with ProfileResponseCapture(self.page, username) as capture:
+                await goto_ready(self.page, profile_url, 'profile', timeout=20000, extra=capture.wait(timeout=5), rate_limiter=self.rate_limiter)
+                user = await capture.settle()
+            
+            # Method 0: Profile JSON fetched by the web app (no DOM serialization)
+            if user and follower_count(user) is not None:
+                return {
+                    'username': username,
+                    'link': profile_url,
+                    'followers': follower_count(user)
+                }
             
             followers = None
             
-            # Method 1: Parse from page source (most reliable)
+            # Method 1: Parse from page source (fallback)
             try:
                 page_content = await self.page.content()
                 
@@ -358,7 +408,9 @@ async def scrape_instagram_advanced(
     max_results: int = 50,
     username: Optional[str] = None,
     password: Optional[str] = None,
-    headless: bool = True
+    headless: bool = True,
+    metrics_port: Optional[int] = None,
+    metrics_file: Optional[str] = None,
 ) -> List[Dict]:
     """
     Advanced Instagram scraper with login support
@@ -369,13 +421,17 @@ async def scrape_instagram_advanced(
         username: Instagram username (optional, can use env var)
         password: Instagram password (optional, can use env var)
         headless: Run browser in headless mode
+        metrics_port: Serve Prometheus metrics on http://127.0.0.1:<port>/metrics during the run
+        metrics_file: Rewrite this Prometheus text file every few seconds during the run
     
     Returns:
         List of dicts with username, link, and followers
     """
     scraper = AdvancedInstagramScraper(username, password, headless)
+    exporter = MetricsExporter(metrics_port, metrics_file)
     
     try:
+        await exporter.start()
         await scraper.start()
         await scraper.login()
         accounts = await scraper.search_by_keyword(keyword, max_results)
@@ -384,13 +440,18 @@ async def scrape_instagram_advanced(
         
     finally:
         await scraper.close()
+        await exporter.stop()
 
 
 if __name__ == "__main__":
     import sys
+    from instagram_scraper_business_indian import _pop_cli_option
+    
+    metrics_port = _pop_cli_option(sys.argv, "--metrics-port", os.getenv('INSTAGRAM_METRICS_PORT'))
+    metrics_file = _pop_cli_option(sys.argv, "--metrics-file", os.getenv('INSTAGRAM_METRICS_FILE'))
     
     if len(sys.argv) < 2:
-        print("Usage: python instagram_scraper_advanced.py <keyword> [max_results]")
+        print("Usage: python instagram_scraper_advanced.py <keyword> [max_results] [--metrics-port N] [--metrics-file PATH]")
         print("Example: python instagram_scraper_advanced.py skinkare 50")
         print("\nNote: Set INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD env vars for login")
         sys.exit(1)
@@ -403,7 +464,10 @@ if __name__ == "__main__":
     print(f"🎯 Follower range: 10K - 50K")
     print(f"📊 Max results: {max_results}\n")
     
-    results = asyncio.run(scrape_instagram_advanced(keyword, max_results, headless=True))
+    results = asyncio.run(scrape_instagram_advanced(
+        keyword, max_results, headless=True,
+        metrics_port=int(metrics_port) if metrics_port else None, metrics_file=metrics_file,
+    ))
     
     if results:
         print(f"\n✨ Found {len(results)} accounts matching criteria:")
@@ -7,41 +7,140 @@ Filters for:
 """
 
 import asyncio
+import copy
 import re
 import json
-from typing import List, Dict, Optional, Callable
-from playwright.async_api import async_playwright, Page, Browser
+import time
+import weakref
+from dataclasses import asdict
+from typing import AsyncIterator, List, Dict, Optional, Callable, Union
+from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from datetime import datetime
 import os
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from instagram_profile import ProfileRecord, ProfileResponseCapture, request_profile, find_user_in_html
+from resource_blocking import ResourceBlocker
+from rate_limiter import AdaptiveRateLimiter, print_run_report
+from candidates import Candidate
+from frontier import CandidateFrontier
+from indian_locations import IndianLocationMatcher
+from account_sink import AccountSink
+from checkpoint import Checkpoint
+from seen_set import SeenSet, DEFAULT_FP_RATE
+from session_pool import SessionPool, session_problem, url_problem
+from session_validator import SessionValidator
+from login_state import LoginState, read_login_state, wait_for_login_change
+from metrics import MetricsExporter, CANDIDATES_DISCOVERED, PARSE_SECONDS, PROFILES_VERIFIED, REJECTIONS, VERIFY_SECONDS
+from hashtag_feed import HashtagPage, iter_hashtag_pages, DEFAULT_MAX_PAGES
+from profile_cache import RejectionCache, open_profile_cache, cached_fetch, close_caches, DEFAULT_CACHE_FILE, DEFAULT_TTL_HOURS
+from page_waits import goto_ready, wait_until_ready, expect_response, scroll_and_wait, race_selectors, READY_RESPONSES
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Browser fingerprint shared by every context (and by browser_daemon's persistent profile)
+LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'locale': 'en-IN',  # Indian locale
+    'timezone_id': 'Asia/Kolkata',  # Indian timezone
+}
+WEBDRIVER_INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+# Post-login interstitials ("Save your login info?", "Turn on notifications", "Add to home screen")
+PROMPT_DISMISS_SELECTOR = 'button:text-matches("^\\s*not now\\s*$", "i"), div[role="button"]:text-matches("^\\s*not now\\s*$", "i")'
+
+# First path segments that are Instagram pages, not accounts
+NON_ACCOUNT_PATHS = {'explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel', ''}
+
+# Saved Playwright storage states are named <cookies file>.storage_state.json
+STORAGE_STATE_SUFFIX = '.storage_state.json'
+
 
 class BusinessIndianScraper:
     def __init__(self, username: Optional[str] = None, password: Optional[str] = None, 
-                 cookies_file: Optional[str] = None, headless: bool = False):
+                 cookies_file: Optional[str] = None, headless: bool = False,
+                 concurrency: int = 1, fetch_mode: str = "api", block_resources: bool = True,
+                 cache_ttl_hours: float = DEFAULT_TTL_HOURS, remember_rejections: bool = True,
+                 candidate_priority: Optional[Callable[[Candidate], float]] = None,
+                 hashtag_pages: int = DEFAULT_MAX_PAGES, session_files: Optional[List[str]] = None,
+                 cdp_url: Optional[str] = None):
         self.headless = headless
+        # Attach to an already running, logged-in browser (browser_daemon.py) instead of launching one
+        self.cdp_url = cdp_url or os.getenv('INSTAGRAM_BROWSER_CDP')
+        # Number of profile pages verified in parallel (all share the logged-in context)
+        self.concurrency = max(1, concurrency)
+        # "api": profile-info JSON via context.request, page load only if it fails
+        # "page": always render the profile page
+        self.fetch_mode = fetch_mode
+        # Abort images/video/fonts during discovery and verification (paused while logging in)
+        self.block_resources = block_resources
+        self.resource_blocker = ResourceBlocker(enabled=block_resources)
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.profile_cache = open_profile_cache('business_indian', cache_ttl_hours)
+        # Why candidates were rejected, checked before any navigation
+        self.rejection_cache: Optional[RejectionCache] = None
+        if remember_rejections:
+            self.rejection_cache = RejectionCache(
+                os.getenv('INSTAGRAM_PROFILE_CACHE', DEFAULT_CACHE_FILE), profile_ttl_hours=cache_ttl_hours
+            )
         # Load from .env file, fallback to environment variables or provided values
         self.username = username or os.getenv('INSTAGRAM_USERNAME') or os.getenv('INSTAGRAM_USER')
         self.password = password or os.getenv('INSTAGRAM_PASSWORD') or os.getenv('INSTAGRAM_PASS')
         self.cookies_file = cookies_file or os.getenv('INSTAGRAM_COOKIES_FILE', 'instagram_cookies.json')
+        # Full Playwright storage state (cookies + local storage), restored before the cookies file.
+        # An explicit cookies file gets its own state file next to it, so it is never shadowed by
+        # another account's saved state (sharded workers each pass their own cookies file).
+        # A cookies file that already is a saved state is restored and updated in place
+        if cookies_file and cookies_file.endswith(STORAGE_STATE_SUFFIX):
+            self.storage_state_file = cookies_file
+        elif cookies_file:
+            self.storage_state_file = os.path.splitext(cookies_file)[0] + STORAGE_STATE_SUFFIX
+        else:
+            self.storage_state_file = os.getenv('INSTAGRAM_STORAGE_STATE_FILE', 'instagram_storage_state.json')
+        # One authenticated API request (cached for a while) instead of loading the home feed
+        self.session_validator = SessionValidator()
+        # Extra logged-in accounts (cookie files / storage states) that profile checks are spread across
+        if session_files is None and os.getenv('INSTAGRAM_SESSION_FILES'):
+            session_files = [f.strip() for f in os.getenv('INSTAGRAM_SESSION_FILES').split(',') if f.strip()]
+        self.session_pool: Optional[SessionPool] = SessionPool(session_files) if session_files else None
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self.verify_pages: List[Page] = []
+        # Pages that already dismiss prompts on their own
+        self.prompt_watched_pages = weakref.WeakSet()
+        # Hashtag feed pages fetched per call; each call continues from the last cursor
+        self.hashtag_pages = max(1, hashtag_pages)
+        self.hashtag_cursors: Dict[str, Dict] = {}
+        # Unchecked candidates, best first (checkpointed in infinite mode)
+        self.frontier = CandidateFrontier(candidate_priority)
+        # Per discovery source: candidates found / checked
+        self.source_progress: Dict[str, Dict[str, int]] = {}
+        # Candidates being fetched right now (not yet decided, so checkpointed as pending)
+        self.in_flight: Dict[str, Candidate] = {}
+        # Called with every accepted account as soon as it passes the filters
+        self.on_account: Optional[Callable[[Dict], None]] = None
+        # Set by sharded workers: profiles that couldn't be read are handed back here instead of
+        # being rejected (another worker/session retries them). Unset, they are rejected as usual
+        self.on_fetch_failure: Optional[Callable[[str], None]] = None
+        # Optional cap on profile checks in flight, shared with forks (see fork)
+        self.fetch_slots: Optional[asyncio.Semaphore] = None
         self.logged_in = False
         self.cookies_loaded = False
+        # Set once the main session hit a login wall/checkpoint and its cached validation was dropped
+        self.session_invalidated = False
         
-        # Indian location indicators
-        self.indian_keywords = [
-            'india', 'indian', 'mumbai', 'delhi', 'bangalore', 'chennai', 'hyderabad',
-            'pune', 'kolkata', 'ahmedabad', 'jaipur', 'surat', 'lucknow', 'kanpur',
-            'nagpur', 'indore', 'thane', 'bhopal', 'visakhapatnam', 'patna', 'vadodara',
-            'ghaziabad', 'ludhiana', 'agra', 'nashik', 'faridabad', 'meerut', 'rajkot',
-            'varanasi', 'srinagar', 'amritsar', 'ranchi', 'jabalpur', 'gwalior', 'jodhpur',
-            'raipur', 'kota', 'guwahati', 'chandigarh', 'solapur', 'hubli', 'tiruchirappalli',
-            'made in india', 'swadeshi', 'desi', 'bharat', 'hindustan', '+91'
-        ]
+        # Indian location indicators (built-in terms + indian_gazetteer.txt), compiled once
+        self.indian_matcher = IndianLocationMatcher.load()
+        # Read-only view of the matcher's terms (matching goes through indian_matcher)
+        self.indian_keywords = sorted(self.indian_matcher.terms)
         
     async def load_cookies(self) -> bool:
         """Load cookies from file if it exists (handles both string and JSON formats)"""
@@ -61,8 +160,10 @@ class BusinessIndianScraper:
                 # If not JSON, treat as cookie string format
                 cookies = self._convert_cookie_string_to_json(content)
             
-            # Ensure cookies is a list
-            if isinstance(cookies, dict):
+            # Ensure cookies is a list (a storage state file carries them under "cookies")
+            if isinstance(cookies, dict) and isinstance(cookies.get('cookies'), list):
+                cookies = cookies['cookies']
+            elif isinstance(cookies, dict):
                 cookies = [cookies]
             elif not isinstance(cookies, list):
                 print(f"⚠️  Invalid cookies format in {self.cookies_file}")
@@ -114,94 +215,147 @@ class BusinessIndianScraper:
         return cookies
     
     async def save_cookies(self):
-        """Save current cookies to file"""
+        """Save current cookies to file (and the full storage state, so the next run starts warm)"""
         try:
-            cookies = await self.page.context.cookies()
-            with open(self.cookies_file, 'w', encoding='utf-8') as f:
-                json.dump(cookies, f, indent=2, ensure_ascii=False)
+            if self.cookies_file != self.storage_state_file:
+                cookies = await self.page.context.cookies()
+                with open(self.cookies_file, 'w', encoding='utf-8') as f:
+                    json.dump(cookies, f, indent=2, ensure_ascii=False)
             print(f"💾 Saved cookies to {self.cookies_file}")
+            await self.save_storage_state()
         except Exception as e:
             print(f"⚠️  Error saving cookies: {str(e)}")
     
-    async def check_if_logged_in(self) -> bool:
-        """Check if already logged in using cookies"""
+    async def save_storage_state(self):
+        """Save the full storage state (cookies + local storage) for the next run to restore"""
         try:
-            await self.page.goto("https://www.instagram.com/", wait_until="domcontentloaded", timeout=15000)
-            await asyncio.sleep(3)
-            
-            current_url = self.page.url
-            page_content = await self.page.content()
+            await self.page.context.storage_state(path=self.storage_state_file)
+        except Exception as e:
+            print(f"⚠️  Error saving storage state: {str(e)}")
+    
+    async def check_if_logged_in(self, force: bool = False) -> bool:
+        """Check if the context's session is logged in: one authenticated API request,
+        skipped if the same session validated within the last 30 minutes (force=True re-checks).
+        Falls back to loading the home page only if the API answer is inconclusive."""
+        try:
+            valid = await self.session_validator.validate(self.context, force=force)
+        except Exception:
+            valid = None
+        if valid is None:
+            valid = await self._check_home_page()
+        self.logged_in = bool(valid)
+        if self.logged_in:
+            self.session_invalidated = False
+        return self.logged_in
+    
+    async def _session_lost(self, problem: Optional[str]):
+        """The main session hit a login wall or checkpoint: drop its cached validation, so the
+        next check_if_logged_in() (this run, the next run, the browser daemon) asks Instagram
+        again instead of trusting the 30-minute cache"""
+        if problem not in ('login_wall', 'checkpoint') or self.session_invalidated:
+            return
+        self.session_invalidated = True
+        try:
+            await self.session_validator.invalidate(self.context)
+        except Exception:
+            pass
+        print(f"   🚧 Session hit a {problem.replace('_', ' ')} - cached login validation dropped")
+    
+    async def _check_home_page(self) -> bool:
+        """Slow fallback: load the home page; logged in if it didn't redirect to or render a login form"""
+        try:
+            await goto_ready(self.page, "https://www.instagram.com/", 'home', timeout=15000, rate_limiter=self.rate_limiter)
             
             # Check if we're logged in (not on login page, no login prompts)
-            if "accounts/login" in current_url.lower():
+            if "accounts/login" in self.page.url.lower():
                 return False
             
-            # Check for login indicators
-            login_indicators = [
-                'input[name="username"]',
-                'input[name="password"]',
-                'Log in' in page_content,
-                'Sign up' in page_content
-            ]
-            
             # If we see login fields, we're not logged in
-            for indicator in login_indicators[:2]:  # Check selectors
+            for selector in ['input[name="username"]', 'input[name="password"]']:
                 try:
-                    element = await self.page.query_selector(indicator)
-                    if element:
+                    if await self.page.query_selector(selector):
                         return False
                 except:
                     continue
             
-            # Check for logged-in indicators
-            logged_in_indicators = [
-                'Home' in page_content,
-                'Explore' in page_content,
-                'Reels' in page_content,
-                'Profile' in page_content
-            ]
-            
-            if any(logged_in_indicators):
-                self.logged_in = True
-                return True
-            
-            return False
+            # Logged-out pages don't carry a session cookie
+            cookies = await self.context.cookies("https://www.instagram.com")
+            return any(c['name'] == 'sessionid' and c['value'] for c in cookies)
         except Exception as e:
             return False
     
-    async def start(self):
-        """Initialize browser and page"""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=self.headless,
-            args=['--disable-blink-features=AutomationControlled']
-        )
+    async def _new_context(self, storage_state: Optional[Union[str, Dict]] = None) -> BrowserContext:
+        """New browser context with the scraper's fingerprint, resource blocking and init script"""
+        context = await self.browser.new_context(**CONTEXT_OPTIONS, storage_state=storage_state)
+        await self._prepare_context(context)
+        return context
+    
+    async def _prepare_context(self, context: BrowserContext):
+        """Resource blocking and the webdriver init script (per connection, so attached contexts need it too)"""
+        if self.block_resources:
+            await self.resource_blocker.attach(context)
         
-        context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            locale='en-IN',  # Indian locale
-            timezone_id='Asia/Kolkata'  # Indian timezone
-        )
+        # Registered on the context so verification pool pages get it too
+        await context.add_init_script(WEBDRIVER_INIT_SCRIPT)
         
-        self.page = await context.new_page()
+        # Every page of the context dismisses "Not Now" prompts by itself
+        context.on('page', lambda page: asyncio.ensure_future(self._watch_prompts(page)))
+    
+    async def _attach(self, playwright) -> bool:
+        """Use the daemon browser's logged-in context over CDP; True if its session cookie is present"""
+        self.browser = await playwright.chromium.connect_over_cdp(self.cdp_url)
+        self.context = self.browser.contexts[0] if self.browser.contexts else await self.browser.new_context(**CONTEXT_OPTIONS)
+        await self._prepare_context(self.context)
+        self.page = await self.context.new_page()
+        cookies = await self.context.cookies("https://www.instagram.com")
+        self.logged_in = self.cookies_loaded = any(c['name'] == 'sessionid' and c['value'] for c in cookies)
+        print(f"🔌 Attached to browser at {self.cdp_url}" + (" (logged in)" if self.logged_in else ""))
+        return self.logged_in
+    
+    async def start(self):
+        """Initialize browser and page (or attach to the browser daemon if cdp_url is set)"""
+        playwright = await async_playwright().start()
+        if self.cdp_url:
+            # Already warmed up and logged in: no cookie replay or home-page check
+            await self._attach(playwright)
+        else:
+            self.browser = await playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+            # Saved storage state first: cookies plus local storage, so the session comes back warm
+            storage_state = self.storage_state_file if os.path.exists(self.storage_state_file) else None
+            try:
+                self.context = await self._new_context(storage_state=storage_state)
+            except Exception as e:
+                print(f"⚠️  Could not restore {self.storage_state_file}: {str(e)}")
+                storage_state = None
+                self.context = await self._new_context()
+            self.page = await self.context.new_page()
+            if storage_state and await self.check_if_logged_in():
+                self.cookies_loaded = True
+                print(f"✅ Session restored from {self.storage_state_file}"
+                      + (" (validated recently)" if self.session_validator.cached else ""))
         
-        await self.page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
+        if self.session_pool:
+            await self.session_pool.open(self._new_context)
+        if self.logged_in:
+            return
         
         # Try to load cookies if file exists
         if await self.load_cookies():
             # Check if cookies work (we're logged in)
             if await self.check_if_logged_in():
                 print("✅ Successfully logged in using cookies!")
-                await self.handle_prompts()
+                # Next run restores the full state instead of replaying the cookies
+                await self.save_storage_state()
                 return
         
     async def login(self) -> bool:
         """Login to Instagram (only if cookies didn't work)"""
+        # Interactive flow (OTP/challenge pages) gets fully rendered pages
+        with self.resource_blocker.paused():
+            return await self._login()
+    
+    async def _login(self) -> bool:
+        """Credential login flow, see login()"""
         # If already logged in via cookies, skip
         if self.logged_in:
             return True
@@ -214,25 +368,18 @@ class BusinessIndianScraper:
         try:
             print("🔐 Logging into Instagram...")
             await self.page.goto("https://www.instagram.com/accounts/login/", wait_until="domcontentloaded")
-            await asyncio.sleep(3)
             
+            # All candidates are probed at once; the first (most preferred) match wins
             username_selectors = [
                 'input[name="username"]',
                 'input[aria-label="Phone number, username, or email"]',
                 'input[type="text"]'
             ]
-            username_input = None
-            for selector in username_selectors:
-                try:
-                    username_input = await self.page.wait_for_selector(selector, timeout=5000)
-                    if username_input:
-                        break
-                except:
-                    continue
-            
-            if not username_input:
+            match = await race_selectors(self.page, username_selectors, timeout=10)
+            if not match:
                 print("❌ Could not find username input")
                 return False
+            username_input = match[1]
                 
             await username_input.fill(self.username)
             await asyncio.sleep(1)
@@ -242,26 +389,16 @@ class BusinessIndianScraper:
                 'input[aria-label="Password"]',
                 'input[type="password"]'
             ]
-            password_input = None
-            for selector in password_selectors:
-                try:
-                    password_input = await self.page.wait_for_selector(selector, timeout=5000)
-                    if password_input:
-                        break
-                except:
-                    continue
-            
-            if not password_input:
+            match = await race_selectors(self.page, password_selectors, timeout=5)
+            if not match:
                 print("❌ Could not find password input")
                 return False
+            password_input = match[1]
                 
             await password_input.fill(self.password)
             await asyncio.sleep(1)
             
-            # Try multiple methods to find and click login button
-            login_button = None
-            
-            # Method 1: Try common selectors
+            # Method 1: Find the login button (selectors and button text, raced together)
             login_selectors = [
                 'button[type="submit"]',
                 'button:has-text("Log in")',
@@ -270,206 +407,25 @@ class BusinessIndianScraper:
                 'button._acan._acap._acas._aj1-',
                 'button[class*="Log"]',
                 'form button',
-                'div[role="button"]:has-text("Log")'
+                'div[role="button"]:has-text("Log")',
+                'button:text-matches("log\\s*in", "i")',
             ]
+            match = await race_selectors(self.page, login_selectors, timeout=3)
+            login_button = match[1] if match else None
             
-            for selector in login_selectors:
-                try:
-                    login_button = await self.page.wait_for_selector(selector, timeout=3000)
-                    if login_button:
-                        break
-                except:
-                    continue
-            
-            # Method 2: Try to find by text content
-            if not login_button:
-                try:
-                    buttons = await self.page.query_selector_all('button')
-                    for button in buttons:
-                        text = await button.inner_text()
-                        if 'log' in text.lower() and 'in' in text.lower():
-                            login_button = button
-                            break
-                except:
-                    pass
-            
-            # Method 3: Try pressing Enter on password field
+            # Method 2: Try pressing Enter on password field
             if not login_button:
                 try:
+                    before = await read_login_state(self.page)
                     await password_input.press('Enter')
-                    await asyncio.sleep(5)
-                    
-                    # Check for OTP after Enter press
-                    current_url = self.page.url
-                    page_content = await self.page.content()
-                    
-                    otp_indicators = [
-                        "challenge" in current_url.lower(),
-                        "two_factor" in current_url.lower(),
-                        "verify" in current_url.lower(),
-                    ]
-                    
-                    if any(otp_indicators) or await self.check_for_otp_input():
-                        print("\n🔐 Instagram requires verification (OTP/2FA)")
-                        print("   Please enter the verification code in the browser window")
-                        print("   Waiting for you to complete verification...\n")
-                        
-                        success = await self.wait_for_otp_completion()
-                        if success:
-                            self.logged_in = True
-                            print("✅ Successfully logged in after verification!")
-                            await self.handle_prompts()
-                            return True
-                        else:
-                            return False
-                    
-                    if "accounts/login" not in current_url:
-                        self.logged_in = True
-                        print("✅ Successfully logged in!")
-                        await self.handle_prompts()
-                        return True
-                except:
+                    return await self._finish_login(before)
+                except Exception:
                     pass
             
             if login_button:
+                before = await read_login_state(self.page)
                 await login_button.click()
-                await asyncio.sleep(5)
-                
-                # Always check for OTP after login attempt - wait a bit more for page to load
-                await asyncio.sleep(3)
-                
-                # Check if OTP/challenge is required - check multiple times
-                for check_attempt in range(3):
-                    current_url = self.page.url
-                    page_content = await self.page.content()
-                    
-                    # Check for OTP/challenge indicators (including email verification)
-                    otp_indicators = [
-                        "challenge" in current_url.lower(),
-                        "two_factor" in current_url.lower(),
-                        "verify" in current_url.lower(),
-                        "security" in current_url.lower(),
-                        "accounts/challenge" in current_url.lower(),
-                        "code" in page_content.lower() and ("verification" in page_content.lower() or "security" in page_content.lower() or "enter" in page_content.lower()),
-                        # Email verification indicators
-                        "check your email" in page_content.lower(),
-                        "enter the code that we sent" in page_content.lower(),
-                        "sent to" in page_content.lower() and "@" in page_content.lower() and "code" in page_content.lower(),
-                        "get a new code" in page_content.lower()
-                    ]
-                    
-                    has_otp_input = await self.check_for_otp_input()
-                    
-                    if any(otp_indicators) or has_otp_input:
-                        print("\n" + "="*60)
-                        print("🔐 Instagram requires verification")
-                        print("="*60)
-                        print("   This could be:")
-                        print("   - Email verification code (Check your email)")
-                        print("   - SMS verification code")
-                        print("   - 2FA code")
-                        print("")
-                        print("   Please enter the verification code in the browser window")
-                        print("   The scraper will wait for you to complete verification...")
-                        print("   The scraper will auto-detect when you're done")
-                        print("="*60 + "\n")
-                        
-                        # Wait for user to enter OTP and submit
-                        success = await self.wait_for_otp_completion()
-                        
-                        if success:
-                            self.logged_in = True
-                            print("\n✅ Successfully logged in after verification!")
-                            await self.save_cookies()  # Save cookies for next time
-                            await self.handle_prompts()
-                            return True
-                        else:
-                            print("\n❌ Verification failed or timeout")
-                            return False
-                    
-                    # If not OTP page yet, wait a bit more and check again
-                    if check_attempt < 2:
-                        await asyncio.sleep(2)
-                
-                # Final check - wait a bit more and check again for OTP (sometimes it loads slowly)
-                await asyncio.sleep(5)
-                current_url = self.page.url
-                page_content = await self.page.content()
-                has_otp_input = await self.check_for_otp_input()
-                
-                # Check one more time for OTP (including email verification)
-                otp_indicators_final = [
-                    "challenge" in current_url.lower(),
-                    "two_factor" in current_url.lower(),
-                    "verify" in current_url.lower(),
-                    "security" in current_url.lower(),
-                    "accounts/challenge" in current_url.lower(),
-                    # Email verification
-                    "check your email" in page_content.lower(),
-                    "enter the code that we sent" in page_content.lower(),
-                ]
-                
-                if any(otp_indicators_final) or has_otp_input:
-                    print("\n" + "="*60)
-                    print("🔐 Instagram requires verification - Detected!")
-                    print("="*60)
-                    print("   This could be:")
-                    print("   - Email verification code (Check your email)")
-                    print("   - SMS verification code")
-                    print("   - 2FA code")
-                    print("")
-                    print("   Please enter the verification code in the browser window")
-                    print("   The scraper will wait for you to complete verification...")
-                    print("="*60 + "\n")
-                    
-                    success = await self.wait_for_otp_completion()
-                    if success:
-                        self.logged_in = True
-                        print("\n✅ Successfully logged in after verification!")
-                        await self.handle_prompts()
-                        return True
-                    else:
-                        return False
-                
-                # Normal login flow - check if we're logged in
-                if "accounts/login" not in current_url and "challenge" not in current_url.lower():
-                    self.logged_in = True
-                    print("✅ Successfully logged in!")
-                    await self.save_cookies()  # Save cookies for next time
-                    await self.handle_prompts()
-                    return True
-                else:
-                    # Still on login or challenge page
-                    if "challenge" in current_url.lower() or "verify" in current_url.lower() or "check your email" in page_content.lower():
-                        # OTP/Email verification page but detection might have failed - try waiting anyway
-                        if not self.headless:
-                            print("\n" + "="*60)
-                            print("⚠️  Detected verification page (OTP or Email Code)")
-                            print("="*60)
-                            print("   If you see a code input in the browser, enter it now")
-                            print("   This could be:")
-                            print("   - Email verification code")
-                            print("   - SMS verification code")
-                            print("   - 2FA code")
-                            print("   Waiting 30 seconds for manual verification...")
-                            print("="*60 + "\n")
-                            await asyncio.sleep(30)
-                            
-                            # Check again
-                            current_url = self.page.url
-                            if "accounts/login" not in current_url and "challenge" not in current_url.lower():
-                                self.logged_in = True
-                                print("✅ Successfully logged in!")
-                                await self.handle_prompts()
-                                return True
-                    
-                    print("❌ Login failed - still on login/challenge/verification page")
-                    if not self.headless:
-                        print("   💡 Check if credentials are correct")
-                        print("   💡 If verification code is shown (email/SMS/2FA), enter it in the browser window")
-                        print("   💡 The scraper will detect completion automatically")
-                        print("   💡 Look for 'Check your email' or code input fields")
-                    return False
+                return await self._finish_login(before)
             else:
                 print("❌ Could not find login button")
                 if not self.headless:
@@ -480,80 +436,74 @@ class BusinessIndianScraper:
             print(f"❌ Login error: {str(e)}")
             return False
     
-    async def check_for_otp_input(self) -> bool:
-        """Check if OTP input field is present (including email verification)"""
-        try:
-            otp_selectors = [
-                'input[name="verificationCode"]',
-                'input[name="security_code"]',
-                'input[name="code"]',
-                'input[aria-label*="code"]',
-                'input[aria-label*="Code"]',
-                'input[aria-label*="verification"]',
-                'input[type="text"][maxlength="6"]',
-                'input[type="text"][maxlength="8"]',
-                'input[type="tel"][maxlength="6"]',
-                'input[type="tel"][maxlength="8"]',
-                'input[placeholder*="code"]',
-                'input[placeholder*="Code"]',
-                'input[id*="code"]',
-                'input[id*="Code"]',
-                # Email verification specific
-                'label:has-text("Code") + input',
-                'input[aria-label="Code"]',
-                'input[placeholder="Code"]'
-            ]
-            
-            for selector in otp_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        # Verify it's visible
-                        is_visible = await element.is_visible()
-                        if is_visible:
-                            return True
-                except:
-                    continue
-            
-            # Also check page content for OTP-related text (including email verification)
-            try:
-                page_text = await self.page.inner_text('body')
-                otp_keywords = [
-                    'verification code', 
-                    'security code', 
-                    'enter code', 
-                    '6-digit code',
-                    'confirmation code',
-                    'two-factor',
-                    'two factor',
-                    # Email verification keywords
-                    'check your email',
-                    'enter the code that we sent',
-                    'sent to',
-                    'get a new code'
-                ]
-                if any(keyword in page_text.lower() for keyword in otp_keywords):
-                    # Additional check: if it mentions email, make sure there's a code input
-                    if 'check your email' in page_text.lower() or 'sent to' in page_text.lower():
-                        # Look for any input field that could be for code
-                        inputs = await self.page.query_selector_all('input[type="text"], input[type="tel"]')
-                        if inputs:
-                            return True
-                    else:
-                        return True
-            except:
-                pass
-                
-        except Exception as e:
-            if not self.headless:
-                pass  # Silently fail in headless mode
+    async def _finish_login(self, before: LoginState) -> bool:
+        """
+        After the login form was submitted: wait for the page to react (navigation or a change
+        in the login state, not fixed sleeps), then hand over to OTP entry or report the result
+        """
+        state = await wait_for_login_change(self.page, before, 15)
+        if not state.needs_code and state.login_form:
+            # Still on the form - the code page or the redirect can take a moment longer
+            state = await wait_for_login_change(self.page, state, 10)
         
+        if state.needs_code:
+            print("\n" + "="*60)
+            print("🔐 Instagram requires verification")
+            print("="*60)
+            print("   This could be:")
+            print("   - Email verification code (Check your email)")
+            print("   - SMS verification code")
+            print("   - 2FA code")
+            print("")
+            print("   Please enter the verification code in the browser window")
+            print("   The scraper will wait for you to complete verification...")
+            print("   The scraper will auto-detect when you're done")
+            print("="*60 + "\n")
+            
+            # Wait for user to enter OTP and submit
+            success = await self.wait_for_otp_completion(state=state)
+            
+            if success:
+                self.logged_in = True
+                print("\n✅ Successfully logged in after verification!")
+                await self.save_cookies()  # Save cookies for next time
+                await self.handle_prompts()
+                return True
+            else:
+                print("\n❌ Verification failed or timeout")
+                return False
+        
+        # Normal login flow - check if we're logged in
+        if state.logged_in:
+            self.logged_in = True
+            print("✅ Successfully logged in!")
+            await self.save_cookies()  # Save cookies for next time
+            await self.handle_prompts()
+            return True
+        
+        print("❌ Login failed - still on login/challenge/verification page")
+        if state.error:
+            print(f"   ⚠️  Instagram says: '{state.error}'")
+        if not self.headless:
+            print("   💡 Check if credentials are correct")
+            print("   💡 If verification code is shown (email/SMS/2FA), enter it in the browser window")
+            print("   💡 The scraper will detect completion automatically")
+            print("   💡 Look for 'Check your email' or code input fields")
         return False
     
-    async def wait_for_otp_completion(self, timeout: int = 600) -> bool:
+    async def check_for_otp_input(self) -> bool:
+        """Check if OTP input field is present (including email verification) - one in-page evaluation"""
+        try:
+            state = await read_login_state(self.page)
+            return state.otp_input or state.email_code
+        except Exception:
+            return False
+    
+    async def wait_for_otp_completion(self, timeout: int = 600, state: Optional[LoginState] = None) -> bool:
         """
-        Wait for user to manually enter OTP and complete verification
-        Checks every 2 seconds for up to timeout seconds (default 10 minutes)
+        Wait for user to manually enter OTP and complete verification (up to timeout seconds, default 10 minutes).
+        Wakes on navigation or when the page's login state changes, so completion is seen at once.
+        state: the code page's state if the caller already read it (otherwise it is read first)
         """
         if self.headless:
             print("   ⚠️  OTP entry requires non-headless mode!")
@@ -565,65 +515,23 @@ class BusinessIndianScraper:
         print(f"   💡 The scraper will automatically detect when verification is complete\n")
         
         start_time = asyncio.get_event_loop().time()
-        last_url = self.page.url
-        consecutive_same_url = 0
+        reported_error = None
         
         while True:
-            await asyncio.sleep(2)  # Check every 2 seconds
-            
             try:
-                current_url = self.page.url
-                page_content = await self.page.content()
+                # Always a real page read - the URL alone can't tell a code page from the feed
+                if state is None:
+                    state = await read_login_state(self.page)
                 
-                # Check if URL changed (might indicate navigation after OTP)
-                if current_url != last_url:
-                    last_url = current_url
-                    consecutive_same_url = 0
-                else:
-                    consecutive_same_url += 1
-                
-                # Check if we've successfully logged in (left the challenge/verification page)
-                challenge_indicators = [
-                    "challenge" in current_url.lower(),
-                    "two_factor" in current_url.lower(),
-                    "verify" in current_url.lower(),
-                    "accounts/challenge" in current_url.lower(),
-                    # Email verification page indicators
-                    "check your email" in page_content.lower(),
-                    "enter the code that we sent" in page_content.lower(),
-                ]
-                
-                if not any(challenge_indicators):
-                    if "accounts/login" not in current_url.lower():
-                        # Successfully logged in - not on login or challenge page
-                        elapsed = int(asyncio.get_event_loop().time() - start_time)
-                        print(f"\n   ✅ Verification completed in {elapsed} seconds!")
-                        await asyncio.sleep(2)  # Give it a moment to fully load
-                        return True
-                
-                # Check for error messages
-                error_indicators = [
-                    "try again" in page_content.lower(),
-                    "incorrect" in page_content.lower(),
-                    "wrong code" in page_content.lower(),
-                    "invalid" in page_content.lower()
-                ]
+                # Successfully logged in - not on the login, challenge or code page any more
+                if state.logged_in:
+                    elapsed = int(asyncio.get_event_loop().time() - start_time)
+                    print(f"\n   ✅ Verification completed in {elapsed} seconds!")
+                    return True
                 
-                if any(error_indicators):
+                if state.error and state.error != reported_error:
                     print("   ⚠️  Verification code may be incorrect. Please try again.")
-                    await asyncio.sleep(3)  # Wait a bit before checking again
-                
-                # Check if OTP input field is gone (might mean submitted)
-                has_otp_field = await self.check_for_otp_input()
-                if not has_otp_field and any(challenge_indicators):
-                    # OTP field gone but still on challenge page - might be processing
-                    await asyncio.sleep(3)
-                    # Check again
-                    current_url = self.page.url
-                    if "challenge" not in current_url.lower() and "accounts/login" not in current_url.lower():
-                        elapsed = int(asyncio.get_event_loop().time() - start_time)
-                        print(f"\n   ✅ Verification completed in {elapsed} seconds!")
-                        return True
+                reported_error = state.error
                 
                 # Timeout check
                 elapsed = asyncio.get_event_loop().time() - start_time
@@ -633,32 +541,67 @@ class BusinessIndianScraper:
                     print(f"   💡 The scraper will continue once you're logged in")
                     return False
                 
-                # Show progress every 20 seconds
-                if int(elapsed) % 20 == 0 and elapsed > 0 and elapsed < timeout:
-                    print(f"   ⏳ Still waiting... ({int(elapsed)}s / {timeout}s) - Enter code in browser window")
+                # Sleeps until something happens; wakes every 20 seconds to show progress
+                previous = state
+                state = await wait_for_login_change(self.page, state, min(20, timeout - elapsed + 1))
+                if state == previous:
+                    elapsed = asyncio.get_event_loop().time() - start_time
+                    if elapsed < timeout:
+                        print(f"   ⏳ Still waiting... ({int(elapsed)}s / {timeout}s) - Enter code in browser window")
                     
             except Exception as e:
-                # If there's an error checking, continue waiting
+                # If there's an error checking (e.g. mid-navigation), re-read the state
                 if not self.headless:
                     print(f"   ⚠️  Error checking status: {str(e)}")
-                await asyncio.sleep(2)
+                try:
+                    await self.page.wait_for_load_state('domcontentloaded', timeout=5000)
+                except Exception:
+                    await asyncio.sleep(1)
+                state = None
+    
+    async def _watch_prompts(self, page: Page):
+        """Register a locator handler that clicks "Not Now" whenever a prompt blocks an action on page (once per page)"""
+        if page in self.prompt_watched_pages:
+            return
+        self.prompt_watched_pages.add(page)
+        
+        async def dismiss(locator):
+            try:
+                await locator.first.click(timeout=2000)
+            except Exception:
+                pass
+        
+        try:
+            # no_wait_after: never hold up the interrupted action if the prompt doesn't go away
+            await page.add_locator_handler(page.locator(PROMPT_DISMISS_SELECTOR), dismiss, no_wait_after=True)
+        except Exception:
+            pass
     
     async def handle_prompts(self):
-        """Handle Instagram prompts after login"""
-        prompts = ['button:has-text("Not Now")', 'button:has-text("Not now")']
-        for _ in range(3):
-            for prompt in prompts:
-                try:
-                    button = await self.page.wait_for_selector(prompt, timeout=2000)
-                    if button:
-                        await button.click()
-                        await asyncio.sleep(2)
-                except:
-                    pass
+        """Handle Instagram prompts after login - dismiss what is showing now, never wait for one"""
+        await self._watch_prompts(self.page)
+        try:
+            prompt = self.page.locator(PROMPT_DISMISS_SELECTOR).first
+            if await prompt.is_visible():
+                await prompt.click(timeout=2000)
+        except Exception:
+            pass
     
     async def close(self):
         """Close browser"""
+        print_run_report(self.rate_limiter, self.resource_blocker)
+        close_caches(self.profile_cache, self.rejection_cache)
+        if self.session_pool:
+            print(self.session_pool.report())
+            await self.session_pool.close()
         if self.browser:
+            if self.cdp_url:
+                # Attached to the daemon: close only our tabs; browser.close() then just disconnects
+                for page in {self.page, *self.verify_pages}:
+                    try:
+                        await page.close()
+                    except:
+                        pass
             await self.browser.close()
     
     def parse_followers(self, followers_text: str) -> Optional[int]:
@@ -738,33 +681,8 @@ class BusinessIndianScraper:
         - Indian cities
         - Location data indicating India
         """
-        combined_text = (page_content + " " + bio).lower()
-        
-        # Check for Indian phone numbers
-        if re.search(r'\+91[\s-]?\d', combined_text):
-            return True
-        
-        # Check for Indian location keywords
-        for keyword in self.indian_keywords:
-            if keyword.lower() in combined_text:
-                return True
-        
-        # Check for location data in JSON
-        location_patterns = [
-            r'"location":\s*"([^"]*india[^"]*)"',
-            r'"country_code":\s*"IN"',
-            r'"country":\s*"India"',
-            r'"city_name":\s*"([^"]*)"',  # Indian cities
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, combined_text, re.IGNORECASE)
-            if matches:
-                match_text = matches[0].lower()
-                if any(indian_kw in match_text for indian_kw in ['india', 'indian', 'mumbai', 'delhi', 'bangalore']):
-                    return True
-        
-        return False
+        # One pass per text for all cities/states/terms, +91 numbers and country fields
+        return bool(self.indian_matcher.search(bio) or self.indian_matcher.search(page_content))
     
     async def search_accounts_by_keyword(
         self,
@@ -787,115 +705,33 @@ class BusinessIndianScraper:
         
         accounts = []
         
+        # Candidates left over from a resumed run (or a stopped round) go first
+        if len(self.frontier):
+            print(f"↩️  Checking {len(self.frontier)} candidates left over from the last run...\n")
+            await self.verify_candidates(self.frontier, accounts, max_results, seen_usernames, stop_requested)
+            if (stop_requested and stop_requested()) or (max_results > 0 and len(accounts) >= max_results):
+                return accounts
+        
         # Method 1: Use Instagram's search API directly
         try:
-            print("📱 Searching Instagram accounts...")
-            
-            # Use Instagram's search API endpoint
-            search_url = f"https://www.instagram.com/web/search/topsearch/?query={keyword}"
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(3)
-            
-            # Extract accounts from search API response
-            usernames = await self.extract_accounts_from_search_api()
-            
-            if not usernames:
-                # Fallback: Try using search page with input
-                print("   Trying search page method...")
-                await self.page.goto("https://www.instagram.com/", wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(3)
-                
-                # Find search input
-                search_selectors = [
-                    'input[placeholder*="Search"]',
-                    'input[aria-label*="Search"]',
-                    'input[type="text"]'
-                ]
-                
-                search_input = None
-                for selector in search_selectors:
-                    try:
-                        search_input = await self.page.wait_for_selector(selector, timeout=5000)
-                        if search_input:
-                            break
-                    except:
-                        continue
-                
-                if search_input:
-                    await search_input.fill(keyword)
-                    await asyncio.sleep(3)
-                    usernames = await self.extract_accounts_from_search_results()
-            
-            if usernames:
-                print(f"   Found {len(usernames)} accounts in search results")
-            
-            # Get MORE accounts: also run hashtag search and combine (don't navigate yet)
-            more_usernames = await self.get_more_candidates_via_hashtag(keyword, limit=100)
-            for u in more_usernames:
-                if u not in usernames:
-                    usernames.append(u)
-            if more_usernames:
-                print(f"   Added {len(more_usernames)} more from hashtag search (total: {len(usernames)} candidates)")
-            
-            # Optional: search with keyword variations for even more
-            cap = (max_results * 5) if max_results > 0 else 500
-            for variation in self._keyword_variations(keyword):
-                if len(usernames) >= cap:  # Enough candidates
-                    break
-                await asyncio.sleep(1)
-                await self.page.goto(f"https://www.instagram.com/web/search/topsearch/?query={variation}", wait_until="domcontentloaded", timeout=15000)
-                await asyncio.sleep(2)
-                extra = await self.extract_accounts_from_search_api()
-                for u in extra:
-                    if u not in usernames:
-                        usernames.append(u)
-            if len(usernames) > 0:
-                print(f"   Total unique candidates to check: {len(usernames)}\n")
-            
-            # Process found accounts
-            check_limit = (max_results * 5) if max_results > 0 else len(usernames)
-            if usernames:
-                print(f"   Processing up to {min(check_limit, len(usernames))} accounts...\n")
-                for username in usernames[:check_limit]:
-                    if stop_requested and stop_requested():
-                        return accounts
-                    if username in seen_usernames:
-                        continue
-                    seen_usernames.add(username)
-                    
-                    account_data = await self.get_account_info(username)
-                    
-                    if account_data:
-                        # Check if it's a business account
-                        if not account_data.get('is_business', False):
-                            if not self.headless:
-                                print(f"   ⏭️  @{username}: Not a business account (skipping)")
-                            continue
-                        
-                        # Check if it's Indian
-                        if not account_data.get('is_indian', False):
-                            if not self.headless:
-                                print(f"   ⏭️  @{username}: Not an Indian brand (skipping)")
-                            continue
-                        
-                        # Check follower count
-                        followers = account_data.get('followers')
-                        if followers and self.is_valid_follower_count(followers):
-                            accounts.append(account_data)
-                            n = len(accounts)
-                            label = f"{n}" if max_results <= 0 else f"{n}/{max_results}"
-                            print(f"✅ [{label}] @{username}: {followers:,} followers | {account_data.get('category', 'Business')}")
-                            
-                            if max_results > 0 and len(accounts) >= max_results:
-                                return accounts
-                        else:
-                            if not self.headless:
-                                print(f"   ⏭️  @{username}: {followers or 'Unknown'} followers (not in range)")
-                    
-                    await asyncio.sleep(2)  # Rate limiting
-            
+            found = await self.discover_candidates(keyword, max_results, seen_usernames)
+            
+            # Process found accounts, most promising first
+            check_limit = (max_results * 5) if max_results > 0 else None
+            if len(self.frontier):
+                print(f"   Processing up to {min(check_limit or len(self.frontier), len(self.frontier))} accounts "
+                      f"({self.concurrency} in parallel)...\n")
+                await self.verify_candidates(
+                    self.frontier,
+                    accounts,
+                    max_results,
+                    seen_usernames,
+                    stop_requested,
+                    max_checks=check_limit,
+                )
+
             # If no accounts found from search, fallback to hashtag method
-            if not usernames:
+            if not found:
                 print("   No accounts found in search, trying hashtag method...")
                 return await self.search_via_hashtags(keyword, max_results if max_results > 0 else 999999, seen_usernames)
         
@@ -911,6 +747,294 @@ class BusinessIndianScraper:
         
         return accounts
     
+    async def discover_candidates(self, keyword: str, max_results: int = 50,
+                                  seen_usernames: Optional[set] = None) -> int:
+        """Fill the frontier from search (API, then the search box), the hashtag feed and
+        keyword variations, without verifying anything; returns how many candidates were new"""
+        if seen_usernames is None:
+            seen_usernames = set()
+        print("📱 Searching Instagram accounts...")
+        
+        # Use Instagram's search API endpoint
+        search_url = f"https://www.instagram.com/web/search/topsearch/?query={keyword}"
+        await goto_ready(self.page, search_url, 'topsearch', timeout=30000, rate_limiter=self.rate_limiter)
+        
+        # Extract accounts from search API response
+        found = self._add_candidates(await self.extract_accounts_from_search_api(), seen_usernames)
+        
+        if not found:
+            # Fallback: Try using search page with input
+            print("   Trying search page method...")
+            await goto_ready(self.page, "https://www.instagram.com/", 'search_input', timeout=30000, rate_limiter=self.rate_limiter)
+            
+            # Find search input
+            search_selectors = [
+                'input[placeholder*="Search"]',
+                'input[aria-label*="Search"]',
+                'input[type="text"]'
+            ]
+            
+            match = await race_selectors(self.page, search_selectors, timeout=5)
+            search_input = match[1] if match else None
+            
+            if search_input:
+                # Results are ready once the typeahead request comes back
+                results_ready = expect_response(self.page, READY_RESPONSES['search'], timeout=5)
+                await search_input.fill(keyword)
+                await wait_until_ready(self.page, None, timeout=5, extra=results_ready)
+                found += self._add_candidates(await self.extract_accounts_from_search_results(), seen_usernames)
+        
+        if found:
+            print(f"   Found {found} accounts in search results")
+        
+        # Get MORE accounts: also run hashtag search and combine (don't navigate yet)
+        more = self._add_candidates(await self.get_more_candidates_via_hashtag(keyword), seen_usernames)
+        found += more
+        if more:
+            print(f"   Added {more} more from hashtag search (total: {len(self.frontier)} candidates)")
+        
+        # Optional: search with keyword variations for even more
+        cap = (max_results * 5) if max_results > 0 else 500
+        for variation in self._keyword_variations(keyword):
+            if len(self.frontier) >= cap:  # Enough candidates
+                break
+            await goto_ready(self.page, f"https://www.instagram.com/web/search/topsearch/?query={variation}", 'topsearch', timeout=15000, rate_limiter=self.rate_limiter)
+            found += self._add_candidates(await self.extract_accounts_from_search_api(), seen_usernames)
+        if len(self.frontier) > 0:
+            print(f"   Total unique candidates to check: {len(self.frontier)}\n")
+        return found
+    
+    def _add_candidates(self, found: List[Candidate], seen_usernames: set) -> int:
+        """Add discovered candidates to the frontier (already-checked usernames are ignored,
+        repeats merge their metadata and source); returns how many were new"""
+        added = 0
+        for candidate in found:
+            if candidate.username in seen_usernames:
+                continue
+            if self.frontier.add(candidate):
+                self._count_source(candidate.source, 'found')
+                CANDIDATES_DISCOVERED.inc(source=candidate.source or 'unknown')
+                added += 1
+        return added
+    
+    def _count_source(self, source: str, key: str):
+        progress = self.source_progress.setdefault(source or 'unknown', {'found': 0, 'checked': 0})
+        progress[key] += 1
+    
+    def checkpoint_state(self, keyword: str, seen_usernames: set, round_number: int) -> Dict:
+        """Snapshot for checkpoint.Checkpoint: decided usernames, unchecked candidates, per-source progress"""
+        return {
+            'keyword': keyword,
+            'round': round_number,
+            'saved_at': time.time(),
+            # A SeenSet persists itself; only plain sets are stored in the checkpoint
+            'seen': [] if isinstance(seen_usernames, SeenSet) else list(seen_usernames),
+            'pending': [asdict(c) for c in list(self.in_flight.values())] + [asdict(c) for c in self.frontier],
+            'sources': {source: dict(progress) for source, progress in self.source_progress.items()},
+            'cursors': {tag: dict(cursor) for tag, cursor in self.hashtag_cursors.items()},
+        }
+    
+    def restore_checkpoint(self, state: Dict, seen_usernames: set) -> int:
+        """Load a checkpoint_state() snapshot into seen_usernames and the pending queue; returns its round"""
+        seen_usernames.update(state.get('seen', []))
+        self.frontier.extend(Candidate(**c) for c in state.get('pending', []) if c.get('username') not in seen_usernames)
+        self.source_progress = {source: dict(progress) for source, progress in state.get('sources', {}).items()}
+        self.hashtag_cursors = {tag: dict(cursor) for tag, cursor in state.get('cursors', {}).items()}
+        return int(state.get('round', 0))
+    
+    async def _get_verify_pages(self) -> List[Page]:
+        """Return the verification page pool, opening extra pages in the shared context on first use"""
+        if not self.verify_pages:
+            self.verify_pages = [self.page]
+            for _ in range(self.concurrency - 1):
+                self.verify_pages.append(await self.context.new_page())
+        return self.verify_pages
+
+    async def verify_candidates(
+        self,
+        frontier: CandidateFrontier,
+        accounts: List[Dict],
+        max_results: int,
+        seen_usernames: set,
+        stop_requested: Optional[Callable[[], bool]] = None,
+        max_checks: Optional[int] = None,
+    ) -> List[Dict]:
+        """Verify candidates from the frontier, best first, appending matches to accounts.
+        One worker per verification page pulls the next candidate, so at most `concurrency`
+        profiles are in flight. Stops when the frontier is empty, max_checks candidates were
+        taken, max_results is reached or a stop is requested. If max_results is 0, no limit.
+        Candidates whose discovery payload already shows a follower count well outside
+        the range are rejected without loading the profile.
+        """
+        pages = await self._get_verify_pages()
+        checks = 0
+        # Being checked by another job sharing this session: back into the frontier afterwards
+        deferred: List[Candidate] = []
+
+        def finished() -> bool:
+            if stop_requested and stop_requested():
+                return True
+            if max_checks is not None and checks >= max_checks:
+                return True
+            return max_results > 0 and len(accounts) >= max_results
+
+        async def worker(page: Page):
+            nonlocal checks
+            while not finished():
+                candidate = frontier.pop()
+                if candidate is None:
+                    return
+                if candidate.username in seen_usernames:
+                    continue
+                if candidate.username in self.in_flight:
+                    deferred.append(candidate)
+                    continue
+                checks += 1
+                await self._verify_candidate(candidate, page, accounts, max_results, seen_usernames)
+
+        await asyncio.gather(*(worker(page) for page in pages))
+        # Still undecided if the other job failed or was already full; checked next round
+        frontier.extend(c for c in deferred if c.username not in seen_usernames)
+        return accounts
+
+    async def _verify_candidate(self, candidate: Candidate, page: Page, accounts: List[Dict],
+                                max_results: int, seen_usernames: set):
+        """Check one candidate on `page` and accept it if it passes the filters.
+        The username is marked seen once it is decided. With on_fetch_failure set, a failed
+        fetch (login wall, throttling, unreadable profile) is not a decision: the username stays
+        unseen, no rejection is recorded and on_fetch_failure is told"""
+        username = candidate.username
+        if self.is_known_rejection(username):
+            seen_usernames.add(username)
+            PROFILES_VERIFIED.inc(result='skipped')
+            return
+        if candidate.clearly_out_of_range():
+            seen_usernames.add(username)
+            self._record_rejection(username, 'out_of_range_far', candidate.follower_count)
+            PROFILES_VERIFIED.inc(result='rejected')
+            if not self.headless:
+                print(f"   ⏭️  @{username}: {candidate.follower_count:,} followers in "
+                      f"{candidate.source} results (not in range, not loaded)")
+            return
+
+        self.in_flight[username] = candidate
+        decided = False
+        try:
+            with VERIFY_SECONDS.time():
+                account_data = await self._fetch_in_slot(username, page)
+            if self.on_fetch_failure and not self.is_readable_account(account_data):
+                PROFILES_VERIFIED.inc(result='error')
+                self.on_fetch_failure(username)
+                return
+            if account_data and max_results > 0 and len(accounts) >= max_results:
+                # This job filled up while the profile was loading: leave the username unseen so
+                # another keyword sharing the seen-set can still take it (the profile cache makes that cheap)
+                return
+            decided = True
+            if not account_data:
+                PROFILES_VERIFIED.inc(result='error')
+            elif not self.is_readable_account(account_data):
+                # Deleted, private or unparseable: short-TTL rejection so later rounds don't re-fetch it
+                self._record_rejection(username, 'unknown_followers')
+                PROFILES_VERIFIED.inc(result='rejected')
+            else:
+                accepted = self._accept_account(account_data, accounts, max_results)
+                PROFILES_VERIFIED.inc(result='accepted' if accepted else 'rejected')
+        finally:
+            self.in_flight.pop(username, None)
+            if decided:
+                seen_usernames.add(username)
+            self._count_source(candidate.source, 'checked')
+    
+    @staticmethod
+    def is_readable_account(account_data: Optional[Dict]) -> bool:
+        """False if the profile fetch failed or the follower count couldn't be read - nothing to decide on"""
+        return bool(account_data) and account_data.get('followers') is not None
+
+    async def _fetch_in_slot(self, username: str, page: Page) -> Optional[Dict]:
+        """get_account_info, waiting for a shared fetch slot first if there is a cap"""
+        if not self.fetch_slots:
+            return await self.get_account_info(username, page=page)
+        async with self.fetch_slots:
+            return await self.get_account_info(username, page=page)
+    
+    async def fork(self, concurrency: Optional[int] = None) -> 'BusinessIndianScraper':
+        """Scraper for another concurrent search on this browser session.
+        Shares the context, rate limiter, caches, fetch slots and in-flight set; gets its own
+        discovery page, verification pages, frontier and hashtag cursors. Close with release()."""
+        worker = copy.copy(self)
+        worker.concurrency = max(1, concurrency or self.concurrency)
+        worker.page = await self.context.new_page()
+        worker.verify_pages = []
+        worker.frontier = CandidateFrontier(self.frontier.priority, self.frontier.max_size)
+        worker.hashtag_cursors = {}
+        worker.source_progress = {}
+        worker.on_account = None
+        worker.on_fetch_failure = None
+        return worker
+    
+    async def release(self):
+        """Close a fork's pages (the shared browser, session and caches stay open)"""
+        pages = [self.page] + [p for p in self.verify_pages if p is not self.page]
+        for page in pages:
+            try:
+                await page.close()
+            except:
+                pass
+    
+    def is_known_rejection(self, username: str) -> bool:
+        """Check the rejection cache (no navigation) for an unexpired earlier rejection"""
+        if not self.rejection_cache:
+            return False
+        rejection = self.rejection_cache.get(username)
+        if not rejection:
+            return False
+        self.rejection_cache.skipped += 1
+        if not self.headless:
+            print(f"   ⏭️  @{username}: rejected earlier ({rejection['reason']}), skipping")
+        return True
+
+    def _record_rejection(self, username: str, reason: str, followers: Optional[int] = None):
+        REJECTIONS.inc(reason=reason)
+        if self.rejection_cache:
+            self.rejection_cache.add(username, reason, followers)
+
+    def _accept_account(self, account_data: Dict, accounts: List[Dict], max_results: int) -> bool:
+        """Apply business / Indian / follower filters and append the account if it passes.
+        Rejections are recorded with their reason in the rejection cache"""
+        username = account_data['username']
+        followers = account_data.get('followers')
+
+        # Check if it's a business account
+        if not account_data.get('is_business', False):
+            self._record_rejection(username, 'not_business', followers)
+            if not self.headless:
+                print(f"   ⏭️  @{username}: Not a business account (skipping)")
+            return False
+
+        # Check if it's Indian
+        if not account_data.get('is_indian', False):
+            self._record_rejection(username, 'not_indian', followers)
+            if not self.headless:
+                print(f"   ⏭️  @{username}: Not an Indian brand (skipping)")
+            return False
+
+        # Check follower count
+        if not (followers and self.is_valid_follower_count(followers)):
+            reason = self.rejection_cache.classify_follower_rejection(followers) if self.rejection_cache else 'out_of_range'
+            self._record_rejection(username, reason, followers)
+            if not self.headless:
+                print(f"   ⏭️  @{username}: {followers or 'Unknown'} followers (not in range)")
+            return False
+
+        accounts.append(account_data)
+        n = len(accounts)
+        label = f"{n}" if max_results <= 0 else f"{n}/{max_results}"
+        print(f"✅ [{label}] @{username}: {followers:,} followers | {account_data.get('category', 'Business')}")
+        if self.on_account:
+            self.on_account(account_data)
+        return True
+
     def _keyword_variations(self, keyword: str) -> List[str]:
         """Return related search terms to get more candidates."""
         k = keyword.strip().lower()
@@ -927,42 +1051,62 @@ class BusinessIndianScraper:
                     variations.append(term)
         return variations[:4]  # Max 4 extra searches
     
-    async def get_more_candidates_via_hashtag(self, keyword: str, limit: int = 100) -> List[str]:
-        """Get usernames from hashtag page without full post navigation (quick extract)."""
-        usernames = []
+    async def hashtag_feed(self, tag: str) -> AsyncIterator[HashtagPage]:
+        """Stream hashtag feed pages (up to hashtag_pages), continuing from where the previous
+        call for this tag stopped; once the feed ends the next call starts from the top again"""
+        cursor = self.hashtag_cursors.get(tag, {})
+        async for feed_page in iter_hashtag_pages(
+            self.context, tag, self.hashtag_pages, cursor.get('max_id'), cursor.get('page', 0),
+            rate_limiter=self.rate_limiter,
+        ):
+            if feed_page.cursor:
+                self.hashtag_cursors[tag] = {'max_id': feed_page.cursor, 'page': feed_page.next_page}
+            else:
+                self.hashtag_cursors.pop(tag, None)
+            yield feed_page
+    
+    async def get_more_candidates_via_hashtag(self, keyword: str, limit: int = 100) -> List[Candidate]:
+        """Get candidates from the hashtag feed (paginated API), or from the hashtag page's
+        grid if the feed is unavailable (quick extract, no post navigation).
+        The feed stops paging once `limit` candidates are in (at most hashtag_pages pages; the
+        next call continues from the cursor), so a fetched page is never cut short."""
+        candidates: List[Candidate] = []
+        async for feed_page in self.hashtag_feed(keyword):
+            candidates.extend(Candidate.from_user(user, 'hashtag') for user in feed_page.owners)
+            if len(candidates) >= limit:
+                break
+        if candidates:
+            return candidates
+        
+        usernames: Dict[str, None] = {}  # Ordered set
         try:
             url = f"https://www.instagram.com/explore/tags/{keyword}/"
-            await self.page.goto(url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(4)
+            await goto_ready(self.page, url, 'hashtag', timeout=20000, rate_limiter=self.rate_limiter)
             for _ in range(2):
                 try:
-                    await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(2)
+                    await scroll_and_wait(self.page, 'hashtag')
                 except:
                     break
             content = await self.page.content()
             # Extract /username/ from links to posts (owner often in same block)
             owner_matches = re.findall(r'"username"\s*:\s*"([^"]+)"', content)
             for u in owner_matches:
-                if u not in usernames and u not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel']:
-                    usernames.append(u)
+                if u not in NON_ACCOUNT_PATHS:
+                    usernames.setdefault(u)
             # Also profile links
             for m in re.findall(r'href="/([a-zA-Z0-9._]+)/"', content):
-                if m not in usernames and m not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel']:
-                    usernames.append(m)
+                if m not in NON_ACCOUNT_PATHS:
+                    usernames.setdefault(m)
         except Exception as e:
             if not self.headless:
                 print(f"   ⚠️  Hashtag candidates: {str(e)}")
-        return usernames[:limit]
+        return [Candidate(username, 'hashtag') for username in usernames][:limit]
     
-    async def extract_accounts_from_search_results(self) -> List[str]:
-        """Extract account usernames from search results dropdown"""
-        usernames = []
+    async def extract_accounts_from_search_results(self) -> List[Candidate]:
+        """Extract account candidates from search results dropdown"""
+        usernames: Dict[str, None] = {}  # Ordered set
         
         try:
-            # Wait for search results
-            await asyncio.sleep(2)
-            
             # Look for account links in search dropdown
             account_selectors = [
                 'a[href^="/"][href*="/"]',  # Profile links
@@ -983,9 +1127,8 @@ class BusinessIndianScraper:
                                 if match:
                                     username = match.group(1)
                                     # Filter out non-account paths
-                                    if username not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel', '']:
-                                        if username not in usernames:
-                                            usernames.append(username)
+                                    if username not in NON_ACCOUNT_PATHS:
+                                        usernames.setdefault(username)
                         except:
                             continue
                     
@@ -1008,9 +1151,8 @@ class BusinessIndianScraper:
                     matches = re.findall(pattern, page_content)
                     for match in matches:
                         username = match if isinstance(match, str) else match[0] if isinstance(match, tuple) else str(match)
-                        if username and username not in usernames:
-                            if username not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel']:
-                                usernames.append(username)
+                        if username and username not in NON_ACCOUNT_PATHS:
+                            usernames.setdefault(username)
             except:
                 pass
                 
@@ -1018,11 +1160,12 @@ class BusinessIndianScraper:
             if not self.headless:
                 print(f"   ⚠️  Error extracting from search results: {str(e)}")
         
-        return usernames[:200]  # Get more candidates
+        return [Candidate(username, 'search_dropdown') for username in usernames]
     
-    async def extract_accounts_from_search_api(self) -> List[str]:
-        """Extract accounts from Instagram search API response"""
-        usernames = []
+    async def extract_accounts_from_search_api(self) -> List[Candidate]:
+        """Extract candidates (with follower count / verified / name when present) from the search API response"""
+        candidates: List[Candidate] = []
+        usernames: Dict[str, None] = {}  # Ordered set
         
         try:
             page_content = await self.page.content()
@@ -1039,50 +1182,61 @@ class BusinessIndianScraper:
                     users = data.get('users', [])
                     
                     for user_info in users:
-                        user = user_info.get('user', {})
-                        username = user.get('username')
-                        if username:
-                            usernames.append(username)
+                        candidate = Candidate.from_user(user_info.get('user', {}), 'topsearch')
+                        if candidate and candidate.username not in usernames:
+                            usernames.setdefault(candidate.username)
+                            candidates.append(candidate)
                 except json.JSONDecodeError:
                     # Try to extract usernames directly from text
                     username_matches = re.findall(r'"username":"([^"]+)"', page_content)
                     for username in username_matches:
-                        if username not in usernames:
-                            usernames.append(username)
+                        usernames.setdefault(username)
             
             # Fallback: Extract from any JSON-like structure
             if not usernames:
                 username_matches = re.findall(r'"username"\s*:\s*"([^"]+)"', page_content)
                 for username in username_matches:
-                    if username not in usernames and len(username) > 2:
-                        usernames.append(username)
+                    if len(username) > 2:
+                        usernames.setdefault(username)
                         
         except Exception as e:
             if not self.headless:
                 print(f"   ⚠️  Error extracting from API: {str(e)}")
         
-        return usernames[:200]  # Get more from API
+        # Usernames only found by the regex fallbacks carry no metadata
+        known = {candidate.username for candidate in candidates}
+        candidates.extend(Candidate(username, 'topsearch') for username in usernames if username not in known)
+        return candidates
     
     async def search_via_hashtags(self, keyword: str, max_results: int, seen_usernames: set) -> List[Dict]:
-        """Fallback method: Search via hashtags and extract from posts"""
+        """Fallback method: Search via hashtags and extract from posts.
+        Post owners come from the paginated hashtag feed (verified page by page);
+        only if the feed is unavailable are post pages opened one by one."""
         accounts = []
         
         try:
             print("📱 Searching via hashtags (fallback method)...")
+            from_feed = 0
+            async for feed_page in self.hashtag_feed(keyword):
+                from_feed += len(feed_page.owners)
+                self._add_candidates([Candidate.from_user(user, 'hashtag') for user in feed_page.owners], seen_usernames)
+                print(f"   Feed page {feed_page.number}: {len(feed_page.owners)} post owners")
+                await self.verify_candidates(self.frontier, accounts, max_results, seen_usernames)
+                if max_results > 0 and len(accounts) >= max_results:
+                    return accounts
+            if from_feed:
+                return accounts
+            
             search_url = f"https://www.instagram.com/explore/tags/{keyword}/"
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await goto_ready(self.page, search_url, 'hashtag', timeout=30000, rate_limiter=self.rate_limiter)
             
             # Scroll to load posts
             for _ in range(3):
                 try:
-                    await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await asyncio.sleep(2)
+                    await scroll_and_wait(self.page, 'hashtag')
                 except:
                     break
             
-            await asyncio.sleep(3)
-            
             # Extract post hrefs from page source
             post_hrefs = []
             try:
@@ -1105,30 +1259,26 @@ class BusinessIndianScraper:
             for i, href in enumerate(post_hrefs):
                 try:
                     post_url = f"https://www.instagram.com{href}"
-                    await self.page.goto(post_url, wait_until="domcontentloaded", timeout=20000)
-                    await asyncio.sleep(3)
+                    await goto_ready(self.page, post_url, 'post', timeout=20000, rate_limiter=self.rate_limiter)
                     
                     username = await self.extract_username_from_post()
                     
                     if username and username not in seen_usernames:
                         seen_usernames.add(username)
-                        account_data = await self.get_account_info(username)
+                        if self.is_known_rejection(username):
+                            PROFILES_VERIFIED.inc(result='skipped')
+                            continue
+                        with VERIFY_SECONDS.time():
+                            account_data = await self.get_account_info(username)
                         
-                        if account_data:
-                            if not account_data.get('is_business', False):
-                                continue
-                            if not account_data.get('is_indian', False):
-                                continue
-                            
-                            followers = account_data.get('followers')
-                            if followers and self.is_valid_follower_count(followers):
-                                accounts.append(account_data)
-                                print(f"✅ [{len(accounts)}/{max_results}] @{username}: {followers:,} followers")
-                                
-                                if len(accounts) >= max_results:
-                                    return accounts
-                    
-                    await asyncio.sleep(2)
+                        if not account_data:
+                            PROFILES_VERIFIED.inc(result='error')
+                        elif self._accept_account(account_data, accounts, max_results):
+                            PROFILES_VERIFIED.inc(result='accepted')
+                            if max_results > 0 and len(accounts) >= max_results:
+                                return accounts
+                        else:
+                            PROFILES_VERIFIED.inc(result='rejected')
                 except:
                     continue
                     
@@ -1147,19 +1297,22 @@ class BusinessIndianScraper:
                 'header a',
             ]
             
-            for selector in header_selectors:
+            # Wait for whichever header link renders first, then read every candidate href in one call
+            match = await race_selectors(self.page, header_selectors, timeout=3, state='attached')
+            if match:
                 try:
-                    links = await self.page.query_selector_all(selector)
-                    for link in links:
-                        href = await link.get_attribute('href')
-                        if href:
-                            match = re.match(r'^/([a-zA-Z0-9._]+)/?$', href)
-                            if match:
-                                username = match.group(1)
-                                if username not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel']:
-                                    return username
+                    hrefs = await self.page.eval_on_selector_all(
+                        match[0], "links => links.map(link => link.getAttribute('href'))"
+                    )
                 except:
-                    continue
+                    hrefs = []
+                for href in hrefs:
+                    if href:
+                        link_match = re.match(r'^/([a-zA-Z0-9._]+)/?$', href)
+                        if link_match:
+                            username = link_match.group(1)
+                            if username not in ['explore', 'accounts', 'direct', 'reels', 'stories', 'p', 'reel']:
+                                return username
             
             # Parse from page source
             page_content = await self.page.content()
@@ -1180,83 +1333,161 @@ class BusinessIndianScraper:
         
         return None
     
-    async def get_account_info(self, username: str) -> Optional[Dict]:
-        """Get account information with business and Indian checks"""
+    async def get_account_info(self, username: str, page: Optional[Page] = None) -> Optional[Dict]:
+        """Get account information with business and Indian checks (on `page`, default self.page).
+        Served from the profile cache while fresh; new results are written back.
+        A re-check after a rejection expired never uses data from before that rejection"""
+        rejected_at = self.rejection_cache.last_rejected_at(username) if self.rejection_cache else None
+        return await cached_fetch(self.profile_cache, username, lambda: self._fetch_account_info(username, page),
+                                  fetched_after=rejected_at or 0)
+    
+    async def _fetch_account_info(self, username: str, page: Optional[Page] = None) -> Optional[Dict]:
+        """Load and classify a profile (uncached), see get_account_info"""
+        page = page or self.page
         try:
             profile_url = f"https://www.instagram.com/{username}/"
-            await self.page.goto(profile_url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(3)
-            
-            page_content = await self.page.content()
-            
-            # Extract bio
-            bio = ""
-            try:
-                bio_elements = await self.page.query_selector_all('span:has-text("")')
-                # Try to get bio from page content
-                bio_match = re.search(r'"biography":"([^"]*)"', page_content)
-                if bio_match:
-                    bio = bio_match.group(1)
-            except:
-                pass
-            
-            # Check if business account
-            is_business = self.is_business_account(page_content, bio)
-            
-            # Check if Indian
-            is_indian = self.is_indian_brand(page_content, bio)
-            
-            # Extract follower count
-            followers = None
-            patterns = [
-                r'"edge_followed_by":\{"count":(\d+)\}',
-                r'"follower_count":(\d+)',
-                r'"followers":\{"count":(\d+)\}',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, page_content)
-                if matches:
-                    try:
-                        followers = int(matches[0])
-                        break
-                    except:
-                        continue
-            
-            if not followers:
-                text_patterns = [
-                    r'(\d+[.,]?\d*[KMB]?)\s*followers',
-                ]
-                for pattern in text_patterns:
-                    matches = re.findall(pattern, page_content, re.IGNORECASE)
-                    if matches:
-                        followers = self.parse_followers(matches[0])
-                        if followers:
-                            break
-            
-            # Extract category if business account
-            category = None
-            if is_business:
-                category_match = re.search(r'"category":\s*"([^"]+)"', page_content)
-                if category_match:
-                    category = category_match.group(1)
-                else:
-                    category = "Business"
             
-            return {
-                'username': username,
-                'link': profile_url,
-                'followers': followers,
-                'is_business': is_business,
-                'is_indian': is_indian,
-                'category': category,
-                'bio': bio[:200] if bio else ""  # First 200 chars
-            }
+            # Fast path: JSON endpoint in the same session, no page rendering
+            # (spread across the session pool if there is one, the main session otherwise)
+            if self.fetch_mode == "api":
+                try:
+                    pooled = await self.session_pool.fetch_profile(username) if self.session_pool else None
+                    if pooled is not None:
+                        user = pooled.user
+                    else:
+                        result = await request_profile(self.context, username, rate_limiter=self.rate_limiter)
+                        await self._session_lost(session_problem(result))
+                        user = result.user
+                except Exception:
+                    user = None
+                if user:
+                    with PARSE_SECONDS.time(format='json'):
+                        return self._account_from_user(username, profile_url, user)
+            
+            async with ProfileResponseCapture(page, username) as capture:
+                await goto_ready(page, profile_url, 'profile', timeout=20000, extra=capture.wait(timeout=5), rate_limiter=self.rate_limiter)
+                user = await capture.settle()
+            if page.context is self.context:
+                await self._session_lost(url_problem(page.url))
+            
+            if user:
+                with PARSE_SECONDS.time(format='json'):
+                    return self._account_from_user(username, profile_url, user)
+            
+            # Fallback: no profile JSON seen, serialize the rendered page
+            page_content = await page.content()
+            with PARSE_SECONDS.time(format='html'):
+                return self._account_from_page_content(username, profile_url, page_content)
             
         except Exception as e:
             if not self.headless:
                 print(f"   ⚠️  Error getting info for @{username}: {str(e)}")
             return None
+    
+    def is_business_profile(self, record: ProfileRecord) -> bool:
+        """Business check on decoded profile fields; bio heuristics only if the payload has no account flags"""
+        if record.is_business_account or record.is_professional_account:
+            return True
+        if record.account_type in (2, 3):  # 2 = business, 3 = creator
+            return True
+        if record.category_name or record.business_email or record.business_phone_number:
+            return True
+        if record.has_account_flags():
+            return False
+        return self.is_business_account("", record.biography)
+    
+    def is_indian_profile(self, record: ProfileRecord) -> bool:
+        """Indian check on decoded profile fields (phone country code, city, bio, name, website)"""
+        if record.phone_country_code == '91':
+            return True
+        if record.external_url and (urlparse(record.external_url).hostname or '').endswith('.in'):
+            return True
+        return bool(self.indian_matcher.search(record.location_text()))
+    
+    def _account_from_user(self, username: str, profile_url: str, user: Dict) -> Dict:
+        """Build the account dict from a profile user object (decoded once into a ProfileRecord)"""
+        record = ProfileRecord.from_user(user, username)
+        is_business = self.is_business_profile(record)
+        
+        category = None
+        if is_business:
+            category = record.category_name or "Business"
+        
+        return {
+            'username': username,
+            'link': profile_url,
+            'followers': record.followers,
+            'is_business': is_business,
+            'is_indian': self.is_indian_profile(record),
+            'category': category,
+            'bio': record.biography[:200]  # First 200 chars
+        }
+    
+    def _account_from_page_content(self, username: str, profile_url: str, page_content: str) -> Dict:
+        """Build the account dict from serialized page HTML: the embedded user object if it
+        can be found, otherwise by regex-scanning the whole page"""
+        user = find_user_in_html(page_content, username)
+        if user:
+            return self._account_from_user(username, profile_url, user)
+        
+        # Extract bio
+        bio = ""
+        bio_match = re.search(r'"biography":"([^"]*)"', page_content)
+        if bio_match:
+            bio = bio_match.group(1)
+        
+        # Check if business account
+        is_business = self.is_business_account(page_content, bio)
+        
+        # Check if Indian
+        is_indian = self.is_indian_brand(page_content, bio)
+        
+        # Extract follower count
+        followers = None
+        patterns = [
+            r'"edge_followed_by":\{"count":(\d+)\}',
+            r'"follower_count":(\d+)',
+            r'"followers":\{"count":(\d+)\}',
+        ]
+        
+        for pattern in patterns:
+            matches = re.findall(pattern, page_content)
+            if matches:
+                try:
+                    followers = int(matches[0])
+                    break
+                except:
+                    continue
+        
+        if not followers:
+            text_patterns = [
+                r'(\d+[.,]?\d*[KMB]?)\s*followers',
+            ]
+            for pattern in text_patterns:
+                matches = re.findall(pattern, page_content, re.IGNORECASE)
+                if matches:
+                    followers = self.parse_followers(matches[0])
+                    if followers:
+                        break
+        
+        # Extract category if business account
+        category = None
+        if is_business:
+            category_match = re.search(r'"category":\s*"([^"]+)"', page_content)
+            if category_match:
+                category = category_match.group(1)
+            else:
+                category = "Business"
+        
+        return {
+            'username': username,
+            'link': profile_url,
+            'followers': followers,
+            'is_business': is_business,
+            'is_indian': is_indian,
+            'category': category,
+            'bio': bio[:200] if bio else ""  # First 200 chars
+        }
 
 
 # Used by infinite mode: set to True on Ctrl+C
@@ -1272,6 +1503,19 @@ async def scrape_indian_business_accounts(
     headless: bool = False,
     infinite: bool = False,
     save_every: int = 10,
+    concurrency: int = 1,
+    fetch_mode: str = "api",
+    block_resources: bool = True,
+    cache_ttl_hours: float = DEFAULT_TTL_HOURS,
+    remember_rejections: bool = True,
+    resume: bool = False,
+    seen_file: Optional[str] = None,
+    seen_fp_rate: float = DEFAULT_FP_RATE,
+    hashtag_pages: int = DEFAULT_MAX_PAGES,
+    session_files: Optional[List[str]] = None,
+    cdp_url: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_file: Optional[str] = None,
 ) -> List[Dict]:
     """
     Scrape Indian business accounts
@@ -1284,7 +1528,20 @@ async def scrape_indian_business_accounts(
         cookies_file: Path to cookies JSON file (optional)
         headless: Run browser in headless mode
         infinite: If True, run until stopped (Ctrl+C); always within same domain/keyword
-        save_every: When infinite, save results to file every N new accounts
+        save_every: When infinite, sync the appended NDJSON file to disk every N new accounts
+        concurrency: Number of profiles verified in parallel (pages sharing the session)
+        fetch_mode: "api" to fetch profile JSON in-session (page load as fallback), or "page"
+        block_resources: Abort images, video, fonts and media-CDN requests (not during login)
+        cache_ttl_hours: Reuse cached profile results younger than this (0 disables the cache)
+        remember_rejections: Skip candidates rejected in earlier rounds/runs until the rejection expires
+        resume: When infinite, continue from the keyword's checkpoint (seen set, pending candidates)
+        seen_file: When infinite, path prefix of a seen-set shared across keywords/runs (default per keyword)
+        seen_fp_rate: Target false-positive rate of the seen-set's Bloom filter
+        hashtag_pages: Hashtag feed pages followed per search; each round continues from the last cursor
+        session_files: Extra cookie files / storage states to spread profile checks across (session pool)
+        cdp_url: Attach to a running browser (browser_daemon.py) instead of launching one
+        metrics_port: Serve Prometheus metrics on http://127.0.0.1:<port>/metrics during the run
+        metrics_file: Rewrite this Prometheus text file every few seconds during the run
     
     Returns:
         List of dicts with username, link, followers, is_business, is_indian, category
@@ -1292,75 +1549,186 @@ async def scrape_indian_business_accounts(
     global _stop_infinite
     _stop_infinite = False
     
-    scraper = BusinessIndianScraper(username, password, cookies_file, headless)
+    scraper = BusinessIndianScraper(
+        username, password, cookies_file, headless, concurrency, fetch_mode, block_resources,
+        cache_ttl_hours, remember_rejections, hashtag_pages=hashtag_pages, session_files=session_files,
+        cdp_url=cdp_url,
+    )
+    exporter = MetricsExporter(metrics_port, metrics_file)
     
     try:
+        await exporter.start()
         await scraper.start()
         await scraper.login()
         
         if infinite:
-            return await _run_infinite(scraper, keyword, save_every)
+            return await _run_infinite(scraper, keyword, save_every, resume, seen_file, seen_fp_rate)
         
         accounts = await scraper.search_accounts_by_keyword(keyword, max_results)
         return accounts
         
     finally:
         await scraper.close()
+        await exporter.stop()
 
 
-async def _run_infinite(scraper: BusinessIndianScraper, keyword: str, save_every: int) -> List[Dict]:
-    """Run scraper until stopped. Same domain/keyword only. Saves periodically."""
+async def _run_infinite(scraper: BusinessIndianScraper, keyword: str, save_every: int,
+                        resume: bool = False, seen_file: Optional[str] = None,
+                        seen_fp_rate: float = DEFAULT_FP_RATE) -> List[Dict]:
+    """Run scraper until stopped. Same domain/keyword only.
+    Accepted accounts are appended to an NDJSON file as soon as they pass; the JSON array
+    is exported once on stop. Accounts saved by earlier runs are not checked again.
+    Checked usernames live in an on-disk SeenSet (per keyword unless seen_file is given, which
+    is never reset and can be shared across keywords). Unchecked candidates are checkpointed;
+    resume=True continues from them."""
     global _stop_infinite
     all_accounts: List[Dict] = []
-    seen_usernames: set = set()
     save_path = f"indian_business_accounts_{keyword}_infinite.json"
+    sink = AccountSink(infinite_ndjson_path(keyword), sync_every=save_every)
+    seen_usernames = SeenSet(
+        seen_file or infinite_seen_path(keyword),
+        fp_rate=seen_fp_rate,
+        reset=not resume and not seen_file,
+    )
+    seen_usernames.update(sink.usernames)
+    if sink.loaded:
+        print(f"   📂 {sink.loaded} accounts already saved in {sink.path} (will be skipped)")
+    
+    checkpoint = Checkpoint(infinite_checkpoint_path(keyword))
+    round_number = 0
+    if resume:
+        state = checkpoint.load()
+        if state and state.get('keyword') == keyword:
+            round_number = scraper.restore_checkpoint(state, seen_usernames)
+            print(f"   ↩️  Resumed checkpoint: round {round_number}, {len(seen_usernames)} usernames seen, "
+                  f"{len(scraper.frontier)} candidates pending")
+        else:
+            print(f"   ⚠️  No usable checkpoint at {checkpoint.path} - starting fresh")
+    
+    def on_account(account: Dict):
+        if sink.add(account):
+            all_accounts.append(account)
+    scraper.on_account = on_account
     
     def stop_check() -> bool:
         return _stop_infinite
     
-    while not _stop_infinite:
-        batch = await scraper.search_accounts_by_keyword(
-            keyword,
-            max_results=0,
-            seen_usernames=seen_usernames,
-            stop_requested=stop_check,
-        )
-        
-        if batch:
-            for acc in batch:
-                if acc["username"] not in {a["username"] for a in all_accounts}:
-                    all_accounts.append(acc)
-            print(f"\n   📊 Total so far: {len(all_accounts)} accounts (domain: {keyword})")
-            
-            if len(all_accounts) % save_every == 0 or batch:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    json.dump(all_accounts, f, indent=2, ensure_ascii=False)
-                print(f"   💾 Saved to {save_path}")
-        
-        if _stop_infinite:
-            break
-        
-        # Brief pause before next round of search (same keyword)
-        print("\n   🔄 Next round of search (same domain)... Press Ctrl+C to stop.\n")
-        await asyncio.sleep(5)
+    def snapshot() -> Dict:
+        # Seen usernames must be on disk before the checkpoint that relies on them
+        seen_usernames.flush()
+        return scraper.checkpoint_state(keyword, seen_usernames, round_number)
     
-    # Final save
-    if all_accounts:
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(all_accounts, f, indent=2, ensure_ascii=False)
-        print(f"\n💾 Final save: {save_path} ({len(all_accounts)} accounts)")
+    autosave = asyncio.ensure_future(checkpoint.autosave(snapshot))
+    try:
+        while not _stop_infinite:
+            round_number += 1
+            batch = await scraper.search_accounts_by_keyword(
+                keyword,
+                max_results=0,
+                seen_usernames=seen_usernames,
+                stop_requested=stop_check,
+            )
+            
+            if batch:
+                print(f"\n   📊 Total so far: {len(all_accounts)} accounts (domain: {keyword})")
+                print(f"   {scraper.rate_limiter.report()}")
+            await checkpoint.save(snapshot())
+            
+            if _stop_infinite:
+                break
+            
+            # Brief pause before next round of search (same keyword)
+            print("\n   🔄 Next round of search (same domain)... Press Ctrl+C to stop.\n")
+            await asyncio.sleep(5)
+    finally:
+        # Runs on Ctrl+C too: checkpoint, drain the writer thread, then export the legacy JSON array
+        autosave.cancel()
+        try:
+            await checkpoint.save(snapshot())
+            print(f"\n💾 Checkpoint: {checkpoint.path} (resume with --resume)")
+        except Exception as e:
+            print(f"\n⚠️  Could not save checkpoint: {str(e)}")
+        scraper.on_account = None
+        print(seen_usernames.summary())
+        seen_usernames.close()
+        sink.close()
+        if len(sink):
+            count = sink.export_json(save_path)
+            print(f"💾 Final save: {save_path} ({count} accounts)")
     
     return all_accounts
 
 
+def infinite_ndjson_path(keyword: str) -> str:
+    """Append-only account file used by infinite mode for a keyword"""
+    return f"indian_business_accounts_{keyword}_infinite.ndjson"
+
+
+def infinite_seen_path(keyword: str) -> str:
+    """Seen-set files (.bloom / .db) used by infinite mode for a keyword"""
+    return f"indian_business_accounts_{keyword}_infinite.seen"
+
+
+def infinite_checkpoint_path(keyword: str) -> str:
+    """Checkpoint file used by infinite mode for a keyword"""
+    return f"indian_business_accounts_{keyword}_infinite.checkpoint.json"
+
+
+def _pop_cli_flag(argv: List[str], name: str) -> bool:
+    """Remove a bare `--name` switch from argv and return whether it was present"""
+    if name in argv:
+        argv.remove(name)
+        return True
+    return False
+
+
+def _pop_cli_option(argv: List[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    """Remove `--name value` or `--name=value` from argv and return the value"""
+    for i, arg in enumerate(argv):
+        if arg == name and i + 1 < len(argv):
+            value = argv[i + 1]
+            del argv[i:i + 2]
+            return value
+        if arg.startswith(name + "="):
+            del argv[i]
+            return arg.split("=", 1)[1]
+    return default
+
+
 if __name__ == "__main__":
     import sys
     import signal
     
+    concurrency = int(_pop_cli_option(sys.argv, "--concurrency", "1"))
+    fetch_mode = _pop_cli_option(sys.argv, "--fetch", "api")
+    block_resources = _pop_cli_option(sys.argv, "--block-media", "true").lower() == "true"
+    cache_ttl_hours = float(_pop_cli_option(sys.argv, "--cache-ttl", str(DEFAULT_TTL_HOURS)))
+    remember_rejections = _pop_cli_option(sys.argv, "--remember-rejections", "true").lower() == "true"
+    resume = _pop_cli_flag(sys.argv, "--resume")
+    seen_file = _pop_cli_option(sys.argv, "--seen-file")
+    seen_fp_rate = float(_pop_cli_option(sys.argv, "--seen-fp-rate", str(DEFAULT_FP_RATE)))
+    hashtag_pages = int(_pop_cli_option(sys.argv, "--hashtag-pages", str(DEFAULT_MAX_PAGES)))
+    sessions = _pop_cli_option(sys.argv, "--sessions")
+    session_files = [f for f in sessions.split(",") if f] if sessions else None
+    metrics_port = _pop_cli_option(sys.argv, "--metrics-port", os.getenv('INSTAGRAM_METRICS_PORT'))
+    metrics_port = int(metrics_port) if metrics_port else None
+    metrics_file = _pop_cli_option(sys.argv, "--metrics-file", os.getenv('INSTAGRAM_METRICS_FILE'))
+    cdp_url = _pop_cli_option(sys.argv, "--cdp")
+    if _pop_cli_flag(sys.argv, "--attach"):
+        from browser_daemon import daemon_cdp_url
+        cdp_url = daemon_cdp_url()
+        if not cdp_url:
+            print("⚠️  Browser daemon is not running (start it with: python browser_daemon.py) - launching a browser")
+    
     if len(sys.argv) < 2:
-        print("Usage: python instagram_scraper_business_indian.py <keyword> [max_results|infinite] [headless] [cookies_file]")
+        print("Usage: python instagram_scraper_business_indian.py <keyword> [max_results|infinite] [headless] [cookies_file] [--concurrency N] [--fetch api|page] [--block-media true|false] [--cache-ttl HOURS] [--remember-rejections true|false] [--resume] [--seen-file PATH] [--seen-fp-rate RATE] [--hashtag-pages N] [--sessions FILE,FILE,...] [--attach | --cdp URL] [--metrics-port PORT] [--metrics-file PATH]")
         print("Example: python instagram_scraper_business_indian.py skinkare 50 false")
         print("Example: python instagram_scraper_business_indian.py skinkare infinite false   # Run until you press Ctrl+C")
+        print("Example: python instagram_scraper_business_indian.py skinkare infinite false --resume   # Continue a stopped run")
+        print("Example: python instagram_scraper_business_indian.py skinkare 50 false --concurrency 4   # Verify 4 profiles at a time")
+        print("Example: python instagram_scraper_business_indian.py skinkare 50 false --concurrency 6 --sessions a.json,b.json,c.json   # Spread checks over 3 accounts")
+        print("Example: python instagram_scraper_business_indian.py skinkare 50 false --attach   # Use the browser started by browser_daemon.py")
+        print("Example: python instagram_scraper_business_indian.py skinkare infinite false --metrics-port 9464   # Prometheus metrics at http://127.0.0.1:9464/metrics")
         print("\nFilters:")
         print("  ✅ Business/Professional accounts only")
         print("  ✅ Indian brands/location")
@@ -1384,7 +1752,7 @@ if __name__ == "__main__":
         def _on_sigint(*args):
             global _stop_infinite
             _stop_infinite = True
-            print("\n\n⏹️  Stop requested (Ctrl+C). Finishing current check and saving...")
+            print("\n\n⏹️  Stop requested (Ctrl+C). Finishing current check and flushing saved accounts...")
         signal.signal(signal.SIGINT, _on_sigint)
     
     print(f"\n🚀 Starting Indian Business Account Scraper")
@@ -1392,10 +1760,11 @@ if __name__ == "__main__":
     print(f"🎯 Filters: Business Account + Indian Brand + 10K-50K followers")
     if infinite_mode:
         print(f"📊 Mode: INFINITE (same domain only) — Press Ctrl+C to stop")
-        print(f"💾 Saving to: indian_business_accounts_{keyword}_infinite.json (updated periodically)")
+        print(f"💾 Saving to: {infinite_ndjson_path(keyword)} (appended as found, exported to .json on stop)")
     else:
         print(f"📊 Max results: {max_results}")
     print(f"👁️  Headless mode: {headless}")
+    print(f"⚡ Parallel profile checks: {concurrency} (fetch mode: {fetch_mode})")
     
     if headless:
         print("⚠️  Note: If Instagram requires OTP/2FA, you'll need to run with headless=False")
@@ -1410,6 +1779,19 @@ if __name__ == "__main__":
             headless=headless,
             infinite=infinite_mode,
             save_every=10,
+            concurrency=concurrency,
+            fetch_mode=fetch_mode,
+            block_resources=block_resources,
+            cache_ttl_hours=cache_ttl_hours,
+            remember_rejections=remember_rejections,
+            resume=resume,
+            seen_file=seen_file,
+            seen_fp_rate=seen_fp_rate,
+            hashtag_pages=hashtag_pages,
+            session_files=session_files,
+            cdp_url=cdp_url,
+            metrics_port=metrics_port,
+            metrics_file=metrics_file,
         ))
     except KeyboardInterrupt:
         results = []  # Already saved by _run_infinite if infinite mode
@@ -11,14 +11,27 @@ from playwright.async_api import async_playwright, Page, Browser
 from datetime import datetime
 import os
 from dotenv import load_dotenv
+from instagram_profile import ProfileResponseCapture, follower_count
+from resource_blocking import ResourceBlocker
+from rate_limiter import AdaptiveRateLimiter, print_run_report
+from candidates import Candidate
+from profile_cache import open_profile_cache, cached_fetch, close_caches, DEFAULT_TTL_HOURS
+from page_waits import goto_ready
+from metrics import MetricsExporter, CANDIDATES_DISCOVERED, PROFILES_VERIFIED, REJECTIONS, VERIFY_SECONDS
 
 # Load environment variables from .env file
 load_dotenv()
 
 
 class WorkingInstagramScraper:
-    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, headless: bool = False):
+    def __init__(self, username: Optional[str] = None, password: Optional[str] = None, headless: bool = False,
+                 block_resources: bool = True, cache_ttl_hours: float = DEFAULT_TTL_HOURS):
         self.headless = headless
+        # Abort images/video/fonts while scraping (paused during login)
+        self.block_resources = block_resources
+        self.resource_blocker = ResourceBlocker(enabled=block_resources)
+        self.rate_limiter = AdaptiveRateLimiter()
+        self.profile_cache = open_profile_cache('followers', cache_ttl_hours)
         # Load from .env file, fallback to environment variables or provided values
         self.username = username or os.getenv('INSTAGRAM_USERNAME') or os.getenv('INSTAGRAM_USER')
         self.password = password or os.getenv('INSTAGRAM_PASSWORD') or os.getenv('INSTAGRAM_PASS')
@@ -41,6 +54,9 @@ class WorkingInstagramScraper:
             timezone_id='America/New_York'
         )
         
+        if self.block_resources:
+            await self.resource_blocker.attach(context)
+        
         self.page = await context.new_page()
         
         await self.page.add_init_script("""
@@ -51,6 +67,12 @@ class WorkingInstagramScraper:
         
     async def login(self) -> bool:
         """Login to Instagram"""
+        # Login pages get fully rendered (blocking resumes afterwards)
+        with self.resource_blocker.paused():
+            return await self._login()
+    
+    async def _login(self) -> bool:
+        """Credential login flow, see login()"""
         if not self.username or not self.password:
             print("⚠️  No credentials provided. Continuing without login.")
             return False
@@ -167,6 +189,8 @@ class WorkingInstagramScraper:
     
     async def close(self):
         """Close browser"""
+        print_run_report(self.rate_limiter, self.resource_blocker)
+        close_caches(self.profile_cache)
         if self.browser:
             await self.browser.close()
     
@@ -193,44 +217,59 @@ class WorkingInstagramScraper:
             return False
         return 10000 <= followers <= 50000
     
-    async def search_accounts_by_keyword(self, keyword: str, max_results: int = 50) -> List[Dict]:
+    def _record_verification(self, account_data: Optional[Dict]) -> bool:
+        """Count a verified candidate in the run metrics; True if its follower count is in range"""
+        if not account_data:
+            PROFILES_VERIFIED.inc(result='error')
+            return False
+        followers = account_data.get('followers')
+        if self.is_valid_follower_count(followers):
+            PROFILES_VERIFIED.inc(result='accepted')
+            return True
+        REJECTIONS.inc(reason='unknown_followers' if followers is None else 'out_of_range')
+        PROFILES_VERIFIED.inc(result='rejected')
+        return False
+    
+    async def search_accounts_by_keyword(self, keyword: str, max_results: int = 50,
+                                         seen_usernames: Optional[set] = None) -> List[Dict]:
         """
         Search for accounts using multiple methods
+        seen_usernames: usernames to skip (a set or seen_set.SeenSet shared across calls)
         """
         if not self.page:
             raise Exception("Browser not started. Call start() first.")
         
         print(f"🔍 Searching for accounts matching: '{keyword}'")
         accounts = []
-        seen_usernames = set()
+        if seen_usernames is None:
+            seen_usernames = set()
         
         # Method 1: Use Instagram's search page
         try:
             print("📱 Method 1: Using Instagram search page...")
             search_url = f"https://www.instagram.com/explore/tags/{keyword}/"
-            await self.page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
-            await asyncio.sleep(5)
+            await goto_ready(self.page, search_url, 'hashtag', timeout=30000, rate_limiter=self.rate_limiter)
             
             # Try to find usernames from posts
-            usernames_found = await self.extract_usernames_from_page()
-            print(f"   Found {len(usernames_found)} potential accounts")
+            candidates_found = await self.extract_usernames_from_page()
+            print(f"   Found {len(candidates_found)} potential accounts")
             
-            for username in usernames_found:
+            for candidate in candidates_found:
+                username = candidate.username
                 if username in seen_usernames:
                     continue
                 seen_usernames.add(username)
+                CANDIDATES_DISCOVERED.inc(source=candidate.source)
                 
-                account_data = await self.get_account_info(username)
-                if account_data:
-                    followers = account_data.get('followers')
-                    if followers and self.is_valid_follower_count(followers):
-                        accounts.append(account_data)
-                        print(f"✅ @{username}: {followers:,} followers")
-                        
-                        if len(accounts) >= max_results:
-                            return accounts
-                
-                await asyncio.sleep(2)
+                with VERIFY_SECONDS.time():
+                    account_data = await self.get_account_info(username)
+                if self._record_verification(account_data):
+                    followers = account_data['followers']
+                    accounts.append(account_data)
+                    print(f"✅ @{username}: {followers:,} followers")
+                    
+                    if len(accounts) >= max_results:
+                        return accounts
                 
         except Exception as e:
             print(f"   ⚠️  Method 1 failed: {str(e)}")
@@ -241,24 +280,28 @@ class WorkingInstagramScraper:
                 print("📱 Method 2: Using Instagram web search API...")
                 search_results = await self.search_via_api(keyword)
                 
-                for result in search_results:
-                    username = result.get('username')
-                    if not username or username in seen_usernames:
+                for candidate in search_results:
+                    username = candidate.username
+                    if username in seen_usernames:
                         continue
                     
                     seen_usernames.add(username)
-                    account_data = await self.get_account_info(username)
-                    
-                    if account_data:
-                        followers = account_data.get('followers')
-                        if followers and self.is_valid_follower_count(followers):
-                            accounts.append(account_data)
-                            print(f"✅ @{username}: {followers:,} followers")
-                            
-                            if len(accounts) >= max_results:
-                                return accounts
+                    CANDIDATES_DISCOVERED.inc(source=candidate.source)
+                    # The search payload already has the follower count for most users
+                    if candidate.clearly_out_of_range():
+                        REJECTIONS.inc(reason='out_of_range')
+                        PROFILES_VERIFIED.inc(result='rejected')
+                        continue
+                    with VERIFY_SECONDS.time():
+                        account_data = await self.get_account_info(username)
                     
-                    await asyncio.sleep(2)
+                    if self._record_verification(account_data):
+                        followers = account_data['followers']
+                        accounts.append(account_data)
+                        print(f"✅ @{username}: {followers:,} followers")
+                        
+                        if len(accounts) >= max_results:
+                            return accounts
                     
             except Exception as e:
                 print(f"   ⚠️  Method 2 failed: {str(e)}")
@@ -273,7 +316,8 @@ class WorkingInstagramScraper:
                     username = account.get('username')
                     if username and username not in seen_usernames:
                         seen_usernames.add(username)
-                        if self.is_valid_follower_count(account.get('followers')):
+                        CANDIDATES_DISCOVERED.inc(source='post')
+                        if self._record_verification(account):
                             accounts.append(account)
                             print(f"✅ @{username}: {account.get('followers', 0):,} followers")
                             
@@ -285,14 +329,11 @@ class WorkingInstagramScraper:
         
         return accounts
     
-    async def extract_usernames_from_page(self) -> List[str]:
-        """Extract usernames from current page"""
+    async def extract_usernames_from_page(self) -> List[Candidate]:
+        """Extract candidate usernames from current page"""
         usernames = []
         
         try:
-            # Wait for content to load
-            await asyncio.sleep(3)
-            
             # Method 1: Find all links that look like profile links
             links = await self.page.query_selector_all('a[href^="/"]')
             for link in links:
@@ -324,17 +365,16 @@ class WorkingInstagramScraper:
         except Exception as e:
             print(f"   Error extracting usernames: {str(e)}")
         
-        return usernames[:50]  # Limit to 50
+        return [Candidate(username, 'hashtag') for username in usernames[:50]]  # Limit to 50
     
-    async def search_via_api(self, keyword: str) -> List[Dict]:
-        """Search using Instagram's internal API"""
-        results = []
+    async def search_via_api(self, keyword: str) -> List[Candidate]:
+        """Search using Instagram's internal API (candidates keep follower count, verified flag, name)"""
+        results: List[Candidate] = []
         
         try:
             # Try to intercept or call Instagram's search API
             search_url = f"https://www.instagram.com/web/search/topsearch/?query={keyword}"
-            await self.page.goto(search_url, wait_until="domcontentloaded")
-            await asyncio.sleep(2)
+            await goto_ready(self.page, search_url, 'topsearch', rate_limiter=self.rate_limiter)
             
             # Try to get JSON response
             content = await self.page.content()
@@ -349,12 +389,9 @@ class WorkingInstagramScraper:
                     data = json.loads(json_match.group(1))
                     users = data.get('users', [])
                     for user_info in users:
-                        user = user_info.get('user', {})
-                        if user:
-                            results.append({
-                                'username': user.get('username'),
-                                'follower_count': user.get('follower_count', 0)
-                            })
+                        candidate = Candidate.from_user(user_info.get('user', {}), 'topsearch')
+                        if candidate:
+                            results.append(candidate)
                 except json.JSONDecodeError:
                     pass
                     
@@ -370,8 +407,7 @@ class WorkingInstagramScraper:
         try:
             # Navigate to hashtag page
             hashtag_url = f"https://www.instagram.com/explore/tags/{keyword}/"
-            await self.page.goto(hashtag_url, wait_until="domcontentloaded")
-            await asyncio.sleep(5)
+            await goto_ready(self.page, hashtag_url, 'hashtag', rate_limiter=self.rate_limiter)
             
             # Find post links
             post_selectors = [
@@ -398,20 +434,18 @@ class WorkingInstagramScraper:
                     
                     # Navigate to post
                     post_url = f"https://www.instagram.com{href}"
-                    await self.page.goto(post_url, wait_until="domcontentloaded")
-                    await asyncio.sleep(3)
+                    await goto_ready(self.page, post_url, 'post', rate_limiter=self.rate_limiter)
                     
                     # Extract username from post
                     username = await self.extract_username_from_post()
                     if username and username not in [acc.get('username') for acc in accounts]:
-                        account_data = await self.get_account_info(username)
+                        with VERIFY_SECONDS.time():
+                            account_data = await self.get_account_info(username)
                         if account_data:
                             accounts.append(account_data)
                             if len(accounts) >= max_count:
                                 break
                     
-                    await asyncio.sleep(2)
-                    
                 except Exception as e:
                     continue
                     
@@ -463,15 +497,29 @@ class WorkingInstagramScraper:
         return None
     
     async def get_account_info(self, username: str) -> Optional[Dict]:
-        """Get account information from profile"""
+        """Get account information from profile.
+        Served from the profile cache while fresh; new results are written back"""
+        return await cached_fetch(self.profile_cache, username, lambda: self._fetch_account_info(username))
+    
+    async def _fetch_account_info(self, username: str) -> Optional[Dict]:
+        """Load a profile and parse its follower count (uncached)"""
         try:
             profile_url = f"https://www.instagram.com/{username}/"
-            await self.page.goto(profile_url, wait_until="domcontentloaded", timeout=20000)
-            await asyncio.sleep(3)
+            async with ProfileResponseCapture(self.page, username) as capture:
+                await goto_ready(self.page, profile_url, 'profile', timeout=20000, extra=capture.wait(timeout=5), rate_limiter=self.rate_limiter)
+                user = await capture.settle()
+            
+            # Method 0: Profile JSON fetched by the web app (no DOM serialization)
+            if user and follower_count(user) is not None:
+                return {
+                    'username': username,
+                    'link': profile_url,
+                    'followers': follower_count(user)
+                }
             
             followers = None
             
-            # Method 1: Parse from page source (most reliable)
+            # Method 1: Parse from page source (fallback)
             try:
                 page_content = await self.page.content()
                 
@@ -562,7 +610,9 @@ async def scrape_instagram_working(
     max_results: int = 50,
     username: Optional[str] = None,
     password: Optional[str] = None,
-    headless: bool = False
+    headless: bool = False,
+    metrics_port: Optional[int] = None,
+    metrics_file: Optional[str] = None,
 ) -> List[Dict]:
     """
     Working Instagram scraper with multiple fallback methods
@@ -573,13 +623,17 @@ async def scrape_instagram_working(
         username: Instagram username (optional)
         password: Instagram password (optional)
         headless: Run browser in headless mode (False recommended for debugging)
+        metrics_port: Serve Prometheus metrics on http://127.0.0.1:<port>/metrics during the run
+        metrics_file: Rewrite this Prometheus text file every few seconds during the run
     
     Returns:
         List of dicts with username, link, and followers
     """
     scraper = WorkingInstagramScraper(username, password, headless)
+    exporter = MetricsExporter(metrics_port, metrics_file)
     
     try:
+        await exporter.start()
         await scraper.start()
         await scraper.login()
         accounts = await scraper.search_accounts_by_keyword(keyword, max_results)
@@ -588,13 +642,18 @@ async def scrape_instagram_working(
         
     finally:
         await scraper.close()
+        await exporter.stop()
 
 
 if __name__ == "__main__":
     import sys
+    from instagram_scraper_business_indian import _pop_cli_option
+    
+    metrics_port = _pop_cli_option(sys.argv, "--metrics-port", os.getenv('INSTAGRAM_METRICS_PORT'))
+    metrics_file = _pop_cli_option(sys.argv, "--metrics-file", os.getenv('INSTAGRAM_METRICS_FILE'))
     
     if len(sys.argv) < 2:
-        print("Usage: python instagram_scraper_working.py <keyword> [max_results] [headless]")
+        print("Usage: python instagram_scraper_working.py <keyword> [max_results] [headless] [--metrics-port N] [--metrics-file PATH]")
         print("Example: python instagram_scraper_working.py skinkare 50")
         print("\nNote: Set INSTAGRAM_USERNAME and INSTAGRAM_PASSWORD env vars for login")
         sys.exit(1)
@@ -609,7 +668,10 @@ if __name__ == "__main__":
     print(f"📊 Max results: {max_results}")
     print(f"👁️  Headless mode: {headless}\n")
     
-    results = asyncio.run(scrape_instagram_working(keyword, max_results, headless=headless))
+    results = asyncio.run(scrape_instagram_working(
+        keyword, max_results, headless=headless,
+        metrics_port=int(metrics_port) if metrics_port else None, metrics_file=metrics_file,
+    ))
     
     if results:
         print(f"\n✨ Found {len(results)} accounts matching criteria:")
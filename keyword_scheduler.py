@@ -0,0 +1,233 @@
+"""
+Multi-keyword scheduler for the Indian business account scraper
+Runs many keyword jobs concurrently on one browser and one logged-in session.
+A global cap limits profile checks in flight, and active jobs take turns fairly.
+All jobs share one seen-set, so a username checked for one keyword is never checked again for another.
+"""
+
+import asyncio
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from account_sink import AccountSink
+from instagram_scraper_business_indian import (
+    BusinessIndianScraper,
+    infinite_ndjson_path,
+    DEFAULT_TTL_HOURS,
+)
+from metrics import MetricsExporter
+from seen_set import SeenSet, DEFAULT_FP_RATE
+
+
+@dataclass
+class KeywordJob:
+    """One keyword to scrape: up to max_results accounts, or rounds until stopped if infinite"""
+    keyword: str
+    max_results: int = 50
+    infinite: bool = False
+    accounts: List[Dict] = field(default_factory=list)
+    rounds: int = 0
+
+    @classmethod
+    def parse(cls, spec: str, default_max: int = 50) -> 'KeywordJob':
+        """'skincare', 'skincare:30' or 'skincare:infinite'"""
+        keyword, _, limit = spec.partition(':')
+        if limit.lower() in ('infinite', '0'):
+            return cls(keyword, 0, infinite=True)
+        return cls(keyword, int(limit) if limit else default_max)
+
+
+async def run_keyword_jobs(
+    scraper: BusinessIndianScraper,
+    jobs: List[KeywordJob],
+    max_active_jobs: int = 3,
+    seen_usernames: Optional[set] = None,
+    stop_requested: Optional[Callable[[], bool]] = None,
+    round_pause: float = 5.0,
+) -> List[KeywordJob]:
+    """
+    Run jobs on a started, logged-in scraper. At most max_active_jobs search at once and
+    the rest queue in FIFO order; an infinite job gives up its slot after every round so
+    waiting jobs get a turn. scraper.concurrency is the global cap on profile checks in
+    flight across all jobs.
+    """
+    if not jobs:
+        return jobs
+    if seen_usernames is None:
+        seen_usernames = set()
+    stopped = stop_requested or (lambda: False)
+    active_slots = asyncio.Semaphore(max(1, max_active_jobs))
+    scraper.fetch_slots = asyncio.Semaphore(scraper.concurrency)
+    # Enough verification pages per job to use the global cap when all active slots are busy
+    pages_per_job = max(1, math.ceil(scraper.concurrency / min(len(jobs), max_active_jobs)))
+
+    async def run(job: KeywordJob):
+        worker: Optional[BusinessIndianScraper] = None
+        sink: Optional[AccountSink] = None
+        try:
+            while not stopped():
+                async with active_slots:
+                    if stopped():
+                        break
+                    if worker is None:
+                        worker = await scraper.fork(pages_per_job)
+                        if job.infinite:
+                            sink = AccountSink(infinite_ndjson_path(job.keyword))
+                            worker.on_account = sink.add
+                            # Accounts saved by earlier runs are not checked again (as in _run_infinite)
+                            seen_usernames.update(sink.usernames)
+                            if sink.loaded:
+                                print(f"   📂 [{job.keyword}] {sink.loaded} accounts already saved in {sink.path} (will be skipped)")
+                    job.rounds += 1
+                    print(f"\n🧵 [{job.keyword}] round {job.rounds}")
+                    batch = await worker.search_accounts_by_keyword(
+                        job.keyword,
+                        max_results=0 if job.infinite else job.max_results,
+                        seen_usernames=seen_usernames,
+                        stop_requested=stopped,
+                    )
+                job.accounts.extend(batch)
+                if not job.infinite:
+                    break
+                print(f"   📊 [{job.keyword}] {len(job.accounts)} accounts so far")
+                await asyncio.sleep(round_pause)
+        except Exception as e:
+            print(f"❌ [{job.keyword}] job failed: {str(e)}")
+        finally:
+            if worker:
+                await worker.release()
+            if sink:
+                sink.close()
+                if len(sink):
+                    sink.export_json(f"indian_business_accounts_{job.keyword}_infinite.json")
+        print(f"🏁 [{job.keyword}] done: {len(job.accounts)} accounts in {job.rounds} round(s)")
+
+    await asyncio.gather(*(run(job) for job in jobs))
+    return jobs
+
+
+async def scrape_keywords(
+    jobs: List[KeywordJob],
+    username: Optional[str] = None,
+    password: Optional[str] = None,
+    cookies_file: Optional[str] = None,
+    headless: bool = False,
+    concurrency: int = 4,
+    max_active_jobs: int = 3,
+    fetch_mode: str = "api",
+    block_resources: bool = True,
+    cache_ttl_hours: float = DEFAULT_TTL_HOURS,
+    seen_file: Optional[str] = None,
+    seen_fp_rate: float = DEFAULT_FP_RATE,
+    stop_requested: Optional[Callable[[], bool]] = None,
+    session_files: Optional[List[str]] = None,
+    cdp_url: Optional[str] = None,
+    metrics_port: Optional[int] = None,
+    metrics_file: Optional[str] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    Scrape Indian business accounts for several keywords with one browser
+
+    Args:
+        jobs: KeywordJob per keyword (own max_results or infinite)
+        username / password / cookies_file / headless: as for scrape_indian_business_accounts
+        concurrency: Global cap on profile checks in flight across all jobs
+        max_active_jobs: Keywords searched at the same time (others wait their turn)
+        fetch_mode / block_resources / cache_ttl_hours: as for scrape_indian_business_accounts
+        seen_file: Path prefix of an on-disk seen-set (default: in-memory for this run)
+        seen_fp_rate: Target false-positive rate of the seen-set's Bloom filter
+        stop_requested: Callable returning True to stop all jobs (infinite jobs run until then)
+        session_files: Extra cookie files / storage states to spread profile checks across
+        cdp_url: Attach to a running browser (browser_daemon.py) instead of launching one
+        metrics_port / metrics_file: Prometheus metrics endpoint / text file, as for scrape_indian_business_accounts
+
+    Returns:
+        Dict of keyword -> accounts found in this run
+    """
+    scraper = BusinessIndianScraper(
+        username, password, cookies_file, headless, concurrency, fetch_mode, block_resources,
+        cache_ttl_hours, session_files=session_files, cdp_url=cdp_url,
+    )
+    seen_usernames = SeenSet(seen_file, fp_rate=seen_fp_rate) if seen_file else set()
+    exporter = MetricsExporter(metrics_port, metrics_file)
+    try:
+        await exporter.start()
+        await scraper.start()
+        await scraper.login()
+        await run_keyword_jobs(scraper, jobs, max_active_jobs, seen_usernames, stop_requested)
+        return {job.keyword: job.accounts for job in jobs}
+    finally:
+        if isinstance(seen_usernames, SeenSet):
+            print(seen_usernames.summary())
+            seen_usernames.close()
+        await scraper.close()
+        await exporter.stop()
+
+
+# Set to True on Ctrl+C
+_stop_requested = False
+
+
+if __name__ == "__main__":
+    import sys
+    import signal
+    from instagram_scraper_business_indian import _pop_cli_option, _pop_cli_flag
+    from browser_daemon import daemon_cdp_url
+
+    concurrency = int(_pop_cli_option(sys.argv, "--concurrency", "4"))
+    max_active_jobs = int(_pop_cli_option(sys.argv, "--max-jobs", "3"))
+    fetch_mode = _pop_cli_option(sys.argv, "--fetch", "api")
+    seen_file = _pop_cli_option(sys.argv, "--seen-file")
+    headless = _pop_cli_option(sys.argv, "--headless", "false").lower() == "true"
+    cookies_file = _pop_cli_option(sys.argv, "--cookies")
+    sessions = _pop_cli_option(sys.argv, "--sessions")
+    cdp_url = daemon_cdp_url() if _pop_cli_flag(sys.argv, "--attach") else _pop_cli_option(sys.argv, "--cdp")
+    metrics_port = _pop_cli_option(sys.argv, "--metrics-port", os.getenv('INSTAGRAM_METRICS_PORT'))
+    metrics_file = _pop_cli_option(sys.argv, "--metrics-file", os.getenv('INSTAGRAM_METRICS_FILE'))
+
+    if len(sys.argv) < 2:
+        print("Usage: python keyword_scheduler.py <keyword[:max_results|:infinite]> ... [--concurrency N] [--max-jobs N] [--fetch api|page] [--seen-file PATH] [--headless true|false] [--cookies FILE] [--sessions FILE,FILE,...] [--attach | --cdp URL] [--metrics-port PORT] [--metrics-file PATH]")
+        print("Example: python keyword_scheduler.py skincare:30 beauty:30 apparel:20 --concurrency 4")
+        print("Example: python keyword_scheduler.py skincare:infinite beauty:infinite --seen-file shared   # Run until Ctrl+C")
+        sys.exit(1)
+
+    jobs = [KeywordJob.parse(spec) for spec in sys.argv[1:]]
+
+    def _on_sigint(*args):
+        global _stop_requested
+        _stop_requested = True
+        print("\n\n⏹️  Stop requested (Ctrl+C). Finishing current checks and saving...")
+    signal.signal(signal.SIGINT, _on_sigint)
+
+    print(f"\n🚀 Starting multi-keyword scraper")
+    for job in jobs:
+        print(f"📝 {job.keyword}: {'INFINITE' if job.infinite else job.max_results}")
+    print(f"⚡ Profile checks in flight: {concurrency} | keywords at once: {max_active_jobs}\n")
+
+    asyncio.run(scrape_keywords(
+        jobs,
+        cookies_file=cookies_file,
+        headless=headless,
+        concurrency=concurrency,
+        max_active_jobs=max_active_jobs,
+        fetch_mode=fetch_mode,
+        seen_file=seen_file,
+        stop_requested=lambda: _stop_requested,
+        session_files=[f for f in sessions.split(",") if f] if sessions else None,
+        cdp_url=cdp_url,
+        metrics_port=int(metrics_port) if metrics_port else None,
+        metrics_file=metrics_file,
+    ))
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for job in jobs:
+        print(f"\n✨ {job.keyword}: {len(job.accounts)} accounts")
+        if job.accounts and not job.infinite:
+            filename = f"indian_business_accounts_{job.keyword}_{timestamp}.json"
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(job.accounts, f, indent=2, ensure_ascii=False)
+            print(f"💾 Results saved to: {filename}")
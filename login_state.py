@@ -0,0 +1,125 @@
+"""
+Login / verification page state
+One in-page evaluation reports everything the login flow needs to know (code input shown,
+email code page, challenge URL, login form, error message), and a second helper waits for
+that state to change - on navigation, or in-page through a MutationObserver - instead of
+polling from Python every couple of seconds.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Optional
+from playwright.async_api import Page
+
+
+# Runs in the page; returns the fields of LoginState
+LOGIN_STATE_SCRIPT = """
+() => {
+    const visible = el => !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+    const codeSelectors = [
+        'input[name="verificationCode"]', 'input[name="security_code"]', 'input[name="code"]',
+        'input[aria-label*="code" i]', 'input[aria-label*="verification" i]',
+        'input[type="text"][maxlength="6"]', 'input[type="text"][maxlength="8"]',
+        'input[type="tel"][maxlength="6"]', 'input[type="tel"][maxlength="8"]',
+        'input[placeholder*="code" i]', 'input[id*="code" i]',
+    ];
+    let otpInput = codeSelectors.some(sel => Array.from(document.querySelectorAll(sel)).some(visible));
+    // <label>Code</label><input>
+    if (!otpInput) {
+        otpInput = Array.from(document.querySelectorAll('label')).some(label =>
+            /code/i.test(label.textContent || '') && label.nextElementSibling &&
+            label.nextElementSibling.tagName === 'INPUT' && visible(label.nextElementSibling));
+    }
+    const text = ((document.body && document.body.innerText) || '').toLowerCase();
+    const anyInput = Array.from(document.querySelectorAll('input[type="text"], input[type="tel"]')).some(visible);
+    const codeText = ['verification code', 'security code', 'enter code', '6-digit code', 'confirmation code',
+                      'two-factor', 'two factor', 'get a new code'].some(k => text.includes(k));
+    const emailText = ['check your email', 'enter the code that we sent', 'sent to'].some(k => text.includes(k));
+    const error = ['incorrect', 'wrong code', 'invalid', 'try again'].find(k => text.includes(k)) || null;
+    return {
+        url: location.href,
+        otp_input: otpInput || (codeText && !emailText),
+        email_code: emailText && anyInput,
+        login_form: !!document.querySelector('input[name="password"]'),
+        error: error,
+    };
+}
+"""
+
+# Truthy once the page's state differs from the given one (evaluated on DOM mutations)
+STATE_CHANGED_SCRIPT = f"""
+previous => {{
+    const state = ({LOGIN_STATE_SCRIPT})();
+    return Object.keys(previous).some(key => state[key] !== previous[key]);
+}}
+"""
+
+CHALLENGE_URL_MARKERS = ['challenge', 'two_factor', 'verify', 'codeentry', 'auth_platform']
+
+
+@dataclass
+class LoginState:
+    """Where the login flow is, from one LOGIN_STATE_SCRIPT evaluation"""
+    url: str = ""
+    otp_input: bool = False     # a visible verification-code input (SMS / 2FA / app)
+    email_code: bool = False    # "check your email" code page with an input
+    login_form: bool = False    # the username/password form is still shown
+    error: Optional[str] = None  # error wording on the page ("incorrect", "try again"...)
+
+    @property
+    def challenge(self) -> bool:
+        url = self.url.lower()
+        return any(marker in url for marker in CHALLENGE_URL_MARKERS)
+
+    @property
+    def needs_code(self) -> bool:
+        return self.otp_input or self.email_code or self.challenge
+
+    @property
+    def logged_in(self) -> bool:
+        return not self.needs_code and not self.login_form and 'accounts/login' not in self.url.lower()
+
+
+async def read_login_state(page: Page) -> LoginState:
+    """Current login state in one round trip (retried once if a navigation destroyed the context)"""
+    for attempt in range(2):
+        try:
+            return LoginState(**await page.evaluate(LOGIN_STATE_SCRIPT))
+        except Exception:
+            if attempt:
+                raise
+            await page.wait_for_load_state('domcontentloaded')
+    return LoginState(url=page.url)
+
+
+async def wait_for_login_change(page: Page, previous: LoginState, timeout: float) -> LoginState:
+    """
+    Wait until the main frame navigates or the page's login state differs from `previous`
+    (checked in-page on DOM mutations), then return the new state. Returns the current
+    state unchanged after timeout seconds.
+    """
+    navigated = asyncio.ensure_future(page.wait_for_event(
+        'framenavigated', predicate=lambda frame: frame == page.main_frame, timeout=timeout * 1000,
+    ))
+    changed = asyncio.ensure_future(page.wait_for_function(
+        STATE_CHANGED_SCRIPT,
+        arg={'url': previous.url, 'otp_input': previous.otp_input, 'email_code': previous.email_code,
+             'login_form': previous.login_form, 'error': previous.error},
+        polling='mutation',
+        timeout=timeout * 1000,
+    ))
+    waiters = {navigated, changed}
+    try:
+        # A navigation also ends the in-page wait (its context is destroyed) - either way, re-read
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in waiters:
+            task.cancel()
+            if task.done() and not task.cancelled():
+                task.exception()
+    if navigated.done() and not navigated.cancelled() and navigated.exception() is None:
+        try:
+            await page.wait_for_load_state('domcontentloaded', timeout=10000)
+        except Exception:
+            pass
+    return await read_login_state(page)
@@ -0,0 +1,259 @@
+"""
+Run metrics in the Prometheus text format
+A small in-process registry of counters and latency histograms that every scraper feeds
+(page loads, discovered candidates per source, verified profiles, rejections by reason,
+throttle events, navigation / parsing / verification time). MetricsExporter publishes it
+as a text file (node_exporter textfile collector, or just `cat`) and/or on a localhost
+HTTP endpoint for Prometheus to scrape while a long run is going.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Seconds; covers API calls (~0.2s) up to slow page loads with readiness waits
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+DEFAULT_WRITE_INTERVAL = 15  # seconds between metric file writes
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count, optionally split by labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labels)
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """Latency distribution (cumulative buckets, sum and count), optionally split by labels"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # label values -> [per-bucket counts, sum, count]
+        self.values: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labels)
+        with self._lock:
+            entry = self.values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with-block (also around awaits)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        entry = self.values.get(tuple(str(labels.get(name, '')) for name in self.labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*entry[0]], entry[1], entry[2])) for key, entry in self.values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(round(total, 6))}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics of one process; counter()/histogram() return the existing metric for a name"""
+
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.started_at = time.time()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        if name not in self.metrics:
+            self.metrics[name] = Counter(name, help_text, labels)
+        return self.metrics[name]
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        if name not in self.metrics:
+            self.metrics[name] = Histogram(name, help_text, labels, buckets)
+        return self.metrics[name]
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = [
+            "# HELP instagram_scraper_start_time_seconds Unix time the run started",
+            "# TYPE instagram_scraper_start_time_seconds gauge",
+            f"instagram_scraper_start_time_seconds {_format_value(round(self.started_at, 3))}",
+        ]
+        for name, metric in sorted(self.metrics.items()):
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str):
+        """Write render() atomically (readers never see a half-written file)"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+# The process-wide registry every module records into
+REGISTRY = MetricsRegistry()
+
+PAGE_LOADS = REGISTRY.counter(
+    'instagram_page_loads_total', 'Page navigations and API requests (profile_api, hashtag_api), by page kind', ['kind'])
+NAVIGATION_SECONDS = REGISTRY.histogram(
+    'instagram_navigation_seconds', 'Time to load a page until ready (or to get an API response), by page kind', ['kind'])
+CANDIDATES_DISCOVERED = REGISTRY.counter(
+    'instagram_candidates_discovered_total', 'New candidates added to the frontier, by discovery source', ['source'])
+PROFILES_VERIFIED = REGISTRY.counter(
+    'instagram_profiles_verified_total', 'Candidates decided, by result (accepted, rejected, skipped, error)', ['result'])
+REJECTIONS = REGISTRY.counter(
+    'instagram_rejections_total', 'Rejected candidates, by reason', ['reason'])
+THROTTLE_EVENTS = REGISTRY.counter(
+    'instagram_throttle_events_total', 'Throttling signals (429, "try again later"...), by endpoint class', ['endpoint'])
+PARSE_SECONDS = REGISTRY.histogram(
+    'instagram_parse_seconds', 'Time to turn a profile payload into an account, by source format (json, html)', ['format'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+VERIFY_SECONDS = REGISTRY.histogram(
+    'instagram_verify_seconds', 'Time to fetch and check one candidate profile')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of the run's console output
+
+
+class MetricsExporter:
+    """
+    Publishes a registry while a run is going: an HTTP endpoint on localhost (served from a
+    daemon thread) and/or a text file rewritten every `interval` seconds and once on stop().
+    Usage:
+        exporter = MetricsExporter(port=9464, path='metrics.prom')
+        await exporter.start()
+        try: ... finally: await exporter.stop()
+    """
+
+    def __init__(self, port: Optional[int] = None, path: Optional[str] = None,
+                 registry: MetricsRegistry = REGISTRY, host: str = '127.0.0.1',
+                 interval: float = DEFAULT_WRITE_INTERVAL):
+        self.port = port
+        self.path = path
+        self.registry = registry
+        self.host = host
+        self.interval = interval
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._writer: Optional[asyncio.Future] = None
+
+    @property
+    def url(self) -> Optional[str]:
+        return f"http://{self.host}:{self._server.server_address[1]}/metrics" if self._server else None
+
+    async def start(self):
+        if self.port is not None:
+            handler = type('MetricsHandler', (_MetricsHandler,), {'registry': self.registry})
+            self._server = ThreadingHTTPServer((self.host, self.port), handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+            print(f"📈 Metrics at {self.url}")
+        if self.path:
+            self._writer = asyncio.ensure_future(self._write_loop())
+            print(f"📈 Metrics written to {self.path} every {self.interval:g}s")
+
+    async def _write(self):
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self.registry.write_textfile, self.path)
+        except Exception as e:
+            print(f"   ⚠️  Metrics write failed: {str(e)}")
+
+    async def _write_loop(self):
+        while True:
+            await self._write()
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        """Final file write, then shut the endpoint down"""
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+            await self._write()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,174 @@
+"""
+Page readiness helpers
+Wait for the concrete signal a page type needs (a selector or a network response)
+and return as soon as it arrives, instead of fixed sleeps or networkidle
+"""
+
+import asyncio
+from typing import Awaitable, List, Optional, Tuple
+from playwright.async_api import ElementHandle, Page
+
+from metrics import NAVIGATION_SECONDS, PAGE_LOADS
+
+
+# Selectors that mean "this page type has rendered enough to scrape"
+READY_SELECTORS = {
+    # Logged-in nav or the login form - either one settles the login check
+    'home': 'svg[aria-label="Home"], a[href="/explore/"], input[name="username"]',
+    'profile': 'header section, main header h2, main header h1',
+    # JSON documents are rendered inside <pre>; a login wall shows the form instead
+    'topsearch': 'pre, input[name="username"]',
+    'hashtag': 'a[href^="/p/"], a[href^="/reel/"]',
+    'post': 'article header a[href^="/"], header a[href^="/"]',
+    'search_input': 'input[placeholder*="Search"], input[aria-label*="Search"]',
+}
+
+# Rate-limiter endpoint class for each page kind (kinds not listed are not paced)
+ENDPOINT_FOR_KIND = {
+    'topsearch': 'search',
+    'hashtag': 'hashtag',
+    'profile': 'profile',
+    'post': 'post',
+}
+
+# Responses that carry the data for a page type (or more of it after a scroll)
+READY_RESPONSES = {
+    'hashtag': ['/api/v1/tags/', '/graphql/query', '/api/graphql'],
+    'search': ['/web/search/topsearch/', '/api/graphql', '/graphql/query'],
+}
+
+
+def _first_ok(tasks) -> bool:
+    for task in tasks:
+        if not task.cancelled() and task.exception() is None and task.result() is not None:
+            return True
+    return False
+
+
+async def wait_until_ready(page: Page, kind: Optional[str], timeout: float = 5.0,
+                           extra: Optional[Awaitable] = None) -> bool:
+    """
+    Wait for the first readiness signal for a page kind (see READY_SELECTORS; None for no selector).
+    `extra` is any other awaitable that counts as ready (e.g. a response waiter).
+    Returns False on timeout instead of raising.
+    """
+    waiters = []
+    if kind in READY_SELECTORS:
+        waiters.append(asyncio.ensure_future(
+            page.wait_for_selector(READY_SELECTORS[kind], state='attached', timeout=timeout * 1000)
+        ))
+    if extra is not None:
+        waiters.append(asyncio.ensure_future(extra))
+    if not waiters:
+        return False
+
+    pending = set(waiters)
+    deadline = asyncio.get_event_loop().time() + timeout
+    try:
+        while pending:
+            remaining = deadline - asyncio.get_event_loop().time()
+            if remaining <= 0:
+                return False
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                return False
+            if _first_ok(done):
+                return True
+        return False
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def race_selectors(page: Page, selectors: List[str], timeout: float = 5.0, state: str = 'visible',
+                         grace: float = 0.2) -> Optional[Tuple[str, ElementHandle]]:
+    """
+    Wait for all candidate selectors at once and return (selector, element) for the first match,
+    or None once timeout passes with no match (one timeout in total, not one per selector).
+    Selectors are in preference order: once one matches, earlier ones get `grace` seconds to
+    match too (they were all probed at the same moment).
+    """
+    waiters = {
+        asyncio.ensure_future(page.wait_for_selector(selector, state=state, timeout=timeout * 1000)): i
+        for i, selector in enumerate(selectors)
+    }
+    found = {}
+    pending = set(waiters)
+    deadline = asyncio.get_event_loop().time() + timeout
+    try:
+        while pending:
+            remaining = deadline - asyncio.get_event_loop().time()
+            if found:
+                remaining = min(remaining, grace)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                if not task.cancelled() and task.exception() is None and task.result():
+                    found[waiters[task]] = task.result()
+            # Nothing better can still arrive once every more preferred selector has failed
+            if found and not any(waiters[task] < min(found) for task in pending):
+                break
+        if not found:
+            return None
+        best = min(found)
+        return selectors[best], found[best]
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def expect_response(page: Page, markers: List[str], timeout: float = 5.0) -> asyncio.Future:
+    """Start waiting for a response whose URL contains any marker (call before the action)"""
+    return asyncio.ensure_future(page.wait_for_event(
+        'response',
+        predicate=lambda response: any(marker in response.url for marker in markers),
+        timeout=timeout * 1000,
+    ))
+
+
+async def goto_ready(page: Page, url: str, kind: str, timeout: int = 20000,
+                     ready_timeout: float = 5.0, extra: Optional[Awaitable] = None,
+                     rate_limiter=None) -> bool:
+    """
+    Navigate (domcontentloaded) and wait for the page kind's readiness signal.
+    `extra` races that signal: a profile passed ProfileResponseCapture.wait() is ready on
+    the profile JSON, or on the rendered header if the data was inlined.
+    With a rate_limiter (rate_limiter.AdaptiveRateLimiter), the navigation waits for
+    its endpoint's slot first and the response status/URL is fed back to it.
+    """
+    endpoint = ENDPOINT_FOR_KIND.get(kind) if rate_limiter else None
+    if endpoint:
+        await rate_limiter.acquire(endpoint)
+    response_waiter = None
+    if kind in READY_RESPONSES and extra is None:
+        response_waiter = expect_response(page, READY_RESPONSES[kind], ready_timeout + timeout / 1000)
+    # Timed from after the rate limiter's wait: navigation plus readiness, not pacing
+    with NAVIGATION_SECONDS.time(kind=kind):
+        try:
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        except Exception:
+            if response_waiter:
+                response_waiter.cancel()
+            raise
+        PAGE_LOADS.inc(kind=kind)
+        if endpoint:
+            rate_limiter.record(endpoint, response.status if response else None, page.url)
+        return await wait_until_ready(page, kind, ready_timeout, extra if extra is not None else response_waiter)
+
+
+async def scroll_and_wait(page: Page, kind: str = 'hashtag', timeout: float = 2.0) -> bool:
+    """Scroll to the bottom and wait until the next batch's response arrives (or timeout)"""
+    response_waiter = expect_response(page, READY_RESPONSES.get(kind, []), timeout)
+    try:
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    except Exception:
+        response_waiter.cancel()
+        raise
+    try:
+        await response_waiter
+        return True
+    except Exception:
+        return False
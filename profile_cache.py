@@ -0,0 +1,217 @@
+"""
+Persistent profile cache (SQLite)
+Stores parsed get_account_info results keyed by username with a fetch timestamp,
+plus why rejected candidates were rejected, so repeated runs and infinite mode
+don't reload profiles they already checked
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+
+DEFAULT_CACHE_FILE = 'instagram_profile_cache.db'
+DEFAULT_TTL_HOURS = 72
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+class ProfileCache:
+    """
+    username -> parsed profile dict, with TTL expiry and size-bounded eviction.
+    `namespace` keeps scrapers with different result shapes apart in one file.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, namespace: str = 'default',
+                 ttl_hours: float = DEFAULT_TTL_HOURS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes_since_evict = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " namespace TEXT NOT NULL, username TEXT NOT NULL, data TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL, PRIMARY KEY (namespace, username))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS profiles_fetched_at ON profiles (fetched_at)")
+        self.db.commit()
+
+    def get(self, username: str, fetched_after: float = 0) -> Optional[Dict]:
+        """Cached profile for username, or None if missing, older than the TTL or not fetched
+        after `fetched_after` (a timestamp, e.g. of the rejection that is being re-checked)"""
+        row = self.db.execute(
+            "SELECT data, fetched_at FROM profiles WHERE namespace = ? AND username = ?",
+            (self.namespace, username.lower()),
+        ).fetchone()
+        if row is None or time.time() - row[1] > self.ttl or row[1] <= fetched_after:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, username: str, data: Dict):
+        """Store a freshly fetched profile"""
+        self.db.execute(
+            "INSERT OR REPLACE INTO profiles (namespace, username, data, fetched_at) VALUES (?, ?, ?, ?)",
+            (self.namespace, username.lower(), json.dumps(data, ensure_ascii=False), time.time()),
+        )
+        self.db.commit()
+        self._writes_since_evict += 1
+        if self._writes_since_evict >= 500:
+            self.evict()
+
+    def evict(self):
+        """Drop expired rows, then the oldest rows beyond max_entries"""
+        self._writes_since_evict = 0
+        self.db.execute("DELETE FROM profiles WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self.db.execute(
+            "DELETE FROM profiles WHERE rowid IN ("
+            " SELECT rowid FROM profiles ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.db.commit()
+
+    def summary(self) -> str:
+        """One-line hit/miss report"""
+        return f"💾 Profile cache: {self.hits} hits, {self.misses} misses ({self.path})"
+
+    def close(self):
+        """Close the database"""
+        self.db.close()
+
+
+def open_profile_cache(namespace: str, ttl_hours: float) -> Optional[ProfileCache]:
+    """Profile cache for a scraper's get_account_info in the INSTAGRAM_PROFILE_CACHE file,
+    or None when ttl_hours is 0 (caching disabled)"""
+    if ttl_hours <= 0:
+        return None
+    return ProfileCache(os.getenv('INSTAGRAM_PROFILE_CACHE', DEFAULT_CACHE_FILE), namespace, ttl_hours)
+
+
+async def cached_fetch(cache: Optional[ProfileCache], username: str,
+                       fetch: Callable[[], Awaitable[Optional[Dict]]],
+                       fetched_after: float = 0) -> Optional[Dict]:
+    """
+    Read-through get_account_info: the cached profile while fresh, otherwise `fetch()`.
+    Only results with a follower count are written back, so a profile that couldn't be
+    read is fetched again next time instead of being served from the cache.
+    """
+    if cache:
+        cached = cache.get(username, fetched_after)
+        if cached:
+            return cached
+    account_data = await fetch()
+    if account_data and account_data.get('followers') is not None and cache:
+        cache.put(username, account_data)
+    return account_data
+
+
+# How long a rejection stands before the profile is worth re-checking, by reason
+REJECTION_TTL_HOURS = {
+    'not_business': 21 * 24,      # personal accounts rarely switch to business
+    'not_indian': 30 * 24,        # location/brand origin almost never changes
+    'out_of_range_far': 14 * 24,  # far outside the follower range
+    'out_of_range_near': 2 * 24,  # close to a bound, may drift into range soon
+    'unknown_followers': 24,      # count couldn't be read, likely transient
+}
+
+# Out-of-range counts within this fraction of a bound count as "near"
+NEAR_RANGE_MARGIN = 0.25
+
+
+class RejectionCache:
+    """
+    username -> why it was rejected (reason, follower count, timestamp).
+    Expiry depends on the reason, see REJECTION_TTL_HOURS. Expired rows are kept for
+    last_rejected_at() until no cached profile can predate them (`profile_ttl_hours`).
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_FILE, min_followers: int = 10000,
+                 max_followers: int = 50000, ttl_hours: Optional[Dict[str, float]] = None,
+                 profile_ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.path = path
+        self.min_followers = min_followers
+        self.max_followers = max_followers
+        self.ttl_hours = dict(REJECTION_TTL_HOURS, **(ttl_hours or {}))
+        self.profile_ttl = profile_ttl_hours * 3600
+        self.skipped = 0
+        self._writes_since_purge = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS rejections ("
+            " username TEXT PRIMARY KEY, reason TEXT NOT NULL, followers INTEGER,"
+            " rejected_at REAL NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.db.commit()
+        self.purge()
+
+    def classify_follower_rejection(self, followers: Optional[int]) -> str:
+        """Reason key for a follower-count rejection (near or far from the range)"""
+        if followers is None:
+            return 'unknown_followers'
+        low = self.min_followers * (1 - NEAR_RANGE_MARGIN)
+        high = self.max_followers * (1 + NEAR_RANGE_MARGIN)
+        return 'out_of_range_near' if low <= followers <= high else 'out_of_range_far'
+
+    def add(self, username: str, reason: str, followers: Optional[int] = None):
+        """Record a rejection; expiry is fixed from the reason's policy at write time"""
+        now = time.time()
+        expires_at = now + self.ttl_hours.get(reason, 24) * 3600
+        self.db.execute(
+            "INSERT OR REPLACE INTO rejections (username, reason, followers, rejected_at, expires_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (username.lower(), reason, followers, now, expires_at),
+        )
+        self.db.commit()
+        self._writes_since_purge += 1
+        if self._writes_since_purge >= 500:
+            self.purge()
+
+    def get(self, username: str) -> Optional[Dict]:
+        """Unexpired rejection for username ({'reason', 'followers', 'rejected_at'}), or None"""
+        row = self.db.execute(
+            "SELECT reason, followers, rejected_at FROM rejections WHERE username = ? AND expires_at > ?",
+            (username.lower(), time.time()),
+        ).fetchone()
+        if row is None:
+            return None
+        return {'reason': row[0], 'followers': row[1], 'rejected_at': row[2]}
+
+    def last_rejected_at(self, username: str) -> Optional[float]:
+        """When username was last rejected, expired or not (None if never)"""
+        row = self.db.execute(
+            "SELECT rejected_at FROM rejections WHERE username = ?", (username.lower(),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def purge(self):
+        """Delete expired rejections older than any cached profile (on open and every 500 writes)"""
+        self._writes_since_purge = 0
+        now = time.time()
+        self.db.execute(
+            "DELETE FROM rejections WHERE expires_at <= ? AND rejected_at < ?", (now, now - self.profile_ttl),
+        )
+        self.db.commit()
+
+    def summary(self) -> str:
+        """One-line report of candidates skipped thanks to earlier rejections"""
+        return f"⏭️  Rejection cache: skipped {self.skipped} previously rejected candidates"
+
+    def close(self):
+        """Close the database"""
+        self.db.close()
+
+
+def close_caches(*caches):
+    """Print each open cache's summary and close it (None entries are skipped)"""
+    for cache in caches:
+        if cache:
+            print(cache.summary())
+            cache.close()
@@ -0,0 +1,121 @@
+"""
+Adaptive rate limiter for Instagram requests
+One token bucket per endpoint class (search, hashtag, profile, post).
+Rates grow additively on success and are cut multiplicatively on throttling (AIMD).
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from metrics import THROTTLE_EVENTS
+
+
+# Starting requests/second per endpoint class
+DEFAULT_RATES = {
+    'search': 0.5,
+    'hashtag': 0.3,
+    'profile': 0.5,
+    'post': 0.5,
+}
+
+# Text Instagram returns when it wants us to slow down
+THROTTLE_MARKERS = [
+    'please wait a few minutes',
+    'try again later',
+    'rate limit',
+    'too many requests',
+    'feedback_required',
+    '/challenge/',
+]
+
+
+class TokenBucket:
+    """Token bucket with an adjustable refill rate (tokens per second)"""
+
+    def __init__(self, rate: float, capacity: float = 2.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = 1.0
+        self.updated = asyncio.get_event_loop().time()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = asyncio.get_event_loop().time()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def penalize(self):
+        """Drop any saved-up burst so the next request waits a full interval or more"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - 1
+
+
+class AdaptiveRateLimiter:
+    """AIMD pacing for every navigation/fetch, keyed by endpoint class: each class gets its
+    own token bucket and backs off multiplicatively on throttling signals"""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, min_rate: float = 0.02,
+                 max_rate: float = 2.0, increase: float = 0.02, decrease: float = 0.5):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.initial_rates = dict(DEFAULT_RATES, **(rates or {}))
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.throttle_events = 0
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        if endpoint not in self.buckets:
+            self.buckets[endpoint] = TokenBucket(self.initial_rates.get(endpoint, 0.5))
+        return self.buckets[endpoint]
+
+    async def acquire(self, endpoint: str):
+        """Wait for this endpoint class's next slot"""
+        await self._bucket(endpoint).acquire()
+
+    def is_throttled(self, status: Optional[int], text: str = "") -> bool:
+        """Detect a throttling signal from a status code and/or response text or URL"""
+        if status == 429:
+            return True
+        text = (text or "").lower()
+        return any(marker in text for marker in THROTTLE_MARKERS)
+
+    def record(self, endpoint: str, status: Optional[int], text: str = "") -> bool:
+        """Feed back one response; returns True if it was a throttle signal"""
+        bucket = self._bucket(endpoint)
+        if self.is_throttled(status, text):
+            bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+            bucket.penalize()
+            self.throttle_events += 1
+            THROTTLE_EVENTS.inc(endpoint=endpoint)
+            print(f"   🐢 Throttled on {endpoint} - slowing to {bucket.rate:.2f} req/s")
+            return True
+        if status is None or status < 400:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+        return False
+
+    def current_rates(self) -> Dict[str, float]:
+        """Current requests/second per endpoint class"""
+        return {endpoint: bucket.rate for endpoint, bucket in self.buckets.items()}
+
+    def report(self) -> str:
+        """One-line summary of the current rates"""
+        rates = ", ".join(f"{endpoint} {rate:.2f}/s" for endpoint, rate in sorted(self.current_rates().items()))
+        return f"⏱️  Request rates: {rates or 'n/a'} | throttle events: {self.throttle_events}"
+
+
+def print_run_report(rate_limiter: AdaptiveRateLimiter, resource_blocker=None):
+    """End-of-run pacing report, plus the blocked-media summary if anything was blocked"""
+    if rate_limiter.buckets:
+        print(rate_limiter.report())
+    if resource_blocker is not None and resource_blocker.blocked_requests:
+        print(resource_blocker.summary())
@@ -0,0 +1,80 @@
+"""
+Resource blocking for scraper browser contexts
+Aborts images, video, fonts and media-CDN requests we never read (we only parse HTML and JSON)
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+from playwright.async_api import BrowserContext, Route
+
+
+# Playwright resource types that are never needed for scraping
+BLOCKED_RESOURCE_TYPES = ['image', 'media', 'font']
+
+# Instagram/Facebook media hosts (thumbnails, reels, profile pictures).
+# static.cdninstagram.com serves the JS bundles and must NOT be blocked.
+BLOCKED_HOST_PATTERNS = [
+    r'^scontent[^.]*\.cdninstagram\.com$',
+    r'^scontent[^.]*\.xx\.fbcdn\.net$',
+    r'^instagram\.f[a-z0-9-]+\.fna\.fbcdn\.net$',
+    r'^video[^.]*\.(cdninstagram\.com|xx\.fbcdn\.net)$',
+]
+
+# Aborted requests have no body to measure, so savings use typical sizes per type
+ESTIMATED_BYTES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 30_000,
+}
+DEFAULT_ESTIMATED_BYTES = 20_000
+
+
+class ResourceBlocker:
+    """Context route that aborts heavy resources and counts what it saved"""
+
+    def __init__(self, resource_types: Optional[Iterable[str]] = None,
+                 host_patterns: Optional[Iterable[str]] = None, enabled: bool = True):
+        self.resource_types = set(BLOCKED_RESOURCE_TYPES if resource_types is None else resource_types)
+        self.host_regex = re.compile('|'.join(
+            f'(?:{p})' for p in (BLOCKED_HOST_PATTERNS if host_patterns is None else host_patterns)
+        ) or r'(?!)')
+        self.enabled = enabled
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    async def attach(self, context: BrowserContext):
+        """Install the route on every page of the context"""
+        await context.route("**/*", self._handle)
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Check if a request for url/resource_type should be aborted"""
+        if resource_type in self.resource_types:
+            return True
+        return bool(self.host_regex.match(urlparse(url).hostname or ''))
+
+    async def _handle(self, route: Route):
+        request = route.request
+        if self.enabled and self.should_block(request.url, request.resource_type):
+            self.blocked_requests += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            self.bytes_saved += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @contextmanager
+    def paused(self):
+        """Let everything through inside the block (interactive login / OTP pages)"""
+        previous = self.enabled
+        self.enabled = False
+        try:
+            yield
+        finally:
+            self.enabled = previous
+
+    def summary(self) -> str:
+        """One-line report of blocked requests and estimated bytes saved"""
+        return f"🚫 Blocked {self.blocked_requests} media requests (~{self.bytes_saved / 1_000_000:.1f} MB saved)"
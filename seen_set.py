@@ -0,0 +1,154 @@
+"""
+Compact on-disk seen-set for usernames
+A memory-mapped Bloom filter answers "definitely not seen" without touching anything else;
+positives are confirmed against an exact SQLite store (optional). Memory use stays at the
+page cache's discretion instead of a Python set growing for the whole crawl, and the files
+survive restarts. Drop-in for the `seen_usernames` sets the scrapers use (`in`, add, update, len).
+Single writer per file; readers in other processes only see committed usernames.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+from typing import Iterable
+
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_FP_RATE = 0.001
+
+_MAGIC = b'IGSB'
+_HEADER = struct.Struct('<4sQIQ')  # magic, bits, hash count, items added
+
+
+class BloomFilter:
+    """Bloom filter over an mmap'd file (created sized for capacity / fp_rate, reopened as-is)"""
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) < _HEADER.size:
+            bits = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+            hashes = max(1, round(bits / capacity * math.log(2)))
+            with open(path, 'wb') as f:
+                f.write(_HEADER.pack(_MAGIC, bits, hashes, 0))
+                f.truncate(_HEADER.size + (bits + 7) // 8)
+        self._file = open(path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, self.bits, self.hashes, self.count = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a seen-set Bloom filter")
+        self.capacity = capacity
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1, h2 = struct.unpack('<QQ', digest)
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, key: str) -> bool:
+        mm = self._mm
+        return all(mm[_HEADER.size + (pos >> 3)] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """Set key's bits; returns True if any bit was new (key definitely not seen before)"""
+        mm = self._mm
+        changed = False
+        for pos in self._positions(key):
+            offset = _HEADER.size + (pos >> 3)
+            byte = mm[offset]
+            bit = 1 << (pos & 7)
+            if not byte & bit:
+                mm[offset] = byte | bit
+                changed = True
+        if changed:
+            self.count += 1
+            _HEADER.pack_into(mm, 0, _MAGIC, self.bits, self.hashes, self.count)
+        return changed
+
+    def estimated_fp_rate(self) -> float:
+        """False-positive rate at the current fill"""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+            self._file.close()
+
+
+class SeenSet:
+    """
+    Usernames already handled: `<path>.bloom` (Bloom filter) plus `<path>.db` (exact store).
+    With exact=False only the Bloom filter is kept, and about fp_rate of new usernames
+    are wrongly reported as seen (skipped); with exact=True that rate only costs an index lookup.
+    """
+
+    def __init__(self, path: str, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE,
+                 exact: bool = True, reset: bool = False, commit_every: int = 200):
+        self.path = path
+        self.exact = exact
+        self.commit_every = commit_every
+        self.confirm_lookups = 0
+        self._uncommitted = 0
+        if reset:
+            for suffix in ('.bloom', '.db', '.db-wal', '.db-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+        self.bloom = BloomFilter(path + '.bloom', capacity, fp_rate)
+        self.db = None
+        if exact:
+            self.db = sqlite3.connect(path + '.db')
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS seen (username TEXT PRIMARY KEY) WITHOUT ROWID")
+            self.db.commit()
+
+    def __contains__(self, username: str) -> bool:
+        if username not in self.bloom:
+            return False
+        if not self.db:
+            return True
+        self.confirm_lookups += 1
+        return self.db.execute("SELECT 1 FROM seen WHERE username = ?", (username,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        """Approximate count (usernames whose Bloom bits were not all set already)"""
+        return self.bloom.count
+
+    def add(self, username: str):
+        """Mark username as seen"""
+        self.bloom.add(username)
+        if self.db:
+            self.db.execute("INSERT OR IGNORE INTO seen (username) VALUES (?)", (username,))
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self.flush()
+
+    def update(self, usernames: Iterable[str]):
+        """Mark several usernames as seen"""
+        for username in usernames:
+            self.add(username)
+
+    def flush(self):
+        """Commit pending usernames and sync the Bloom filter"""
+        if self.db:
+            self.db.commit()
+            self._uncommitted = 0
+        self.bloom.flush()
+
+    def summary(self) -> str:
+        """One-line size / false-positive report"""
+        return (f"👁️  Seen-set: {len(self)} usernames, est. false-positive rate "
+                f"{self.bloom.estimated_fp_rate():.4%} ({self.path}.bloom)")
+
+    def close(self):
+        """Flush and close both files (safe to call twice)"""
+        if self.db:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+        self.bloom.close()
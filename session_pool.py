@@ -0,0 +1,228 @@
+"""
+Multi-account session pool
+Loads several cookie files / storage states, each into its own browser context with its own
+rate limiter, and spreads profile requests across them. Per-session success rate and latency
+are tracked; a session that hits a login wall, checkpoint or 429 is quarantined, then probed
+with one cheap request before it goes back into rotation.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+from playwright.async_api import BrowserContext
+
+from convert_cookies import convert_cookie_string_to_json
+from instagram_profile import ProfileFetch, request_profile
+from rate_limiter import AdaptiveRateLimiter, THROTTLE_MARKERS
+
+
+# First quarantine lasts this long; each failed probe doubles it up to the maximum
+DEFAULT_QUARANTINE_SECONDS = 600
+MAX_QUARANTINE_SECONDS = 4 * 3600
+# Public profile fetched to check a quarantined session
+DEFAULT_PROBE_USERNAME = 'instagram'
+
+LOGIN_WALL_MARKERS = ['/accounts/login', 'login_required', 'require_login']
+CHECKPOINT_MARKERS = ['/challenge/', 'checkpoint_required', 'checkpoint_url']
+
+
+def session_problem(result: ProfileFetch) -> Optional[str]:
+    """'rate_limited', 'checkpoint' or 'login_wall' if a response shows the session is unusable, else None"""
+    text = f"{result.url} {result.body}".lower()
+    if any(marker in text for marker in CHECKPOINT_MARKERS):
+        return 'checkpoint'
+    if result.status == 429 or any(marker in text for marker in THROTTLE_MARKERS):
+        return 'rate_limited'
+    if result.status in (401, 403) or any(marker in text for marker in LOGIN_WALL_MARKERS):
+        return 'login_wall'
+    return None
+
+
+def url_problem(url: str) -> Optional[str]:
+    """'checkpoint' or 'login_wall' if a page ended up on a challenge or login URL, else None"""
+    url = (url or '').lower()
+    if any(marker in url for marker in CHECKPOINT_MARKERS):
+        return 'checkpoint'
+    if any(marker in url for marker in LOGIN_WALL_MARKERS):
+        return 'login_wall'
+    return None
+
+
+def read_session_file(path: str) -> Dict:
+    """
+    Parse a session file into new_context() arguments: a Playwright storage state
+    ({"cookies": [...], "origins": [...]}) is passed as storage_state; a cookie list or
+    browser cookie string (as accepted for instagram_cookies.json) becomes {"cookies": [...]}.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return {'cookies': convert_cookie_string_to_json(content)}
+    if isinstance(data, dict) and 'cookies' in data:
+        return {'storage_state': data}
+    if isinstance(data, dict):
+        data = [data]
+    if not isinstance(data, list):
+        raise ValueError(f"{path} is neither a cookie list nor a storage state")
+    return {'cookies': data}
+
+
+@dataclass
+class Session:
+    """One logged-in account: its context, pacing and health"""
+    name: str
+    context: BrowserContext
+    rate_limiter: AdaptiveRateLimiter = field(default_factory=AdaptiveRateLimiter)
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    total_latency: float = 0.0
+    in_use: int = 0
+    quarantined_until: float = 0.0
+    quarantine_reason: Optional[str] = None
+    quarantines: int = 0
+    strikes: int = 0       # failed probes in a row (sets the quarantine length)
+    probing: bool = False
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.requests if self.requests else 1.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    @property
+    def quarantined(self) -> bool:
+        return self.quarantine_reason is not None
+
+    def summary(self) -> str:
+        state = f"quarantined ({self.quarantine_reason})" if self.quarantined else "active"
+        return (f"{self.name}: {state}, {self.requests} requests, {self.success_rate:.0%} ok, "
+                f"{self.avg_latency:.2f}s avg, {self.quarantines} quarantine(s)")
+
+
+class SessionPool:
+    """Routes profile requests to the healthiest session with the fewest requests in flight"""
+
+    def __init__(self, paths: List[str], quarantine_seconds: float = DEFAULT_QUARANTINE_SECONDS,
+                 max_quarantine_seconds: float = MAX_QUARANTINE_SECONDS,
+                 probe_username: str = DEFAULT_PROBE_USERNAME):
+        self.paths = paths
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.probe_username = probe_username
+        self.sessions: List[Session] = []
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    async def open(self, new_context: Callable[..., Awaitable[BrowserContext]]):
+        """
+        Create one context per session file. new_context(storage_state=None) must return a
+        configured context (viewport, user agent, resource blocking...). Unreadable files are skipped.
+        """
+        for path in self.paths:
+            try:
+                settings = read_session_file(path)
+                context = await new_context(storage_state=settings.get('storage_state'))
+                if settings.get('cookies'):
+                    await context.add_cookies(settings['cookies'])
+            except Exception as e:
+                print(f"⚠️  Skipping session {path}: {str(e)}")
+                continue
+            self.sessions.append(Session(os.path.basename(path), context))
+        print(f"👥 Session pool: {len(self.sessions)} of {len(self.paths)} session(s) loaded")
+
+    def active_sessions(self) -> List[Session]:
+        return [s for s in self.sessions if not s.quarantined]
+
+    async def acquire(self) -> Optional[Session]:
+        """Best session to use now (None if every session is quarantined).
+        Quarantined sessions whose time is up are probed first."""
+        now = time.time()
+        for session in self.sessions:
+            if session.quarantined and not session.probing and now >= session.quarantined_until:
+                await self.probe(session)
+        active = self.active_sessions()
+        if not active:
+            return None
+        session = min(active, key=lambda s: (s.in_use, -s.success_rate, s.avg_latency))
+        session.in_use += 1
+        return session
+
+    def release(self, session: Session, latency: float, problem: Optional[str] = None, ok: bool = True):
+        """Record one request's outcome; quarantine the session on a login wall, checkpoint or 429"""
+        session.in_use = max(0, session.in_use - 1)
+        session.requests += 1
+        session.total_latency += latency
+        if ok and not problem:
+            session.successes += 1
+        else:
+            session.failures += 1
+        if problem and not session.quarantined:
+            self.quarantine(session, problem)
+
+    def quarantine(self, session: Session, reason: str):
+        """Take a session out of rotation; it is probed again once the quarantine ends"""
+        period = min(self.max_quarantine_seconds, self.quarantine_seconds * 2 ** session.strikes)
+        session.quarantine_reason = reason
+        session.quarantined_until = time.time() + period
+        session.quarantines += 1
+        print(f"   🚧 Session {session.name}: {reason.replace('_', ' ')} - out of rotation for {period / 60:.0f} min")
+
+    async def probe(self, session: Session) -> bool:
+        """Fetch one known profile on a quarantined session; back into rotation if it works"""
+        session.probing = True
+        try:
+            result = await request_profile(session.context, self.probe_username, rate_limiter=session.rate_limiter)
+            healthy = result.user is not None and session_problem(result) is None
+        except Exception:
+            healthy = False
+        finally:
+            session.probing = False
+        if healthy:
+            print(f"   ✅ Session {session.name}: probe ok - back in rotation")
+            session.quarantine_reason = None
+            session.strikes = 0
+            return True
+        session.strikes += 1
+        reason = session.quarantine_reason
+        session.quarantine_reason = None
+        self.quarantine(session, reason or 'probe_failed')
+        return False
+
+    async def fetch_profile(self, username: str, timeout: int = 10000) -> Optional[ProfileFetch]:
+        """Profile request on the best available session; None if every session is quarantined"""
+        session = await self.acquire()
+        if session is None:
+            return None
+        started = time.monotonic()
+        try:
+            result = await request_profile(session.context, username, timeout, session.rate_limiter)
+        except Exception as e:
+            self.release(session, time.monotonic() - started, ok=False)
+            return ProfileFetch(0, '', str(e))
+        # A missing profile (404) is a normal answer, not a session failure
+        self.release(session, time.monotonic() - started, session_problem(result),
+                     ok=result.user is not None or result.status == 404)
+        return result
+
+    def report(self) -> str:
+        """Multi-line health summary, one line per session"""
+        lines = [f"👥 Sessions: {len(self.active_sessions())}/{len(self.sessions)} active"]
+        lines.extend(f"   {session.summary()}" for session in self.sessions)
+        return "\n".join(lines)
+
+    async def close(self):
+        """Close every session context"""
+        for session in self.sessions:
+            try:
+                await session.context.close()
+            except:
+                pass
+        self.sessions = []
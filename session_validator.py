@@ -0,0 +1,108 @@
+"""
+Fast session validation
+Decides whether a context's Instagram session is logged in with one authenticated API
+request (the current user endpoint) instead of loading and scanning the home feed.
+The signal is concrete: the response's user id must match the ds_user_id cookie.
+Successful validations are cached per session (by a hash of the session cookie) so
+runs within the cache window skip the request entirely.
+"""
+
+import hashlib
+import json
+import os
+import time
+from typing import Dict, Optional
+from playwright.async_api import BrowserContext
+
+from instagram_profile import api_headers
+
+
+CURRENT_USER_URL = "https://www.instagram.com/api/v1/accounts/current_user/?edit=true"
+DEFAULT_CACHE_FILE = 'instagram_session_cache.json'
+DEFAULT_MAX_AGE_MINUTES = 30
+
+
+class SessionValidator:
+    """
+    validate(context) -> True (logged in), False (definitely not: no session cookie,
+    login wall, 401/403) or None (inconclusive, e.g. the endpoint changed - callers
+    should fall back to a slower check).
+    """
+
+    def __init__(self, cache_file: Optional[str] = None, max_age_minutes: float = DEFAULT_MAX_AGE_MINUTES):
+        self.cache_file = cache_file or os.getenv('INSTAGRAM_SESSION_CACHE', DEFAULT_CACHE_FILE)
+        self.max_age = max_age_minutes * 60
+        self.username: Optional[str] = None
+        self.cached = False
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.cache_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, key: str, entry: Optional[Dict]):
+        cache = self._load()
+        if entry is None:
+            cache.pop(key, None)
+        else:
+            cache[key] = entry
+        # Per-process tmp file: sharded workers write the same cache concurrently
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, self.cache_file)
+
+    @staticmethod
+    async def _session_cookies(context: BrowserContext) -> Dict[str, str]:
+        cookies = await context.cookies("https://www.instagram.com")
+        return {c['name']: c['value'] for c in cookies if c['name'] in ('sessionid', 'ds_user_id')}
+
+    @staticmethod
+    def _key(sessionid: str) -> str:
+        # Never store the session cookie itself
+        return hashlib.sha256(sessionid.encode('utf-8')).hexdigest()[:32]
+
+    async def validate(self, context: BrowserContext, force: bool = False) -> Optional[bool]:
+        """Check the context's session (cached for max_age unless force=True)"""
+        self.cached = False
+        cookies = await self._session_cookies(context)
+        if not cookies.get('sessionid'):
+            return False
+        key = self._key(cookies['sessionid'])
+
+        entry = self._load().get(key)
+        if not force and entry and time.time() - entry['validated_at'] < self.max_age:
+            self.username = entry.get('username')
+            self.cached = True
+            return True
+
+        response = await context.request.get(
+            CURRENT_USER_URL,
+            headers=await api_headers(context, "https://www.instagram.com/"),
+            timeout=10000,
+            fail_on_status_code=False,
+            max_redirects=0,
+        )
+        location = response.headers.get('location') or ''
+        if response.status in (401, 403) or 'accounts/login' in location or 'accounts/login' in response.url:
+            self._store(key, None)
+            return False
+        if not response.ok or 'json' not in (response.headers.get('content-type') or ''):
+            return None
+        user = (await response.json()).get('user') or {}
+        user_id = str(user.get('pk') or user.get('pk_id') or user.get('id') or '')
+        if not user_id:
+            return None
+        if cookies.get('ds_user_id') and cookies['ds_user_id'] != user_id:
+            return False
+        self.username = user.get('username')
+        self._store(key, {'validated_at': time.time(), 'username': self.username, 'user_id': user_id})
+        return True
+
+    async def invalidate(self, context: BrowserContext):
+        """Forget the cached validation for the context's session (e.g. after a login wall)"""
+        cookies = await self._session_cookies(context)
+        if cookies.get('sessionid'):
+            self._store(self._key(cookies['sessionid']), None)
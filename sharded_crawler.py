@@ -0,0 +1,296 @@
+"""
+Sharded crawler: one discovery coordinator, N verification worker processes
+The coordinator searches a keyword and pushes candidates into a SQLite work queue; each
+worker process runs its own browser and logged-in session, claims candidates under a lease,
+verifies them and writes accepted accounts back. Leases from crashed workers expire and
+their candidates are claimed again; crashed worker processes are restarted.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import signal
+from typing import Dict, List, Optional
+
+from account_sink import AccountSink
+from frontier import CandidateFrontier
+from instagram_scraper_business_indian import BusinessIndianScraper, infinite_ndjson_path
+from work_queue import WorkQueue, DEFAULT_LEASE_SECONDS
+
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+POLL_SECONDS = 2.0
+FAILURE_BACKOFF_SECONDS = 60.0
+
+
+def lease_owner(worker_id: str, pid: int) -> str:
+    """Queue owner id of one worker process: a restarted worker must not renew its predecessor's leases"""
+    return f"{worker_id}-{pid}"
+
+
+def queue_path(keyword: str) -> str:
+    """Work queue file used for a keyword"""
+    return f"indian_business_accounts_{keyword}.queue.db"
+
+
+async def run_worker(path: str, worker_id: str, options: Dict, stop_event=None) -> int:
+    """
+    Claim and verify candidates until the queue is closed and drained (or stop_event is set).
+    options: BusinessIndianScraper kwargs (cookies_file, headless, concurrency, fetch_mode...).
+    Returns how many candidates this worker decided.
+    """
+    queue = WorkQueue(path, options.pop('lease_seconds', DEFAULT_LEASE_SECONDS))
+    scraper = BusinessIndianScraper(**options)
+    owner = lease_owner(worker_id, os.getpid())
+    decided = 0
+    stopped = False
+
+    def stop_requested() -> bool:
+        return stopped or bool(stop_event and stop_event.is_set()) or queue.flag('stop')
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(queue.lease_seconds / 3)
+            queue.renew(owner)
+
+    try:
+        await scraper.start()
+        await scraper.login()
+        renewing = asyncio.ensure_future(heartbeat())
+        try:
+            while not stop_requested():
+                claimed = queue.claim(owner, limit=scraper.concurrency * 2)
+                if not claimed:
+                    if queue.flag('closed'):
+                        break
+                    await asyncio.sleep(POLL_SECONDS)
+                    continue
+                # Verify the batch with the normal best-first workers; seen is local to the batch
+                batch = CandidateFrontier(scraper.frontier.priority)
+                batch.extend(candidate for _, candidate in claimed)
+                accepted: Dict[str, Dict] = {}
+                failed: set = set()
+                scraper.on_account = lambda account: accepted.__setitem__(account['username'], account)
+                scraper.on_fetch_failure = failed.add
+                decided_now: set = set()
+                await scraper.verify_candidates(batch, [], 0, decided_now, stop_requested)
+                for _, candidate in claimed:
+                    if candidate.username in decided_now:
+                        if queue.complete(candidate.username, owner, accepted.get(candidate.username)):
+                            decided += 1
+                    elif candidate.username in failed:
+                        # Not verified (login wall, throttling): back to the queue, the attempt counts
+                        queue.fail(candidate.username, owner)
+                    else:
+                        queue.release(candidate.username, owner)
+                if failed and len(failed) == len(claimed):
+                    # Nothing readable in the whole batch - this session is likely walled or throttled
+                    print(f"   ⚠️  Worker {worker_id}: no profile in the batch could be read - backing off")
+                    for _ in range(int(FAILURE_BACKOFF_SECONDS / POLL_SECONDS)):
+                        if stop_requested():
+                            break
+                        await asyncio.sleep(POLL_SECONDS)
+        finally:
+            renewing.cancel()
+    except Exception as e:
+        print(f"❌ Worker {worker_id} failed: {str(e)}")
+        raise
+    finally:
+        stopped = True
+        await scraper.close()
+        queue.close()
+    print(f"🏁 Worker {worker_id}: decided {decided} candidates")
+    return decided
+
+
+def _worker_process(path: str, worker_id: str, options: Dict, stop_event):
+    # Ctrl+C reaches every process in the group; the coordinator decides when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(run_worker(path, worker_id, options, stop_event))
+
+
+async def run_coordinator(
+    keyword: str,
+    max_results: int = 50,
+    workers: int = DEFAULT_WORKERS,
+    cookies_file: Optional[str] = None,
+    worker_cookies: Optional[List[str]] = None,
+    headless: bool = True,
+    concurrency: int = 2,
+    fetch_mode: str = "api",
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    round_pause: float = 5.0,
+    stop_event=None,
+) -> List[Dict]:
+    """
+    Discover candidates for keyword in this process and verify them in `workers` processes
+
+    Args:
+        keyword: Domain/keyword to search for
+        max_results: Stop once this many accounts were accepted (0 = until stop_event is set)
+        workers: Number of verification processes (each with its own browser)
+        cookies_file: Session for discovery (and for workers without their own)
+        worker_cookies: Cookie files / storage states assigned to workers round-robin
+        headless: Run the workers' browsers headless (discovery follows the same setting)
+        concurrency: Profiles each worker verifies in parallel
+        fetch_mode: "api" or "page", as for scrape_indian_business_accounts
+        lease_seconds: How long a claimed candidate stays leased without a heartbeat
+        round_pause: Seconds between discovery rounds once the queue has drained
+        stop_event: multiprocessing.Event that stops the coordinator and all workers
+
+    Returns:
+        Accepted accounts (also appended to the keyword's .ndjson file as they arrive)
+    """
+    stop_event = stop_event or multiprocessing.get_context('spawn').Event()
+    path = queue_path(keyword)
+    queue = WorkQueue(path, lease_seconds)
+    queue.set_flag('closed', False)
+    queue.set_flag('stop', False)
+    sink = AccountSink(infinite_ndjson_path(keyword))
+    accounts: List[Dict] = []
+    last_result = 0
+
+    scraper = BusinessIndianScraper(cookies_file=cookies_file, headless=headless)
+    spawn = multiprocessing.get_context('spawn')
+    processes: Dict[str, multiprocessing.Process] = {}
+
+    def launch(worker_id: str, index: int):
+        options = {
+            'cookies_file': worker_cookies[index % len(worker_cookies)] if worker_cookies else cookies_file,
+            'headless': headless,
+            'concurrency': concurrency,
+            'fetch_mode': fetch_mode,
+            'lease_seconds': lease_seconds,
+        }
+        process = spawn.Process(target=_worker_process, args=(path, worker_id, options, stop_event), daemon=True)
+        process.start()
+        processes[worker_id] = process
+
+    def finished() -> bool:
+        return stop_event.is_set() or (max_results > 0 and len(accounts) >= max_results)
+
+    def collect():
+        nonlocal last_result
+        for row_id, account in queue.results_after(last_result):
+            last_result = row_id
+            if sink.add(account) and not (max_results > 0 and len(accounts) >= max_results):
+                accounts.append(account)
+                label = f"{len(accounts)}" if max_results <= 0 else f"{len(accounts)}/{max_results}"
+                print(f"✅ [{label}] @{account['username']}: {account['followers']:,} followers (worker result)")
+
+    def supervise():
+        """Restart crashed workers and hand their expired leases back"""
+        for index, (worker_id, process) in enumerate(list(processes.items())):
+            if not process.is_alive() and process.exitcode not in (0, None) and not finished():
+                print(f"   ♻️  Worker {worker_id} exited with code {process.exitcode} - restarting")
+                # Its leases go back now; the new process gets its own owner id
+                queue.expire_owner(lease_owner(worker_id, process.pid))
+                launch(worker_id, index)
+        requeued = queue.requeue_expired()
+        if requeued:
+            print(f"   ↩️  {requeued} expired leases returned to the queue")
+
+    async def drain():
+        """Wait for workers to empty the queue, streaming their results"""
+        while not finished():
+            collect()
+            supervise()
+            counts = queue.counts()
+            if counts['pending'] == 0 and counts['leased'] == 0:
+                return
+            await asyncio.sleep(POLL_SECONDS)
+
+    try:
+        for index in range(workers):
+            launch(f"w{index + 1}", index)
+        print(f"🧵 Started {workers} worker processes ({concurrency} profiles each) on {path}")
+
+        await scraper.start()
+        await scraper.login()
+        round_number = 0
+        while not finished():
+            round_number += 1
+            print(f"\n🔍 Discovery round {round_number}")
+            try:
+                # The queue is the seen-set: usernames queued in any state are skipped
+                await scraper.discover_candidates(keyword, max_results, seen_usernames=queue)
+            except Exception as e:
+                print(f"❌ Error in discovery: {str(e)}")
+            candidates = []
+            while len(scraper.frontier):
+                candidates.append(scraper.frontier.pop())
+            pushed = queue.push(keyword, candidates, [scraper.frontier.priority(c) for c in candidates])
+            print(f"   📥 Queued {pushed} new candidates | {queue.summary()}")
+            await drain()
+            if finished() or (max_results > 0 and not pushed):
+                break
+            await asyncio.sleep(round_pause)
+    finally:
+        # Workers finish their current batch and exit once the queue is closed (or stopped)
+        queue.set_flag('closed')
+        if finished():
+            queue.set_flag('stop')
+        for process in processes.values():
+            process.join(timeout=lease_seconds)
+            if process.is_alive():
+                process.terminate()
+        collect()
+        print(queue.summary())
+        queue.close()
+        sink.close()
+        await scraper.close()
+
+    return accounts
+
+
+if __name__ == "__main__":
+    import sys
+    import json
+    from datetime import datetime
+    from instagram_scraper_business_indian import _pop_cli_option
+
+    workers = int(_pop_cli_option(sys.argv, "--workers", str(DEFAULT_WORKERS)))
+    concurrency = int(_pop_cli_option(sys.argv, "--concurrency", "2"))
+    fetch_mode = _pop_cli_option(sys.argv, "--fetch", "api")
+    headless = _pop_cli_option(sys.argv, "--headless", "true").lower() == "true"
+    cookies_file = _pop_cli_option(sys.argv, "--cookies")
+    sessions = _pop_cli_option(sys.argv, "--sessions")
+    lease_seconds = float(_pop_cli_option(sys.argv, "--lease", str(DEFAULT_LEASE_SECONDS)))
+
+    if len(sys.argv) < 2:
+        print("Usage: python sharded_crawler.py <keyword> [max_results|infinite] [--workers N] [--concurrency N] [--fetch api|page] [--headless true|false] [--cookies FILE] [--sessions FILE,FILE,...] [--lease SECONDS]")
+        print("Example: python sharded_crawler.py skinkare 200 --workers 4 --sessions a.json,b.json,c.json,d.json")
+        print("Example: python sharded_crawler.py skinkare infinite --workers 4   # Run until Ctrl+C")
+        sys.exit(1)
+
+    keyword = sys.argv[1]
+    max_arg = sys.argv[2] if len(sys.argv) > 2 else "50"
+    max_results = 0 if max_arg.lower() in ("infinite", "0") else int(max_arg)
+
+    stop_event = multiprocessing.get_context('spawn').Event()
+
+    def _on_sigint(*args):
+        stop_event.set()
+        print("\n\n⏹️  Stop requested (Ctrl+C). Workers finish their current batch...")
+    signal.signal(signal.SIGINT, _on_sigint)
+
+    print(f"\n🚀 Starting sharded crawler for '{keyword}' ({'INFINITE' if not max_results else max_results})")
+    results = asyncio.run(run_coordinator(
+        keyword,
+        max_results,
+        workers=workers,
+        cookies_file=cookies_file,
+        worker_cookies=[f for f in sessions.split(",") if f] if sessions else None,
+        headless=headless,
+        concurrency=concurrency,
+        fetch_mode=fetch_mode,
+        lease_seconds=lease_seconds,
+        stop_event=stop_event,
+    ))
+
+    print(f"\n✨ Found {len(results)} Indian business accounts (all saved in {infinite_ndjson_path(keyword)})")
+    if results:
+        filename = f"indian_business_accounts_{keyword}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Results saved to: {filename}")
@@ -0,0 +1,189 @@
+"""
+Durable candidate work queue (SQLite)
+Discovery pushes candidates in; worker processes claim them under a lease, verify them
+and write the outcome back. A lease that isn't completed or renewed in time (worker crashed
+or hung) expires and the candidate goes back to the queue. Safe to share between processes
+on one machine (WAL mode, claims run in an IMMEDIATE transaction).
+"""
+
+import json
+import sqlite3
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
+
+from candidates import Candidate
+
+
+DEFAULT_LEASE_SECONDS = 120
+# Candidates whose lease expired this many times are given up on (they keep crashing workers)
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class WorkQueue:
+    """
+    Candidates by state: pending -> leased (owner, lease_expires) -> done / failed.
+    Every username is queued once, so `username in queue` doubles as the discovery seen-set.
+    Accepted accounts are appended to a results table that readers page through by id.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Autocommit; transactions are opened explicitly where several statements must be atomic
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            " username TEXT PRIMARY KEY, keyword TEXT NOT NULL, data TEXT NOT NULL,"
+            " priority REAL NOT NULL DEFAULT 0, state TEXT NOT NULL DEFAULT 'pending',"
+            " owner TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, updated_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS candidates_claim ON candidates (state, priority DESC)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT UNIQUE NOT NULL, keyword TEXT NOT NULL,"
+            " account TEXT NOT NULL, worker TEXT, created_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def __contains__(self, username: str) -> bool:
+        return self.db.execute("SELECT 1 FROM candidates WHERE username = ?", (username,)).fetchone() is not None
+
+    def push(self, keyword: str, candidates: List[Candidate], priorities: Optional[List[float]] = None) -> int:
+        """Queue candidates (usernames already queued in any state are ignored); returns how many were new"""
+        now = time.time()
+        before = self.db.total_changes
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self.db.executemany(
+                "INSERT OR IGNORE INTO candidates (username, keyword, data, priority, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (c.username, keyword, json.dumps(asdict(c), ensure_ascii=False),
+                     priorities[i] if priorities else 0.0, now)
+                    for i, c in enumerate(candidates)
+                ],
+            )
+        return self.db.total_changes - before
+
+    def claim(self, owner: str, limit: int = 1) -> List[Tuple[str, Candidate]]:
+        """Lease up to `limit` of the highest-priority pending (or lease-expired) candidates
+        to owner; returns (keyword, candidate) pairs"""
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            self._expire_leases(now)
+            rows = self.db.execute(
+                "SELECT username, keyword, data FROM candidates WHERE state = 'pending'"
+                " ORDER BY priority DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+            self.db.executemany(
+                "UPDATE candidates SET state = 'leased', owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE username = ?",
+                [(owner, now + self.lease_seconds, now, username) for username, _, _ in rows],
+            )
+        return [(keyword, Candidate(**json.loads(data))) for _, keyword, data in rows]
+
+    def renew(self, owner: str) -> int:
+        """Extend every lease owner holds (heartbeat); returns how many were renewed"""
+        now = time.time()
+        return self.db.execute(
+            "UPDATE candidates SET lease_expires = ?, updated_at = ? WHERE state = 'leased' AND owner = ?",
+            (now + self.lease_seconds, now, owner),
+        ).rowcount
+
+    def complete(self, username: str, owner: str, account: Optional[Dict] = None) -> bool:
+        """Mark a claimed candidate decided; account is the accepted account dict (None = rejected).
+        Only while owner still holds the lease - returns False if it was reclaimed meanwhile"""
+        now = time.time()
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            updated = self.db.execute(
+                "UPDATE candidates SET state = 'done', lease_expires = NULL, updated_at = ?"
+                " WHERE username = ? AND state = 'leased' AND owner = ?",
+                (now, username, owner),
+            ).rowcount
+            if updated and account:
+                self.db.execute(
+                    "INSERT OR IGNORE INTO results (username, keyword, account, worker, created_at)"
+                    " SELECT ?, keyword, ?, ?, ? FROM candidates WHERE username = ?",
+                    (username, json.dumps(account, ensure_ascii=False), owner, now, username),
+                )
+        return bool(updated)
+
+    def release(self, username: str, owner: str):
+        """Give a claimed candidate back undecided (worker shutting down)"""
+        self.db.execute(
+            "UPDATE candidates SET state = 'pending', owner = NULL, lease_expires = NULL,"
+            " attempts = MAX(attempts - 1, 0), updated_at = ? WHERE username = ? AND state = 'leased' AND owner = ?",
+            (time.time(), username, owner),
+        )
+
+    def fail(self, username: str, owner: str):
+        """Give a claimed candidate back after a failed fetch (login wall, throttling). Unlike
+        release() the attempt counts, so a candidate no session can read ends up 'failed'"""
+        now = time.time()
+        self.db.execute(
+            "UPDATE candidates SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,"
+            " owner = NULL, lease_expires = NULL, updated_at = ? WHERE username = ? AND state = 'leased' AND owner = ?",
+            (self.max_attempts, now, username, owner),
+        )
+
+    def expire_owner(self, owner: str) -> int:
+        """Expire every lease owner holds now (its process died), so requeue_expired() returns them"""
+        return self.db.execute(
+            "UPDATE candidates SET lease_expires = 0 WHERE state = 'leased' AND owner = ?", (owner,),
+        ).rowcount
+
+    def requeue_expired(self) -> int:
+        """Return candidates with expired leases to the queue; returns how many"""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            return self._expire_leases(time.time())
+
+    def _expire_leases(self, now: float) -> int:
+        # Inside a transaction: give up on candidates that already used every attempt
+        self.db.execute(
+            "UPDATE candidates SET state = 'failed', owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+        return self.db.execute(
+            "UPDATE candidates SET state = 'pending', owner = NULL, lease_expires = NULL, updated_at = ?"
+            " WHERE state = 'leased' AND lease_expires < ?",
+            (now, now),
+        ).rowcount
+
+    def results_after(self, last_id: int = 0, limit: int = 500) -> List[Tuple[int, Dict]]:
+        """Accepted accounts with id > last_id, oldest first, as (id, account)"""
+        rows = self.db.execute(
+            "SELECT id, account FROM results WHERE id > ? ORDER BY id LIMIT ?", (last_id, limit),
+        ).fetchall()
+        return [(row_id, json.loads(account)) for row_id, account in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Candidates per state, plus 'accepted'"""
+        counts = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        counts.update(dict(self.db.execute("SELECT state, COUNT(*) FROM candidates GROUP BY state").fetchall()))
+        counts['accepted'] = self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return counts
+
+    def set_flag(self, key: str, value: bool = True):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, '1' if value else '0'))
+
+    def flag(self, key: str) -> bool:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return bool(row and row[0] == '1')
+
+    def summary(self) -> str:
+        """One-line queue report"""
+        c = self.counts()
+        return (f"🗂️  Queue: {c['pending']} pending, {c['leased']} leased, {c['done']} done, "
+                f"{c['failed']} failed, {c['accepted']} accepted ({self.path})")
+
+    def close(self):
+        self.db.close()